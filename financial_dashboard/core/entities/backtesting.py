@@ -0,0 +1,33 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FillPrice(str, Enum):
+    """Enum representing the price a signal is executed at.
+
+    Attributes:
+        NEXT_OPEN: Open of the bar after the signal bar
+        NEXT_CLOSE: Close of the bar after the signal bar
+    """
+    NEXT_OPEN = 'next_open'
+    NEXT_CLOSE = 'next_close'
+
+
+class BacktestCosts(BaseModel):
+    """Trading costs per contract traded.
+
+    Attributes:
+        commission: Fixed commission per contract
+        commission_rate: Commission as a share of the traded notional
+        slippage_ticks: Adverse fill offset in ticks
+        tick_size: Price step of the contract
+        point_value: Money value of one price point
+    """
+    model_config = ConfigDict(frozen=True)
+
+    commission: float = 0.0
+    commission_rate: float = 0.0
+    slippage_ticks: float = 0.0
+    tick_size: float = 1.0
+    point_value: float = 1.0
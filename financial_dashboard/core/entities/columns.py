@@ -18,6 +18,12 @@ class ColumnNames:
     CHANGE: str = 'Change'
     QTY: str = 'QTY'
     NUMTRADES: str = 'NumTrades'
+    TIMESTAMP: str = 'Timestamp'
+    FUTURESKEY: str = 'FuturesKey'
+    DELIVERYMONTH: str = 'DeliveryMonth'
+    PRICE: str = 'Price'
+    TRADEID: str = 'TradeID'
+    SIDE: str = 'Side'
 
 
 class DTypes:
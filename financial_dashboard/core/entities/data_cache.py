@@ -0,0 +1,34 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SourceDependency(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    path: str
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> 'SourceDependency':
+        stat = Path(path).stat()
+        return cls(path=str(Path(path).resolve()), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+    def is_current(self) -> bool:
+        try:
+            stat = Path(self.path).stat()
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+class DerivedResultManifest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    params: Dict[str, Any]
+    version: str
+    dependencies: List[SourceDependency]
+    data_file: str
@@ -4,3 +4,14 @@ from enum import Enum
 class Engines(str, Enum):
     PANDAS = 'pandas'
     POLARS = 'polars'
+
+
+class CsvEngines(str, Enum):
+    """Enum representing CSV parsing engines.
+
+    Attributes:
+        NATIVE: Reader of the dataframe library itself (single-threaded pandas.read_csv)
+        ARROW: Multi-threaded pyarrow.csv reader
+    """
+    NATIVE = 'native'
+    ARROW = 'arrow'
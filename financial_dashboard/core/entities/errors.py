@@ -27,3 +27,19 @@ class DataSettingsFactoryError(CustomTypeError):
 class IParseSettingsTemplateError(CustomTypeError):
     """Исключение, вызываемое при несоответствии типа data_settings_factory."""
     pass
+
+class UnsortedDataError(CustomValueError):
+    """Исключение, вызываемое при нарушении сортировки по времени."""
+    pass
+
+class CsvEngineError(CustomTypeError):
+    """Исключение, вызываемое при несоответствии типа csv_engine."""
+    pass
+
+class MergeConflictError(CustomValueError):
+    """Исключение, вызываемое при расхождении баров с одинаковым временем."""
+    pass
+
+class DownloadError(CustomValueError):
+    """Исключение, вызываемое при неудачной загрузке данных."""
+    pass
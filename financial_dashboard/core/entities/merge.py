@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class ConflictPolicy(str, Enum):
+    """Enum representing how bars with equal timestamps but different values are resolved.
+
+    Attributes:
+        FIRST: Keep the bar of the earliest source
+        LAST: Keep the bar of the latest source (re-exports win)
+        MAX_VOLUME: Keep the bar with the largest volume (complete bar beats a partial one)
+        RAISE: Fail on any conflicting bar
+    """
+    FIRST = 'first'
+    LAST = 'last'
+    MAX_VOLUME = 'max_volume'
+    RAISE = 'raise'
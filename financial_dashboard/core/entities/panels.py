@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class PanelGrid(str, Enum):
+    """Enum representing timestamp grids of a multi-contract panel.
+
+    Attributes:
+        UNION: Union of the timestamps of all inputs
+        REGULAR: Evenly spaced timestamps with a fixed frequency
+    """
+    UNION = 'union'
+    REGULAR = 'regular'
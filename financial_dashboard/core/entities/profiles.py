@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class ProfileMode(str, Enum):
+    """Enum representing how a bar contributes to a price profile.
+
+    Attributes:
+        CLOSE: Whole bar volume at the close price
+        RANGE: Bar volume spread evenly over the ticks between low and high
+        TPO: One time-price opportunity for every tick between low and high
+    """
+    CLOSE = 'close'
+    RANGE = 'range'
+    TPO = 'tpo'
+
+
+class ProfileGrouping(str, Enum):
+    """Enum representing the periods profiles are built for.
+
+    Attributes:
+        TRADING_DAY: One profile per trading day (evening session included in the next day)
+        SESSION: One profile per trading day and session
+    """
+    TRADING_DAY = 'trading_day'
+    SESSION = 'session'
@@ -0,0 +1,36 @@
+import datetime as dt
+from enum import Enum
+from typing import List
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TradingSession(int, Enum):
+    """Enum representing MOEX derivatives market sessions.
+
+    Values are stable small integers so that session IDs fit int8 arrays.
+    """
+    CLOSED = 0
+    MORNING = 1
+    MAIN = 2
+    CLEARING = 3
+    EVENING = 4
+
+
+class SessionInterval(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    start: dt.time
+    end: dt.time
+    session: TradingSession
+
+
+class MoexSchedule:
+    FORTS: List[SessionInterval] = [
+        SessionInterval(start=dt.time(8, 50), end=dt.time(10, 0), session=TradingSession.MORNING),
+        SessionInterval(start=dt.time(10, 0), end=dt.time(14, 0), session=TradingSession.MAIN),
+        SessionInterval(start=dt.time(14, 0), end=dt.time(14, 5), session=TradingSession.CLEARING),
+        SessionInterval(start=dt.time(14, 5), end=dt.time(18, 50), session=TradingSession.MAIN),
+        SessionInterval(start=dt.time(18, 50), end=dt.time(19, 5), session=TradingSession.CLEARING),
+        SessionInterval(start=dt.time(19, 5), end=dt.time(23, 50), session=TradingSession.EVENING),
+    ]
@@ -12,6 +12,8 @@ class DataSourceType(str, Enum):
     Attributes:
         QUIK: Data from QUIK trading system
         DAILY: Daily aggregated data
+        TRADES: All-trades (tick) export from QUIK
     """
     QUIK = 'quik'
     DAILY = 'daily'
+    TRADES = 'trades'
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class BarType(str, Enum):
+    """Enum representing the rule that closes a bar built from ticks.
+
+    Attributes:
+        TIME: Fixed clock interval in seconds
+        VOLUME: Fixed number of contracts traded
+        VALUE: Fixed traded value (price times contracts)
+    """
+    TIME = 'time'
+    VOLUME = 'volume'
+    VALUE = 'value'
@@ -0,0 +1,24 @@
+from enum import Enum
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FileChangeKind(str, Enum):
+    """Enum representing kinds of file system changes.
+
+    Attributes:
+        WRITTEN: File was created or rewritten (reported once the write completes)
+        DELETED: File was deleted or moved away
+        RESCAN: Events were lost; everything under the root may have changed
+    """
+    WRITTEN = 'written'
+    DELETED = 'deleted'
+    RESCAN = 'rescan'
+
+
+class FileChange(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    path: Path
+    kind: FileChangeKind
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from financial_dashboard.core.entities.engines import CsvEngines
+
 from financial_dashboard.core.interfaces.config.models import IDataSettings
 from financial_dashboard.core.interfaces.config.models import IParseSettings
 
@@ -16,3 +18,8 @@ class IParseSettingsFactory(ABC):
     @property
     def parse_settings(self) -> IParseSettings:
         ...
+
+    @property
+    @abstractmethod
+    def csv_engine(self) -> CsvEngines:
+        ...
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+
+class IDerivedResultStore(ABC):
+    @abstractmethod
+    def get(self, name: str, params: Dict[str, Any], version: str) -> Optional[pd.DataFrame]:
+        ...
+
+    @abstractmethod
+    def put(self, name: str, params: Dict[str, Any], version: str, data: pd.DataFrame, dependencies: Iterable[Path]) -> None:
+        ...
+
+    @abstractmethod
+    def get_or_compute(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        version: str,
+        dependencies: Iterable[Path],
+        compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        ...
+
+    @abstractmethod
+    def invalidate(self, name: str, params: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_source(self, path: Path) -> int:
+        """Drops every entry that depends on ``path``; returns the number of dropped entries."""
+        ...
+
+    @abstractmethod
+    def invalidate_under(self, directory: Path) -> int:
+        """Drops every entry that depends on a file under ``directory``; returns the number of dropped entries."""
+        ...
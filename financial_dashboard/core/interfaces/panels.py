@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Mapping
+
+import pandas as pd
+
+
+class IPanelBuilder(ABC):
+    @abstractmethod
+    def build(self, frames: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+        ...
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import pandas as pd
+
+
+class IReplaySink(ABC):
+    @abstractmethod
+    def emit(self, key: str, rows: pd.DataFrame, lines: List[str]) -> None:
+        """Delivers replayed bars of one stream: parsed ``rows`` and their raw file ``lines``."""
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
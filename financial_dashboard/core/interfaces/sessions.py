@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class ISessionCalendar(ABC):
+    @abstractmethod
+    def classify(self, timestamps: np.ndarray):
+        ...
+
+    @abstractmethod
+    def clear_cache(self) -> None:
+        ...
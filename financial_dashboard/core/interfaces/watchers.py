@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from financial_dashboard.core.entities.watching import FileChange
+
+
+class IFileWatcher(ABC):
+    @abstractmethod
+    def poll(self, timeout: float) -> List[FileChange]:
+        """Waits up to ``timeout`` seconds and returns the changes seen so far."""
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
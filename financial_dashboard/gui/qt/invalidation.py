@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from financial_dashboard.core.entities.source_types import DataSourceType
+
+from financial_dashboard.gui.qt.workers import DataLoadController
+from financial_dashboard.gui.qt.workers import LoadRequest
+
+from financial_dashboard.processing.data_cache.invalidation import ContractChange
+from financial_dashboard.processing.data_cache.invalidation import InvalidationHub
+
+
+class DataChangeNotifier(QObject):
+    """Brings ``InvalidationHub`` notifications onto the UI thread.
+
+    The hub calls back on its watcher thread; emitting a signal from there is
+    delivered queued to receivers living in the UI thread. Views bound with
+    ``bind`` are reloaded only when their own file changed.
+
+    Signals:
+        contract_changed(change): ContractChange of a subscribed contract
+    """
+    contract_changed = Signal(object)
+
+    def __init__(self, controller: Optional[DataLoadController] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._controller = controller
+        self._requests: Dict[str, LoadRequest] = {}
+        self._handles: List[int] = []
+        self._hub: Optional[InvalidationHub] = None
+        self.contract_changed.connect(self._reload)
+
+    def attach(self, hub: InvalidationHub, source_type: Optional[DataSourceType] = None, futures_key: Optional[str] = None) -> None:
+        self._hub = hub
+        self._handles.append(hub.subscribe(self.contract_changed.emit, source_type=source_type, futures_key=futures_key))
+
+    def detach(self) -> None:
+        if self._hub is not None:
+            for handle in self._handles:
+                self._hub.unregister(handle)
+        self._handles = []
+        self._hub = None
+
+    def bind(self, request: LoadRequest) -> None:
+        """Reloads ``request`` through the controller whenever its file changes."""
+        self._requests[request.slot] = request
+
+    def unbind(self, slot: str) -> None:
+        self._requests.pop(slot, None)
+
+    @Slot(object)
+    def _reload(self, change: ContractChange) -> None:
+        if self._controller is None:
+            return
+        changed = {path.resolve() for path in change.paths}
+        for request in list(self._requests.values()):
+            if change.futures_key is None or Path(request.file_path).resolve() in changed:
+                self._controller.load(request)
@@ -0,0 +1,178 @@
+import threading
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.infrastructure.readers.pandas.csv_reader import CsvReader
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    """What to load for one view slot (a chart, a table)."""
+    slot: str
+    file_path: Path
+    parse_settings: IParseSettings
+    usecols: Optional[List[str]] = None
+    first_chunk_rows: int = 20_000
+    chunk_rows: int = 500_000
+    process: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = field(default=None, compare=False)
+
+
+class LoadCancelled(Exception):
+    ...
+
+
+class _WorkerSignals(QObject):
+    first_chunk = Signal(int, object)
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+    cancelled = Signal(int)
+
+
+class _LoadWorker(QRunnable):
+    def __init__(self, request_id: int, request: LoadRequest, cancel_event: threading.Event) -> None:
+        super().__init__()
+        self._request_id = request_id
+        self._request = request
+        self._cancel_event = cancel_event
+        self.signals = _WorkerSignals()
+
+    def _check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+
+    def _empty(self) -> pd.DataFrame:
+        """Frame without rows for files holding no data, e.g. only a header."""
+        settings = self._request.parse_settings
+        dtypes = settings.dtypes or {}
+        data = pd.DataFrame({
+            column: pd.Series(dtype=dtypes.get(column, 'object')) for column in self._request.usecols or settings.columns
+        })
+        return data.set_index(settings.index_col) if settings.index_col in data.columns else data
+
+    def _load(self) -> pd.DataFrame:
+        reader = CsvReader(file_path=self._request.file_path, parse_settings=self._request.parse_settings)
+        chunks = []
+        for chunk in reader.iter_chunks(
+                chunk_rows=self._request.chunk_rows,
+                first_chunk_rows=self._request.first_chunk_rows,
+                usecols=self._request.usecols
+        ):
+            self._check_cancelled()
+            if not chunks and self._request.process is None:
+                self.signals.first_chunk.emit(self._request_id, chunk)
+            chunks.append(chunk)
+        self._check_cancelled()
+        if not chunks:
+            data = self._empty()
+        elif len(chunks) > 1:
+            # Chunks keep the index of ``index_col``; only the default index is renumbered.
+            data = pd.concat(chunks, ignore_index=self._request.parse_settings.index_col is None)
+        else:
+            data = chunks[0]
+        if self._request.process is not None:
+            data = self._request.process(data)
+            self._check_cancelled()
+        return data
+
+    @Slot()
+    def run(self) -> None:
+        try:
+            self._check_cancelled()
+            data = self._load()
+        except LoadCancelled:
+            self.signals.cancelled.emit(self._request_id)
+        except Exception:
+            self.signals.failed.emit(self._request_id, traceback.format_exc())
+        else:
+            self.signals.finished.emit(self._request_id, data)
+
+
+class DataLoadController(QObject):
+    """Loads frames on a thread pool without blocking the UI thread.
+
+    Each slot holds at most one live request: submitting a new request for a
+    slot cancels the previous one, and results of superseded requests are
+    dropped before they reach the UI. Frames are passed through queued
+    signals as object references, so nothing is copied on the hand-off.
+
+    Signals:
+        first_chunk_ready(slot, frame): head of the file, emitted early when no processing is requested
+        frame_ready(slot, frame): full (processed) frame
+        load_failed(slot, message)
+    """
+    first_chunk_ready = Signal(str, object)
+    frame_ready = Signal(str, object)
+    load_failed = Signal(str, str)
+
+    def __init__(self, thread_pool: Optional[QThreadPool] = None, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._next_request_id = 0
+        self._slots: Dict[int, str] = {}
+        self._current: Dict[str, int] = {}
+        self._cancel_events: Dict[int, threading.Event] = {}
+        # Workers are kept alive until they report back.
+        self._workers: Dict[int, _LoadWorker] = {}
+
+    def load(self, request: LoadRequest) -> int:
+        self.cancel(request.slot)
+        self._next_request_id += 1
+        request_id = self._next_request_id
+        cancel_event = threading.Event()
+        worker = _LoadWorker(request_id=request_id, request=request, cancel_event=cancel_event)
+        worker.setAutoDelete(False)
+        worker.signals.first_chunk.connect(self._on_first_chunk)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        worker.signals.cancelled.connect(self._release)
+        self._slots[request_id] = request.slot
+        self._current[request.slot] = request_id
+        self._cancel_events[request_id] = cancel_event
+        self._workers[request_id] = worker
+        self._thread_pool.start(worker)
+        return request_id
+
+    def cancel(self, slot: str) -> None:
+        request_id = self._current.pop(slot, None)
+        if request_id is not None:
+            self._cancel_events[request_id].set()
+
+    def cancel_all(self) -> None:
+        for slot in list(self._current):
+            self.cancel(slot)
+
+    def _is_current(self, request_id: int) -> bool:
+        slot = self._slots.get(request_id)
+        return slot is not None and self._current.get(slot) == request_id
+
+    @Slot(int)
+    def _release(self, request_id: int) -> None:
+        slot = self._slots.pop(request_id, None)
+        if slot is not None and self._current.get(slot) == request_id:
+            del self._current[slot]
+        self._cancel_events.pop(request_id, None)
+        self._workers.pop(request_id, None)
+
+    @Slot(int, object)
+    def _on_first_chunk(self, request_id: int, data: pd.DataFrame) -> None:
+        if self._is_current(request_id):
+            self.first_chunk_ready.emit(self._slots[request_id], data)
+
+    @Slot(int, object)
+    def _on_finished(self, request_id: int, data: pd.DataFrame) -> None:
+        if self._is_current(request_id):
+            self.frame_ready.emit(self._slots[request_id], data)
+        self._release(request_id)
+
+    @Slot(int, str)
+    def _on_failed(self, request_id: int, message: str) -> None:
+        if self._is_current(request_id):
+            self.load_failed.emit(self._slots[request_id], message)
+        self._release(request_id)
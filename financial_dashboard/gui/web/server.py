@@ -0,0 +1,100 @@
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Type
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.gui.web.windows import ARROW_STREAM_MIME
+from financial_dashboard.gui.web.windows import FrameWindowService
+
+
+class FrameWindowRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of :class:`FrameWindowService`.
+
+    ``GET /frames`` lists published frames, ``GET /frames/<key>`` streams a
+    window as Arrow IPC. Query parameters: ``start``, ``end`` (timestamps),
+    ``columns`` (comma separated), ``offset``, ``limit``, ``compression``.
+    """
+    protocol_version = 'HTTP/1.1'
+    service: FrameWindowService
+
+    def _send_json(self, status: HTTPStatus, payload) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _single(query: Dict[str, List[str]], name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[-1] if values else None
+
+    def _window_params(self, query: Dict[str, List[str]]) -> Dict:
+        start = self._single(query, 'start')
+        end = self._single(query, 'end')
+        columns = self._single(query, 'columns')
+        offset = self._single(query, 'offset')
+        limit = self._single(query, 'limit')
+        return dict(
+            start=pd.Timestamp(start) if start else None,
+            end=pd.Timestamp(end) if end else None,
+            columns=columns.split(',') if columns else None,
+            offset=int(offset) if offset else 0,
+            limit=int(limit) if limit else None,
+            compression=self._single(query, 'compression') or None
+        )
+
+    def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        return parts, parse_qs(url.query)
+
+    def do_GET(self) -> None:
+        parts, query = self._route()
+        if parts == ['frames']:
+            self._send_json(HTTPStatus.OK, self.service.keys)
+            return
+        if len(parts) != 2 or parts[0] != 'frames':
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            window = self.service.window(parts[1], **self._window_params(query))
+        except KeyError as error:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': str(error)})
+            return
+        except (CustomValueError, ValueError) as error:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(error)})
+            return
+
+        not_modified = self.headers.get('If-None-Match') == window.etag
+        self.send_response(HTTPStatus.NOT_MODIFIED if not_modified else HTTPStatus.OK)
+        self.send_header('ETag', window.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Row-Start', str(window.row_start))
+        self.send_header('X-Row-End', str(window.row_end))
+        self.send_header('X-Total-Rows', str(window.total_rows))
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_header('Content-Type', ARROW_STREAM_MIME)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for chunk in window.iter_ipc():
+            self.wfile.write(f'{len(chunk):X}\r\n'.encode() + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def create_server(service: FrameWindowService, host: str = '127.0.0.1', port: int = 8050) -> ThreadingHTTPServer:
+    handler: Type[FrameWindowRequestHandler] = type(
+        'BoundFrameWindowRequestHandler', (FrameWindowRequestHandler,), {'service': service}
+    )
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,178 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+from financial_dashboard.utils.timestamps import check_sorted
+
+ARROW_STREAM_MIME = 'application/vnd.apache.arrow.stream'
+COMPRESSIONS = ('lz4', 'zstd')
+_HISTORY_SIZE = 256
+
+
+@dataclass(frozen=True)
+class _PublishedFrame:
+    version: int
+    timestamps: np.ndarray
+    table: pa.Table
+    # (version, first row that may differ from the previous version), newest last.
+    history: Tuple[Tuple[int, int], ...]
+
+    def version_of(self, row_end: int) -> int:
+        """Latest version that changed any row before ``row_end``."""
+        for version, modified_from in reversed(self.history):
+            if modified_from < row_end:
+                return version
+        return self.history[0][0]
+
+
+class _ChunkSink:
+    """Write-only file object collecting IPC output between drains."""
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> Iterator[bytes]:
+        if self._chunks:
+            chunk, self._chunks = b''.join(self._chunks), []
+            yield chunk
+
+
+@dataclass(frozen=True)
+class FrameWindow:
+    """Row range of a published frame selected by a window request."""
+    key: str
+    etag: str
+    row_start: int
+    row_end: int
+    total_rows: int
+    table: pa.Table
+    compression: Optional[str]
+
+    def iter_ipc(self, batch_rows: int = 65536) -> Iterator[bytes]:
+        """Encodes the window as an Arrow IPC stream, one chunk per record batch."""
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, self.table.schema, options=options) as writer:
+            yield from sink.drain()
+            for batch in self.table.to_batches(max_chunksize=batch_rows):
+                writer.write_batch(batch)
+                yield from sink.drain()
+        yield from sink.drain()
+
+    def to_ipc(self) -> bytes:
+        return b''.join(self.iter_ipc())
+
+
+class FrameWindowService:
+    """Serves time-window and column-projected slices of loaded frames.
+
+    Frames are converted to Arrow once on publish; a window is a zero-copy
+    slice located by binary search over the sorted timestamps. The ETag
+    depends on the resolved row range and the last version that touched it,
+    so windows left unchanged by appended bars answer 304 Not Modified.
+    """
+    def __init__(self, max_rows: int = 100_000) -> None:
+        self._max_rows = max_rows
+        self._frames: Dict[str, _PublishedFrame] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, key: str, data: pd.DataFrame, parse_settings: Optional[IParseSettings] = None) -> None:
+        timestamps = extract_timestamps(data, parse_settings)
+        check_sorted(timestamps, name=key)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        if ColumnNames.TIMESTAMP not in table.column_names:
+            table = table.append_column(ColumnNames.TIMESTAMP, pa.array(timestamps, type=pa.timestamp('ns')))
+        with self._lock:
+            previous = self._frames.get(key)
+            if previous is None:
+                self._frames[key] = _PublishedFrame(version=1, timestamps=timestamps, table=table, history=((1, 0),))
+                return
+            version = previous.version + 1
+            old_rows = previous.timestamps.size
+            appended = timestamps.size >= old_rows and np.array_equal(timestamps[:old_rows], previous.timestamps)
+            # On append only the last old bar (still forming) and the new rows may differ.
+            modified_from = max(old_rows - 1, 0) if appended else 0
+            self._frames[key] = _PublishedFrame(
+                version=version,
+                timestamps=timestamps,
+                table=table,
+                history=(previous.history + ((version, modified_from),))[-_HISTORY_SIZE:]
+            )
+
+    def unpublish(self, key: str) -> None:
+        with self._lock:
+            self._frames.pop(key, None)
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._frames)
+
+    def window(
+            self,
+            key: str,
+            start: Optional[pd.Timestamp] = None,
+            end: Optional[pd.Timestamp] = None,
+            columns: Optional[List[str]] = None,
+            offset: int = 0,
+            limit: Optional[int] = None,
+            compression: Optional[str] = None
+    ) -> FrameWindow:
+        """Rows with ``start <= timestamp < end``, paginated by ``offset``/``limit``."""
+        frame = self._frames.get(key)
+        if frame is None:
+            raise KeyError(f'unpublished frame: {key}')
+        if compression is not None and compression not in COMPRESSIONS:
+            raise CustomValueError(f'unsupported compression {compression}, expected one of {COMPRESSIONS}')
+        if offset < 0:
+            raise CustomValueError(f'offset must be non-negative, got {offset}')
+        if limit is not None and limit < 0:
+            raise CustomValueError(f'limit must be non-negative, got {limit}')
+        limit = self._max_rows if limit is None else min(limit, self._max_rows)
+
+        first = 0 if start is None else int(np.searchsorted(frame.timestamps, pd.Timestamp(start).as_unit('ns').value, side='left'))
+        last = frame.timestamps.size if end is None else int(np.searchsorted(frame.timestamps, pd.Timestamp(end).as_unit('ns').value, side='left'))
+        # ``end`` before ``start`` is an empty window, not a negative one.
+        last = max(last, first)
+        row_start = min(first + offset, last)
+        row_end = min(row_start + limit, last)
+
+        if columns is None:
+            columns = frame.table.column_names
+        else:
+            unknown = set(columns) - set(frame.table.column_names)
+            if unknown:
+                raise CustomValueError(f'unknown columns: {sorted(unknown)}')
+            if ColumnNames.TIMESTAMP not in columns:
+                columns = [ColumnNames.TIMESTAMP, *columns]
+
+        token = f'{key}|{frame.version_of(row_end)}|{row_start}|{row_end}|{",".join(columns)}|{compression}'
+        return FrameWindow(
+            key=key,
+            etag=f'"{hashlib.sha1(token.encode()).hexdigest()}"',
+            row_start=row_start,
+            row_end=row_end,
+            total_rows=last - first,
+            table=frame.table.select(columns).slice(row_start, row_end - row_start),
+            compression=compression
+        )
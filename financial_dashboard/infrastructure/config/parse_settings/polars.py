@@ -11,6 +11,7 @@ from financial_dashboard.core.interfaces.config.models import IParseSettings
 
 from financial_dashboard.core.interfaces.config.models import DataSourceTypeProtocol
 
+from financial_dashboard.core.entities.engines import CsvEngines
 from financial_dashboard.core.entities.source_types import DateTimePatterns
 from financial_dashboard.core.entities.source_types import DataSourceType
 from financial_dashboard.core.entities.columns import ColumnNames
@@ -22,6 +23,7 @@ from financial_dashboard.core.entities.config import ParseSettings
 
 class ParseSettingsFactory(IParseSettingsFactory):
     _registry: Dict[DataSourceTypeProtocol, Type[IParseSettingsTemplate]] = {}
+    _csv_engine_registry: Dict[DataSourceTypeProtocol, CsvEngines] = {}
 
     def __init__(self, data_settings_factory: IDataSettingsFactory) -> None:
         self._data_settings_factory = data_settings_factory
@@ -46,14 +48,27 @@ class ParseSettingsFactory(IParseSettingsFactory):
     def register_custom_source(
         cls,
         source_type: DataSourceTypeProtocol,
-        settings_class: Type[IParseSettingsTemplate]
+        settings_class: Type[IParseSettingsTemplate],
+        csv_engine: CsvEngines = CsvEngines.NATIVE
     ) -> None:
-        """Register a custom data source type with its parse settings."""
+        """Register a custom data source type with its parse settings and CSV engine."""
         if not isinstance(source_type, DataSourceTypeProtocol):
             raise DataSourceTypeError(f'source_type type error: expected {DataSourceTypeProtocol.__name__}, got {type(source_type)}')
         if not issubclass(settings_class, IParseSettingsTemplate):
             raise IParseSettingsTemplateError(f'subclass type error: expected {IParseSettingsTemplate.__name__},  got {type(settings_class)}')
+        if not isinstance(csv_engine, CsvEngines):
+            raise CsvEngineError(f'csv_engine type error: expected {CsvEngines.__name__}, got {type(csv_engine)}')
         cls._registry[source_type] = settings_class
+        cls._csv_engine_registry[source_type] = csv_engine
+
+    @classmethod
+    def set_csv_engine(cls, source_type: DataSourceTypeProtocol, csv_engine: CsvEngines) -> None:
+        """Switch the CSV engine of an already registered source type."""
+        if source_type not in cls._registry:
+            raise UnregisteredSourceTypeError(f'unregistered source_type {source_type.value}')
+        if not isinstance(csv_engine, CsvEngines):
+            raise CsvEngineError(f'csv_engine type error: expected {CsvEngines.__name__}, got {type(csv_engine)}')
+        cls._csv_engine_registry[source_type] = csv_engine
 
     @property
     def parse_settings(self) -> IParseSettings:
@@ -64,6 +79,10 @@ class ParseSettingsFactory(IParseSettingsFactory):
             self._parse_settings_cache = ParseSettingsFactory._registry[self._data_settings.source_type]().parse_settings
         return self._parse_settings_cache
 
+    @property
+    def csv_engine(self) -> CsvEngines:
+        return ParseSettingsFactory._csv_engine_registry.get(self._data_settings.source_type, CsvEngines.NATIVE)
+
 
 @ParseSettingsFactory._register(DataSourceType.QUIK)
 class QuikParseSettings(IParseSettingsTemplate):
@@ -163,3 +182,47 @@ class DailyParseSettings(IParseSettingsTemplate):
             iterator=False,
             chunksize=None
         )
+
+
+@ParseSettingsFactory._register(DataSourceType.TRADES)
+class TradesParseSettings(IParseSettingsTemplate):
+    @property
+    def parse_settings(self) -> IParseSettings:
+        return ParseSettings(
+            sep=Separators.COMMA,
+            skip_rows=None,
+            header=0,
+            columns=[
+                ColumnNames.TICKER,
+                ColumnNames.PER,
+                ColumnNames.DATE,
+                ColumnNames.TIME,
+                ColumnNames.PRICE,
+                ColumnNames.VOL,
+                ColumnNames.TRADEID,
+                ColumnNames.SIDE
+            ],
+            dtypes={
+                ColumnNames.TICKER: DTypes.CATEGORY,
+                ColumnNames.PER: DTypes.STRING,
+                ColumnNames.DATE: DTypes.STRING,
+                ColumnNames.TIME: DTypes.STRING,
+                ColumnNames.PRICE: DTypes.FLOAT64,
+                ColumnNames.VOL: DTypes.INT64,
+                ColumnNames.TRADEID: DTypes.INT64,
+                ColumnNames.SIDE: DTypes.CATEGORY
+            },
+            na_values=[''],
+            datetime_cols=[ColumnNames.DATE, ColumnNames.TIME],
+            datetime_fmt=DateTimePatterns.QUIK,
+            decimal=Separators.DOT,
+            parse_dates=None,
+            date_format=None,
+            index_col=None,
+            iterator=False,
+            chunksize=None
+        )
+
+
+# All-trades exports run to millions of rows: parse them with the multi-threaded reader.
+ParseSettingsFactory.set_csv_engine(DataSourceType.TRADES, CsvEngines.ARROW)
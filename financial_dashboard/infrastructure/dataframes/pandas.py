@@ -7,5 +7,16 @@ class PandasDataFrame(IDataFrame):
     def __init__(self, data: pd.DataFrame):
         self._data = data
 
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._data
+
     def filter_rows(self, condition) -> 'IDataFrame':
+        from financial_dashboard.processing.filters.expressions import Expr
+        if isinstance(condition, Expr):
+            from financial_dashboard.processing.filters.compilers import to_pandas_mask
+            condition = to_pandas_mask(condition, self._data)
         return PandasDataFrame(self._data[condition])
+
+    def select_cols(self, columns: list[str]) -> 'IDataFrame':
+        return PandasDataFrame(self._data[columns])
@@ -7,5 +7,16 @@ class PolarsDataFrame(IDataFrame):
     def __init__(self, data: pl.DataFrame):
         self._data = data
 
+    @property
+    def data(self) -> pl.DataFrame:
+        return self._data
+
     def filter_rows(self, condition) -> 'IDataFrame':
+        from financial_dashboard.processing.filters.expressions import Expr
+        if isinstance(condition, Expr):
+            from financial_dashboard.processing.filters.compilers import to_polars
+            condition = to_polars(condition)
         return PolarsDataFrame(self._data.filter(condition))
+
+    def select_cols(self, columns: list[str]) -> 'IDataFrame':
+        return PolarsDataFrame(self._data.select(columns))
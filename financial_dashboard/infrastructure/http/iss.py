@@ -0,0 +1,53 @@
+from typing import Dict, List, Sequence, Tuple
+
+ISS_BASE_URL = 'https://iss.moex.com'
+ISS_FUTURES_HISTORY_PATH = '/iss/history/engines/futures/markets/forts/securities/{secid}.csv'
+ISS_ENCODING = 'cp1251'
+ISS_SEPARATOR = ';'
+# Columns of the futures history block in the order of the DAILY files.
+ISS_HISTORY_COLUMNS = (
+    'BOARDID', 'TRADEDATE', 'SECID', 'OPEN', 'LOW', 'HIGH', 'CLOSE', 'OPENPOSITIONVALUE', 'VALUE',
+    'VOLUME', 'OPENPOSITION', 'SETTLEPRICE', 'WAPRICE', 'SETTLEPRICEDAY', 'CHANGE', 'QTY', 'NUMTRADES'
+)
+
+IssBlock = Tuple[List[str], List[List[str]]]
+
+
+def parse_iss_csv(payload: bytes) -> Dict[str, IssBlock]:
+    """Splits an ISS CSV payload into ``{block name: (header, rows)}``.
+
+    Every block is its name, a blank line, the header and the rows; blocks
+    are separated by blank lines.
+    """
+    blocks: Dict[str, IssBlock] = {}
+    lines = payload.decode(ISS_ENCODING).splitlines()
+    position = 0
+    while position < len(lines):
+        if not lines[position].strip():
+            position += 1
+            continue
+        name = lines[position].strip()
+        position += 1
+        while position < len(lines) and not lines[position].strip():
+            position += 1
+        if position >= len(lines):
+            blocks[name] = ([], [])
+            break
+        header = lines[position].split(ISS_SEPARATOR)
+        position += 1
+        rows = []
+        while position < len(lines) and lines[position].strip():
+            rows.append(lines[position].split(ISS_SEPARATOR))
+            position += 1
+        blocks[name] = (header, rows)
+    return blocks
+
+
+def format_iss_csv(blocks: Dict[str, Tuple[Sequence[str], Sequence[Sequence[str]]]]) -> bytes:
+    parts = []
+    for name, (header, rows) in blocks.items():
+        parts.append(f'{name}\n\n')
+        parts.append(ISS_SEPARATOR.join(header) + '\n')
+        parts.extend(ISS_SEPARATOR.join(row) + '\n' for row in rows)
+        parts.append('\n')
+    return ''.join(parts).encode(ISS_ENCODING)
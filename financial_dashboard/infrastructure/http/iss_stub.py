@@ -0,0 +1,95 @@
+import datetime as dt
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Type
+from urllib.parse import parse_qs, urlsplit
+
+from financial_dashboard.infrastructure.http.iss import ISS_FUTURES_HISTORY_PATH
+from financial_dashboard.infrastructure.http.iss import ISS_HISTORY_COLUMNS
+from financial_dashboard.infrastructure.http.iss import format_iss_csv
+
+_PREFIX, _SUFFIX = ISS_FUTURES_HISTORY_PATH.split('{secid}')
+
+
+class IssStubState:
+    """Data and counters shared by the stub request handlers.
+
+    ``history`` maps SECID to rows of ``ISS_HISTORY_COLUMNS`` values with
+    ISO ``TRADEDATE``. The first ``failures`` requests are answered with 503
+    to exercise client retries.
+    """
+    def __init__(self, history: Dict[str, Sequence[Sequence[str]]], page_size: int = 100, failures: int = 0) -> None:
+        self.history = {secid: sorted((list(row) for row in rows), key=lambda row: row[1]) for secid, rows in history.items()}
+        self.page_size = page_size
+        self.failures = failures
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def count_request(self) -> bool:
+        """Counts a request; returns whether it must fail."""
+        with self._lock:
+            self.requests += 1
+            if self.failures > 0:
+                self.failures -= 1
+                return True
+            return False
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+
+class IssStubRequestHandler(BaseHTTPRequestHandler):
+    """Serves the futures history endpoint of MOEX ISS from memory.
+
+    Supports ``from``, ``till``, ``start`` (cursor offset) and
+    ``history.columns``; replies carry the ``history.cursor`` block.
+    """
+    protocol_version = 'HTTP/1.1'
+    state: IssStubState
+
+    def setup(self) -> None:
+        super().setup()
+        self.state.count_connection()
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str = 'text/csv; charset=windows-1251') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if self.state.count_request():
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, b'try again', 'text/plain')
+            return
+        if not (url.path.startswith(_PREFIX) and url.path.endswith(_SUFFIX)):
+            self._send(HTTPStatus.NOT_FOUND, b'not found', 'text/plain')
+            return
+        secid = url.path[len(_PREFIX):len(url.path) - len(_SUFFIX)]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        start_date = query.get('from', dt.date.min.isoformat())
+        end_date = query.get('till', dt.date.max.isoformat())
+        rows = [row for row in self.state.history.get(secid, []) if start_date <= row[1] <= end_date]
+        offset = int(query.get('start', 0))
+        columns: List[str] = query['history.columns'].split(',') if 'history.columns' in query else list(ISS_HISTORY_COLUMNS)
+        positions = [ISS_HISTORY_COLUMNS.index(column) for column in columns]
+        page = [[row[position] for position in positions] for row in rows[offset:offset + self.state.page_size]]
+        self._send(HTTPStatus.OK, format_iss_csv({
+            'history': (columns, page),
+            'history.cursor': (['INDEX', 'TOTAL', 'PAGESIZE'], [[str(offset), str(len(rows)), str(self.state.page_size)]])
+        }))
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def create_iss_stub_server(state: IssStubState, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Local stand-in for ``iss.moex.com``; ``port=0`` picks a free port (see ``server_address``)."""
+    handler: Type[IssStubRequestHandler] = type(
+        'BoundIssStubRequestHandler', (IssStubRequestHandler,), {'state': state}
+    )
+    return ThreadingHTTPServer((host, port), handler)
@@ -0,0 +1,75 @@
+import http.client
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlencode, urlsplit
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class HttpConnectionPool:
+    """Bounded pool of keep-alive ``http.client`` connections to one host.
+
+    A connection is checked out for a single request and returned after the
+    body is read, so consecutive requests reuse the TCP (and TLS) session.
+    Connections that fail are closed and replaced lazily.
+    """
+    def __init__(self, base_url: str, max_connections: int = 4, timeout: float = 30.0) -> None:
+        url = urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f'unsupported scheme {url.scheme!r}, expected http or https')
+        self._connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self._host = url.hostname
+        self._port = url.port
+        self._prefix = url.path.rstrip('/')
+        self._timeout = timeout
+        self._idle: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._closed = False
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connection_class(self._host, self._port, timeout=self._timeout)
+
+    def get(self, path: str, params: Optional[Dict[str, str]] = None, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        target = f'{self._prefix}{path}'
+        if params:
+            target = f'{target}?{urlencode(params)}'
+        with self._slots:
+            if self._closed:
+                raise RuntimeError('connection pool is closed')
+            connection = self._checkout()
+            try:
+                connection.request('GET', target, headers=headers or {})
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return HttpResponse(status=response.status, headers=dict(response.getheaders()), body=body)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self) -> 'HttpConnectionPool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -96,6 +96,27 @@ class DailyFileNameGenerator(IFileNameGenerator):
         return self._file_name_cache
 
 
+@FileNameGeneratorFactory._register(DataSourceType.TRADES)
+class TradesFileNameGenerator(IFileNameGenerator):
+
+    def __init__(self, data_settings: IDataSettings) -> None:
+        self._data_settings = data_settings
+        self._file_name_cache: Optional[Path] = None
+
+    def clear_cache(self) -> None:
+        self._file_name_cache = None
+
+    @property
+    def file_name(self) -> Path:
+        if self._file_name_cache is None:
+            self._file_name_cache = Path(
+                f'{self._data_settings.futures_key.value}'
+                f'{self._data_settings.delivery_month.value}'
+                f'{self._data_settings.year.strftime('%Y')[-1]}.csv'
+            )
+        return self._file_name_cache
+
+
 class FileDirGeneratorFactory(IFileDirGeneratorFactory):
     _registry: Dict[DataSourceType, Type[IFileDirGenerator]] = {}
 
@@ -194,6 +215,32 @@ class DailyFileDirGenerator(IFileDirGenerator):
         return self._file_dir_cache
 
 
+@FileDirGeneratorFactory._register(DataSourceType.TRADES)
+class TradesFileDirGenerator(IFileDirGenerator):
+
+    def __init__(self, file_system: IFileSystem, root_path: Path, data_settings: IDataSettings) -> None:
+        self._fs = file_system
+        self._root = root_path
+        self._data_settings = data_settings
+        self._file_dir_cache: Optional[Path] = None
+
+    def clear_cache(self) -> None:
+        self._file_dir_cache = None
+
+    @property
+    def _data_dir(self):
+        return Path('data/trades_data')
+
+    def _load_cache(self) -> Path:
+        return self._fs.build_path(self._root, self._data_dir, self._data_settings.futures_key.value)
+
+    @property
+    def file_dir(self) -> Path:
+        if self._file_dir_cache is None:
+            self._file_dir_cache = self._load_cache()
+        return self._file_dir_cache
+
+
 class FilePathGenerator(IFilePathGenerator):
     def __init__(self, file_system: IFileSystem, file_dir_generator: IFileDirGenerator, file_name_generator: IFileNameGenerator):
         self._fs = file_system
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Dict, Optional, List
+
+import pyarrow as pa
+import pyarrow.csv as pv
+
+from financial_dashboard.core.entities.columns import DTypes
+from financial_dashboard.core.entities.engines import Engines
+
+from financial_dashboard.core.interfaces.readers import IDataReader
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.dataframe import IDataFrame
+
+
+_ARROW_TYPES: Dict[str, pa.DataType] = {
+    DTypes.STRING: pa.string(),
+    DTypes.CATEGORY: pa.dictionary(pa.int32(), pa.string()),
+    DTypes.INT64: pa.int64(),
+    DTypes.FLOAT64: pa.float64(),
+}
+
+
+class ArrowCsvReader(IDataReader):
+    """Multi-threaded CSV reader built on pyarrow.csv.
+
+    Translates IParseSettings into Arrow read/parse/convert options and hands
+    the decoded table to the pandas or Polars wrapper.
+    """
+    def __init__(
+            self,
+            file_path: Path,
+            parse_settings: IParseSettings,
+            engine: Engines = Engines.PANDAS,
+            use_threads: bool = True,
+            block_size: Optional[int] = None
+    ) -> None:
+        if not isinstance(engine, Engines):
+            raise TypeError(f'engine type error: expected {Engines.__name__}, got {type(engine)}')
+        self._file_path = file_path
+        self._parse_settings = parse_settings
+        self._engine = engine
+        self._use_threads = use_threads
+        self._block_size = block_size
+
+    def _read_options(self) -> pv.ReadOptions:
+        # Arrow has no "replace the header row" mode: skip it and pass the names.
+        skip_rows = self._parse_settings.skip_rows or 0
+        if self._parse_settings.header is not None:
+            skip_rows += self._parse_settings.header + 1
+        options = dict(use_threads=self._use_threads, skip_rows=skip_rows, column_names=self._parse_settings.columns)
+        if self._block_size is not None:
+            options['block_size'] = self._block_size
+        return pv.ReadOptions(**options)
+
+    def _parse_options(self) -> pv.ParseOptions:
+        return pv.ParseOptions(delimiter=self._parse_settings.sep)
+
+    def _convert_options(self, usecols: Optional[List[str]]) -> pv.ConvertOptions:
+        column_types = {
+            column: _ARROW_TYPES[dtype]
+            for column, dtype in self._parse_settings.dtypes.items()
+            if dtype in _ARROW_TYPES
+        }
+        timestamp_parsers = None
+        if self._parse_settings.parse_dates:
+            for column in self._parse_settings.parse_dates:
+                column_types[column] = pa.timestamp('ns')
+            if self._parse_settings.date_format:
+                timestamp_parsers = [self._parse_settings.date_format]
+        return pv.ConvertOptions(
+            column_types=column_types,
+            null_values=self._parse_settings.na_values,
+            strings_can_be_null=True,
+            decimal_point=self._parse_settings.decimal,
+            include_columns=usecols,
+            timestamp_parsers=timestamp_parsers
+        )
+
+    def read_table(self, usecols: Optional[List[str]] = None) -> pa.Table:
+        return pv.read_csv(
+            self._file_path,
+            read_options=self._read_options(),
+            parse_options=self._parse_options(),
+            convert_options=self._convert_options(usecols)
+        )
+
+    def read(self, usecols: Optional[List[str]] = None) -> IDataFrame:
+        table = self.read_table(usecols)
+        if self._engine is Engines.POLARS:
+            import polars as pl
+            from financial_dashboard.infrastructure.dataframes.polars import PolarsDataFrame
+            return PolarsDataFrame(data=pl.from_arrow(table))
+
+        import pandas as pd
+        from financial_dashboard.infrastructure.dataframes.pandas import PandasDataFrame
+        types_mapper = {pa.int64(): pd.Int64Dtype(), pa.string(): pd.StringDtype()}.get
+        # self_destruct releases Arrow buffers as columns are converted, so the
+        # peak memory stays close to a single copy of the data.
+        data = table.to_pandas(types_mapper=types_mapper, split_blocks=True, self_destruct=True)
+        del table
+        if self._parse_settings.index_col is not None:
+            data = data.set_index(self._parse_settings.index_col)
+        return PandasDataFrame(data=data)
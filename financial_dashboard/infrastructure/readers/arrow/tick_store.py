@@ -0,0 +1,169 @@
+import os
+import uuid
+import datetime as dt
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.readers import IDataReader
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.dataframe import IDataFrame
+
+from financial_dashboard.infrastructure.dataframes.pandas import PandasDataFrame
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+TICK_SIZE_KEY = b'tick_size'
+TICK_SCHEMA = pa.schema([
+    pa.field(ColumnNames.TIMESTAMP, pa.timestamp('ns'), nullable=False),
+    pa.field(ColumnNames.PRICE, pa.int64(), nullable=False),
+    pa.field(ColumnNames.VOL, pa.int64(), nullable=False),
+    pa.field(ColumnNames.TRADEID, pa.int64()),
+    pa.field(ColumnNames.SIDE, pa.int8(), nullable=False)
+])
+_SIDES = {'B': 1, 'S': -1}
+# Timestamps, trade ids and tick prices move in small steps: store the differences.
+_DELTA_COLUMNS = (ColumnNames.TIMESTAMP, ColumnNames.PRICE, ColumnNames.VOL, ColumnNames.TRADEID)
+
+
+def price_decimals(tick_size: float) -> int:
+    fraction = f'{tick_size:.10f}'.rstrip('0').split('.')[1]
+    return len(fraction)
+
+
+class TickCodec:
+    """Converts parsed all-trades frames into the compact tick layout and back.
+
+    Prices are stored as int64 multiples of ``tick_size``, timestamps as int64
+    nanoseconds; both are written with Parquet ``DELTA_BINARY_PACKED``
+    encoding, so a tick costs a few bits per column on disk. The side is
+    ``1`` for buys, ``-1`` for sells and ``0`` when unknown.
+    """
+    def __init__(self, tick_size: float, parse_settings: Optional[IParseSettings] = None) -> None:
+        if tick_size <= 0:
+            raise CustomValueError(f'tick_size must be positive, got {tick_size}')
+        self._tick_size = tick_size
+        self._parse_settings = parse_settings
+
+    @property
+    def tick_size(self) -> float:
+        return self._tick_size
+
+    @property
+    def schema(self) -> pa.Schema:
+        return TICK_SCHEMA.with_metadata({TICK_SIZE_KEY: repr(self._tick_size).encode()})
+
+    def encode(self, data: pd.DataFrame) -> pa.Table:
+        timestamps = extract_timestamps(data, self._parse_settings)
+        prices = data[ColumnNames.PRICE].to_numpy(dtype=np.float64, na_value=np.nan)
+        ticks = np.rint(prices / self._tick_size)
+        if not np.all(np.abs(ticks * self._tick_size - prices) <= self._tick_size * 1e-6):
+            raise CustomValueError(f'prices are not multiples of tick_size {self._tick_size}')
+        if ColumnNames.SIDE in data.columns:
+            sides = data[ColumnNames.SIDE].astype('string').map(_SIDES).fillna(0).to_numpy(dtype=np.int8)
+        else:
+            sides = np.zeros(len(data), dtype=np.int8)
+        trade_ids = pa.array(data[ColumnNames.TRADEID], type=pa.int64(), from_pandas=True) \
+            if ColumnNames.TRADEID in data.columns else pa.nulls(len(data), pa.int64())
+        return pa.Table.from_arrays([
+            pa.array(timestamps.view('datetime64[ns]')),
+            pa.array(ticks.astype(np.int64)),
+            pa.array(data[ColumnNames.VOL].to_numpy(dtype=np.int64)),
+            trade_ids,
+            pa.array(sides)
+        ], schema=self.schema)
+
+    @staticmethod
+    def decode(table: pa.Table) -> pd.DataFrame:
+        """Frame with a float ``Price`` column restored from the tick size in the schema metadata."""
+        tick_size = float((table.schema.metadata or {})[TICK_SIZE_KEY])
+        data = table.to_pandas()
+        if ColumnNames.PRICE in data.columns:
+            data[ColumnNames.PRICE] = np.round(data[ColumnNames.PRICE].to_numpy() * tick_size, price_decimals(tick_size))
+        return data
+
+    def write(self, chunks: Iterable[pd.DataFrame], path: Path, row_group_rows: int = 1 << 20) -> int:
+        """Encodes time-ordered chunks into one file, replaced atomically; returns the tick count."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        rows = 0
+        last = None
+        try:
+            with pq.ParquetWriter(
+                tmp,
+                self.schema,
+                compression='zstd',
+                use_dictionary=False,
+                column_encoding={column: 'DELTA_BINARY_PACKED' for column in _DELTA_COLUMNS}
+            ) as writer:
+                for chunk in chunks:
+                    table = self.encode(chunk)
+                    if not table.num_rows:
+                        continue
+                    timestamps = table.column(ColumnNames.TIMESTAMP).to_numpy().view(np.int64)
+                    if np.any(timestamps[1:] < timestamps[:-1]) or (last is not None and timestamps[0] < last):
+                        raise CustomValueError(f'ticks written to {path} are not sorted by time')
+                    last = int(timestamps[-1])
+                    writer.write_table(table, row_group_size=row_group_rows)
+                    rows += table.num_rows
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return rows
+
+
+class TickReader(IDataReader):
+    """Reads files written by ``TickCodec``; time ranges are pushed down to row group statistics."""
+    def __init__(self, file_path: Path) -> None:
+        self._file_path = file_path
+
+    @property
+    def tick_size(self) -> float:
+        return float(pq.read_schema(self._file_path).metadata[TICK_SIZE_KEY])
+
+    @staticmethod
+    def _filter(start: Optional[dt.datetime], end: Optional[dt.datetime]) -> Optional[ds.Expression]:
+        predicate = None
+        if start is not None:
+            predicate = ds.field(ColumnNames.TIMESTAMP) >= pa.scalar(pd.Timestamp(start).as_unit('ns'), pa.timestamp('ns'))
+        if end is not None:
+            before_end = ds.field(ColumnNames.TIMESTAMP) < pa.scalar(pd.Timestamp(end).as_unit('ns'), pa.timestamp('ns'))
+            predicate = before_end if predicate is None else predicate & before_end
+        return predicate
+
+    def read_table(
+            self,
+            usecols: Optional[List[str]] = None,
+            start: Optional[dt.datetime] = None,
+            end: Optional[dt.datetime] = None
+    ) -> pa.Table:
+        """Encoded ticks in ``[start, end)``; prices stay in ticks."""
+        schema = pq.read_schema(self._file_path)
+        table = ds.dataset(self._file_path, format='parquet').to_table(columns=usecols, filter=self._filter(start, end))
+        return table.replace_schema_metadata(schema.metadata)
+
+    def read(
+            self,
+            usecols: Optional[List[str]] = None,
+            start: Optional[dt.datetime] = None,
+            end: Optional[dt.datetime] = None
+    ) -> IDataFrame:
+        return PandasDataFrame(data=TickCodec.decode(self.read_table(usecols, start, end)))
+
+    def iter_chunks(self, chunk_rows: int, usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Yields decoded frames of up to ``chunk_rows`` ticks."""
+        parquet_file = pq.ParquetFile(self._file_path)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=usecols):
+                yield TickCodec.decode(pa.Table.from_batches([batch]).replace_schema_metadata(parquet_file.schema_arrow.metadata))
+        finally:
+            parquet_file.close()
@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Optional
+
+from financial_dashboard.core.entities.engines import CsvEngines
+from financial_dashboard.core.entities.engines import Engines
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.factories import IParseSettingsFactory
+from financial_dashboard.core.interfaces.readers import IDataReader
+
+
+class CsvReaderFactory:
+    """Chooses the CSV reader configured for the source type of the parse settings factory."""
+    def __init__(self, file_path: Path, parse_settings_factory: IParseSettingsFactory, engine: Engines = Engines.PANDAS) -> None:
+        self._file_path = file_path
+        self._parse_settings_factory = parse_settings_factory
+        self._engine = engine
+        self._reader_cache: Optional[IDataReader] = None
+
+    def clear_cache(self) -> None:
+        self._reader_cache = None
+
+    def _load_cache(self) -> IDataReader:
+        parse_settings = self._parse_settings_factory.parse_settings
+        if self._parse_settings_factory.csv_engine is CsvEngines.ARROW:
+            from financial_dashboard.infrastructure.readers.arrow.csv_reader import ArrowCsvReader
+            return ArrowCsvReader(file_path=self._file_path, parse_settings=parse_settings, engine=self._engine)
+        if self._engine is Engines.PANDAS:
+            from financial_dashboard.infrastructure.readers.pandas.csv_reader import CsvReader
+            return CsvReader(file_path=self._file_path, parse_settings=parse_settings)
+        raise CustomValueError(
+            f'unsupported engine {self._engine.value} for the {CsvEngines.NATIVE.value} csv engine, '
+            f'expected {Engines.PANDAS.value} or the {CsvEngines.ARROW.value} csv engine'
+        )
+
+    @property
+    def reader(self) -> IDataReader:
+        if self._reader_cache is None:
+            self._reader_cache = self._load_cache()
+        return self._reader_cache
@@ -1,5 +1,7 @@
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Iterator, Optional, List
+
+import pandas as pd
 
 from financial_dashboard.core.interfaces.readers import IDataReader
 from financial_dashboard.core.interfaces.config.models import IParseSettings
@@ -13,10 +15,8 @@ class CsvReader(IDataReader):
         self._file_path = file_path
         self._parse_settings = parse_settings
 
-    def read(self, usecols: Optional[List[str]] = None) -> IDataFrame:
-        import pandas as pd
-        return PandasDataFrame(data=pd.read_csv(
-            self._file_path,
+    def _read_csv_kwargs(self, usecols: Optional[List[str]]) -> Dict[str, Any]:
+        return dict(
             usecols=usecols,
             sep=self._parse_settings.sep,
             skiprows=self._parse_settings.skip_rows,
@@ -27,7 +27,24 @@ class CsvReader(IDataReader):
             decimal=self._parse_settings.decimal,
             parse_dates=self._parse_settings.parse_dates,
             date_format=self._parse_settings.date_format,
-            index_col=self._parse_settings.index_col,
+            index_col=self._parse_settings.index_col
+        )
+
+    def read(self, usecols: Optional[List[str]] = None) -> IDataFrame:
+        return PandasDataFrame(data=pd.read_csv(
+            self._file_path,
             iterator=self._parse_settings.iterator,
-            chunksize=self._parse_settings.chunksize
+            chunksize=self._parse_settings.chunksize,
+            **self._read_csv_kwargs(usecols)
         ))
+
+    def iter_chunks(self, chunk_rows: int, first_chunk_rows: Optional[int] = None, usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """Reads the file incrementally; the first chunk may be smaller to show data early."""
+        with pd.read_csv(self._file_path, iterator=True, **self._read_csv_kwargs(usecols)) as reader:
+            size = first_chunk_rows or chunk_rows
+            while True:
+                try:
+                    yield reader.get_chunk(size)
+                except StopIteration:
+                    return
+                size = chunk_rows
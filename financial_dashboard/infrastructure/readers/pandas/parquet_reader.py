@@ -1,21 +1,55 @@
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
-from core.interfaces.readers import IDataReader
+from financial_dashboard.core.interfaces.readers import IDataReader
 from financial_dashboard.core.interfaces.config.models import IParseSettings
-from core.interfaces.dataframe import IDataFrame
+from financial_dashboard.core.interfaces.dataframe import IDataFrame
 
 from financial_dashboard.infrastructure.dataframes.pandas import PandasDataFrame
 
+from financial_dashboard.processing.filters.expressions import Expr
+from financial_dashboard.processing.filters.expressions import FilterContext
+
 
 class ParquetReader(IDataReader):
     def __init__(self, file_path: Path, parse_settings: Optional[IParseSettings] = None):
         self._file_path = file_path
         self._parse_settings = parse_settings
 
-    def read(self, usecols: Optional[List[str]] = None) -> IDataFrame:
+    def read(self, usecols: Optional[List[str]] = None, where: Optional[Expr] = None, context: Optional[FilterContext] = None) -> IDataFrame:
+        """Reads the file; ``where`` is pushed down to the Parquet scan as far as Arrow can evaluate it."""
         import pandas as pd
-        return PandasDataFrame(data=pd.read_parquet(
-            path=self._file_path,
-            columns=usecols
-        ))
+        if where is None:
+            return PandasDataFrame(data=pd.read_parquet(
+                path=self._file_path,
+                columns=usecols
+            ))
+
+        import pyarrow.dataset as ds
+        from financial_dashboard.processing.filters.compilers import referenced_columns
+        from financial_dashboard.processing.filters.compilers import to_arrow
+        from financial_dashboard.processing.filters.compilers import to_pandas_mask
+
+        context = context or FilterContext.from_parse_settings(self._parse_settings)
+        predicate, exact = to_arrow(where, context)
+        columns = None
+        if usecols is not None and not exact:
+            columns = list(dict.fromkeys([*usecols, *referenced_columns(where, context)]))
+        elif usecols is not None:
+            columns = usecols
+        data = ds.dataset(self._file_path, format='parquet').to_table(columns=columns, filter=predicate).to_pandas()
+        if not exact:
+            data = data[to_pandas_mask(where, data, context)].reset_index(drop=True)
+        if usecols is not None:
+            data = data[usecols]
+        return PandasDataFrame(data=data)
+
+    def iter_chunks(self, chunk_rows: int, usecols: Optional[List[str]] = None) -> Iterator:
+        """Yields pandas frames of up to ``chunk_rows`` rows, one record batch at a time."""
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(self._file_path)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=usecols):
+                yield batch.to_pandas()
+        finally:
+            parquet_file.close()
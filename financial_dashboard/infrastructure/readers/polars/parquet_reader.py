@@ -0,0 +1,29 @@
+from pathlib import Path
+from typing import Optional, List
+
+import polars as pl
+
+from financial_dashboard.core.interfaces.readers import IDataReader
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.dataframe import IDataFrame
+
+from financial_dashboard.infrastructure.dataframes.polars import PolarsDataFrame
+
+from financial_dashboard.processing.filters.expressions import Expr
+from financial_dashboard.processing.filters.expressions import FilterContext
+
+
+class ParquetReader(IDataReader):
+    def __init__(self, file_path: Path, parse_settings: Optional[IParseSettings] = None):
+        self._file_path = file_path
+        self._parse_settings = parse_settings
+
+    def read(self, usecols: Optional[List[str]] = None, where: Optional[Expr] = None, context: Optional[FilterContext] = None) -> IDataFrame:
+        """Lazily scans the file so that ``where`` and ``usecols`` are applied at scan time."""
+        frame = pl.scan_parquet(self._file_path)
+        if where is not None:
+            from financial_dashboard.processing.filters.compilers import to_polars
+            frame = frame.filter(to_polars(where, context or FilterContext.from_parse_settings(self._parse_settings)))
+        if usecols is not None:
+            frame = frame.select(usecols)
+        return PolarsDataFrame(data=frame.collect())
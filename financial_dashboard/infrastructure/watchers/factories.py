@@ -0,0 +1,20 @@
+from pathlib import Path
+from typing import Iterable
+
+from financial_dashboard.core.interfaces.watchers import IFileWatcher
+
+from financial_dashboard.infrastructure.watchers.inotify import InotifyFileWatcher
+from financial_dashboard.infrastructure.watchers.inotify import inotify_available
+from financial_dashboard.infrastructure.watchers.polling import PollingFileWatcher
+
+
+def create_file_watcher(roots: Iterable[Path], polling_interval: float = 1.0, prefer_native: bool = True) -> IFileWatcher:
+    """inotify watcher where available, otherwise a polling watcher."""
+    roots = [Path(root) for root in roots]
+    if prefer_native and inotify_available():
+        try:
+            return InotifyFileWatcher(roots)
+        except OSError:
+            # Watch limits (fs.inotify.max_user_watches) or unsupported file systems.
+            pass
+    return PollingFileWatcher(roots, interval=polling_interval)
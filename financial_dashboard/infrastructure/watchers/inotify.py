@@ -0,0 +1,131 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from financial_dashboard.core.entities.watching import FileChange
+from financial_dashboard.core.entities.watching import FileChangeKind
+
+from financial_dashboard.core.interfaces.watchers import IFileWatcher
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct('iIII')
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, 'inotify_init1'):
+        return None
+    return libc
+
+
+_libc = _load_libc()
+
+
+def inotify_available() -> bool:
+    return _libc is not None
+
+
+class InotifyFileWatcher(IFileWatcher):
+    """Linux watcher over the inotify API (via ctypes), recursive over the roots.
+
+    Files are reported when they are closed after writing or moved into
+    place, so half-written exports do not trigger work; new directories are
+    watched as they appear. A queue overflow, or a new directory that cannot
+    be watched, is reported as ``RESCAN``.
+    """
+    def __init__(self, roots: Iterable[Path]) -> None:
+        if _libc is None:
+            raise OSError('inotify is not available on this platform')
+        self._roots = [Path(root) for root in roots]
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watches: Dict[int, Path] = {}
+        # Failures here propagate, so callers can fall back to polling.
+        for root in self._roots:
+            for directory, _, _ in os.walk(root):
+                self._watch(Path(directory))
+
+    def _watch(self, directory: Path) -> None:
+        descriptor = _libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if descriptor < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._watches[descriptor] = directory
+
+    def _watch_tree(self, root: Path) -> List[FileChange]:
+        """Watches a new directory tree; one that vanished or hit the watch limit asks for a rescan."""
+        try:
+            for directory, _, _ in os.walk(root):
+                self._watch(Path(directory))
+        except OSError:
+            return [FileChange(path=watched, kind=FileChangeKind.RESCAN) for watched in self._roots if root.is_relative_to(watched)]
+        return []
+
+    def poll(self, timeout: float) -> List[FileChange]:
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0.0))
+        if not readable:
+            return []
+        try:
+            buffer = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+        changes = []
+        offset = 0
+        while offset + _EVENT.size <= len(buffer):
+            descriptor, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            name = buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                changes.extend(FileChange(path=root, kind=FileChangeKind.RESCAN) for root in self._roots)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(descriptor, None)
+                continue
+            directory = self._watches.get(descriptor)
+            if directory is None:
+                continue
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    rescans = self._watch_tree(path)
+                    if rescans:
+                        changes.extend(rescans)
+                        continue
+                    changes.extend(
+                        FileChange(path=Path(sub) / file, kind=FileChangeKind.WRITTEN)
+                        for sub, _, files in os.walk(path) for file in files
+                    )
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                changes.append(FileChange(path=path, kind=FileChangeKind.WRITTEN))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                changes.append(FileChange(path=path, kind=FileChangeKind.DELETED))
+        return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches = {}
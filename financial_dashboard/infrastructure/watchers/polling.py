@@ -0,0 +1,51 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from financial_dashboard.core.entities.watching import FileChange
+from financial_dashboard.core.entities.watching import FileChangeKind
+
+from financial_dashboard.core.interfaces.watchers import IFileWatcher
+
+
+class PollingFileWatcher(IFileWatcher):
+    """Portable watcher comparing ``(size, mtime)`` snapshots of the roots."""
+    def __init__(self, roots: Iterable[Path], interval: float = 1.0) -> None:
+        self._roots = [Path(root) for root in roots]
+        self._interval = interval
+        self._snapshot = self._scan()
+        self._last_scan = time.monotonic()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root in self._roots:
+            for directory, _, files in os.walk(root):
+                for name in files:
+                    path = Path(directory) / name
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout: float) -> List[FileChange]:
+        wait = self._last_scan + self._interval - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0.0))
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        snapshot = self._scan()
+        self._last_scan = time.monotonic()
+        changes = [
+            FileChange(path=path, kind=FileChangeKind.WRITTEN)
+            for path, state in snapshot.items() if self._snapshot.get(path) != state
+        ]
+        changes.extend(FileChange(path=path, kind=FileChangeKind.DELETED) for path in self._snapshot if path not in snapshot)
+        self._snapshot = snapshot
+        return changes
+
+    def close(self) -> None:
+        self._snapshot = {}
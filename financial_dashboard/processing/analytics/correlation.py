@@ -0,0 +1,190 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+
+def returns_panel(panel: pd.DataFrame, column: str = ColumnNames.CLOSE, log: bool = True) -> pd.DataFrame:
+    """Per-contract returns of ``column`` from a ``PanelBuilder`` panel (or a plain price frame)."""
+    prices = panel.xs(column, axis=1, level=1) if isinstance(panel.columns, pd.MultiIndex) else panel
+    values = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+    returns = np.full_like(values, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = values[1:] / values[:-1]
+        returns[1:] = np.log(ratio) if log else ratio - 1.0
+    return pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+
+
+def _matrices(
+        n: np.ndarray,
+        sx: np.ndarray,
+        sxx: np.ndarray,
+        sxy: np.ndarray,
+        ddof: int,
+        min_periods: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Covariance and correlation from pairwise window sums.
+
+    ``sx[..., i, j]`` and ``sxx[..., i, j]`` are sums of ``x_i`` and ``x_i**2``
+    over rows where both ``i`` and ``j`` are present; ``n`` counts such rows.
+    """
+    sy = np.swapaxes(sx, -1, -2)
+    syy = np.swapaxes(sxx, -1, -2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = sx / n
+        cxy = sxy - mean_x * sy
+        covariance = cxy / (n - ddof)
+        var_x = np.maximum(sxx - mean_x * sx, 0.0)
+        var_y = np.maximum(syy - sy * sy / n, 0.0)
+        correlation = np.clip(cxy / np.sqrt(var_x * var_y), -1.0, 1.0)
+    insufficient = (n < min_periods) | (n - ddof <= 0)
+    covariance[insufficient] = np.nan
+    correlation[insufficient] = np.nan
+    return covariance, correlation
+
+
+@dataclass(frozen=True)
+class RollingMatrices:
+    """Rolling ``(time, column, column)`` covariance and correlation stacks."""
+    index: pd.Index
+    columns: pd.Index
+    covariance: np.ndarray
+    correlation: np.ndarray
+    counts: np.ndarray
+
+    def at(self, position: int = -1, kind: str = 'correlation') -> pd.DataFrame:
+        return pd.DataFrame(getattr(self, kind)[position], index=self.columns, columns=self.columns)
+
+    def to_frame(self, kind: str = 'correlation') -> pd.DataFrame:
+        """Long layout of ``DataFrame.rolling().corr()``: ``(time, column)`` rows, one column per contract."""
+        matrices = getattr(self, kind)
+        index = pd.MultiIndex.from_product([self.index, self.columns])
+        return pd.DataFrame(matrices.reshape(-1, self.columns.size), index=index, columns=self.columns)
+
+
+class RollingCovarianceEngine:
+    """Rolling covariance/correlation matrices of an aligned returns panel.
+
+    All pairs are computed at once from running sums: the window sums of
+    ``x_i``, ``x_i**2`` and ``x_i * x_j`` are differences of cumulative sums,
+    so every step costs O(N**2) regardless of the window length. Missing
+    values are handled pairwise like pandas. Columns are centred first so the
+    cumulative sums stay small relative to the window moments.
+    """
+    def __init__(self, window: int, min_periods: Optional[int] = None, ddof: int = 1) -> None:
+        if window < 1:
+            raise CustomValueError(f'window must be positive, got {window}')
+        self._window = window
+        self._min_periods = window if min_periods is None else min_periods
+        self._ddof = ddof
+
+    def _windowed(self, contributions: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(contributions, axis=0)
+        sums[self._window:] -= sums[:-self._window].copy()
+        return sums
+
+    def _sums(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        valid = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            centre = np.nan_to_num(np.nanmean(values, axis=0)) if values.size else np.zeros(values.shape[1])
+        x = np.where(valid, values - centre, 0.0)
+        sxy = self._windowed(x[:, :, None] * x[:, None, :])
+        if valid.all():
+            n_rows = values.shape[0]
+            n = np.minimum(np.arange(1, n_rows + 1), self._window).astype(np.float64)[:, None, None]
+            n = np.broadcast_to(n, sxy.shape)
+            sx = np.broadcast_to(self._windowed(x)[:, :, None], sxy.shape)
+            sxx = np.broadcast_to(self._windowed(x * x)[:, :, None], sxy.shape)
+            return n, sx, sxx, sxy
+        mask = valid.astype(np.float64)
+        n = self._windowed(mask[:, :, None] * mask[:, None, :])
+        sx = self._windowed(x[:, :, None] * mask[:, None, :])
+        sxx = self._windowed((x * x)[:, :, None] * mask[:, None, :])
+        return n, sx, sxx, sxy
+
+    def compute(self, returns: pd.DataFrame) -> RollingMatrices:
+        values = returns.to_numpy(dtype=np.float64, na_value=np.nan)
+        n, sx, sxx, sxy = self._sums(values)
+        covariance, correlation = _matrices(n, sx, sxx, sxy, self._ddof, self._min_periods)
+        return RollingMatrices(
+            index=returns.index,
+            columns=returns.columns,
+            covariance=covariance,
+            correlation=correlation,
+            counts=np.ascontiguousarray(n, dtype=np.int64)
+        )
+
+    def latest(self, returns: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Covariance and correlation of the last window only."""
+        matrices = self.compute(returns.iloc[-self._window:])
+        return matrices.at(-1, 'covariance'), matrices.at(-1, 'correlation')
+
+
+class RollingCovarianceStream:
+    """Incremental latest-window covariance/correlation for live updates.
+
+    Each ``push`` adds the new row to the running pairwise sums and removes
+    the row leaving the window, O(N**2) per update. The sums are rebuilt from
+    the ring buffer once per window to stop floating point drift.
+    """
+    def __init__(self, columns: Sequence[str], window: int, min_periods: Optional[int] = None, ddof: int = 1) -> None:
+        if window < 1:
+            raise CustomValueError(f'window must be positive, got {window}')
+        self._columns = pd.Index(columns)
+        self._window = window
+        self._min_periods = window if min_periods is None else min_periods
+        self._ddof = ddof
+        size = self._columns.size
+        self._buffer = np.full((window, size), np.nan)
+        self._pushed = 0
+        self._n = np.zeros((size, size))
+        self._sx = np.zeros((size, size))
+        self._sxx = np.zeros((size, size))
+        self._sxy = np.zeros((size, size))
+
+    @staticmethod
+    def _contribution(row: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        valid = ~np.isnan(row)
+        mask = valid.astype(np.float64)
+        x = np.where(valid, row, 0.0)
+        return np.outer(mask, mask), np.outer(x, mask), np.outer(x * x, mask), np.outer(x, x)
+
+    def _resync(self) -> None:
+        rows = self._buffer[:min(self._pushed, self._window)]
+        valid = ~np.isnan(rows)
+        mask = valid.astype(np.float64)
+        x = np.where(valid, rows, 0.0)
+        self._n = mask.T @ mask
+        self._sx = x.T @ mask
+        self._sxx = (x * x).T @ mask
+        self._sxy = x.T @ x
+
+    def push(self, row: Sequence[float]) -> None:
+        row = np.asarray(row, dtype=np.float64)
+        if row.shape != (self._columns.size,):
+            raise CustomValueError(f'row must have {self._columns.size} values, got shape {row.shape}')
+        slot = self._pushed % self._window
+        if self._pushed >= self._window:
+            for total, part in zip((self._n, self._sx, self._sxx, self._sxy), self._contribution(self._buffer[slot])):
+                total -= part
+        for total, part in zip((self._n, self._sx, self._sxx, self._sxy), self._contribution(row)):
+            total += part
+        self._buffer[slot] = row
+        self._pushed += 1
+        if self._pushed % self._window == 0:
+            self._resync()
+
+    def _latest(self) -> Tuple[np.ndarray, np.ndarray]:
+        return _matrices(self._n, self._sx, self._sxx, self._sxy, self._ddof, self._min_periods)
+
+    @property
+    def covariance(self) -> pd.DataFrame:
+        return pd.DataFrame(self._latest()[0], index=self._columns, columns=self._columns)
+
+    @property
+    def correlation(self) -> pd.DataFrame:
+        return pd.DataFrame(self._latest()[1], index=self._columns, columns=self._columns)
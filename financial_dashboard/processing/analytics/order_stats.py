@@ -0,0 +1,354 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+
+DEFAULT_QUANTILES = (0.5,)
+_CHUNK_WINDOWS = 1 << 15
+
+
+def output_name(column: str, quantile: Optional[float] = None) -> str:
+    """``Close_q50`` for the rolling median of ``Close``, ``Close_rank`` for its percentile rank."""
+    return f'{column}_rank' if quantile is None else f'{column}_q{quantile * 100:g}'
+
+
+def _check_quantiles(quantiles: Sequence[float]) -> None:
+    for quantile in quantiles:
+        if not 0.0 <= quantile <= 1.0:
+            raise CustomValueError(f'quantile must be within [0, 1], got {quantile}')
+
+
+def quantize(values: np.ndarray, tick_size: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Dense codes of ``values`` and the sorted levels they index; NaN gets code ``len(levels)``.
+
+    With ``tick_size`` values are rounded to whole ticks first, which keeps
+    the alphabet small for prices.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    keys = np.rint(values[valid] / tick_size) if tick_size is not None else values[valid]
+    levels, inverse = np.unique(keys, return_inverse=True)
+    codes = np.full(values.size, levels.size, dtype=np.int64)
+    codes[valid] = inverse
+    return codes, levels * tick_size if tick_size is not None else levels
+
+
+class WaveletMatrix:
+    """Static rank/select structure over integer codes in ``[0, sigma)``.
+
+    Level ``b`` holds bit ``b`` (most significant first) of every code after
+    stably partitioning by the higher bits, with prefix counts of ones. Range
+    k-th smallest and range counting descend one level per bit, so a query
+    costs O(log sigma) and is vectorised over any number of ranges.
+    """
+    def __init__(self, codes: np.ndarray, sigma: int) -> None:
+        self._bits = max(1, int(sigma - 1).bit_length())
+        index_type = np.int32 if len(codes) < 2 ** 31 else np.int64
+        self._ones: List[np.ndarray] = []
+        self._zeros: List[int] = []
+        current = np.asarray(codes, dtype=index_type)
+        positions = np.arange(current.size, dtype=index_type)
+        for level in range(self._bits):
+            bit = ((current >> (self._bits - 1 - level)) & 1).astype(bool)
+            ones = np.zeros(current.size + 1, dtype=index_type)
+            np.cumsum(bit, out=ones[1:])
+            zeros = current.size - int(ones[-1])
+            self._ones.append(ones)
+            self._zeros.append(zeros)
+            # Stable partition by the bit: zeros keep their order in front, ones follow.
+            before = ones[:-1]
+            partitioned = np.empty_like(current)
+            partitioned[np.where(bit, before + index_type(zeros), positions - before)] = current
+            current = partitioned
+
+    @property
+    def _index_type(self) -> type:
+        return self._ones[0].dtype.type
+
+    def kth(self, left: np.ndarray, right: np.ndarray, k: np.ndarray) -> np.ndarray:
+        """``k``-th smallest (0-based) code in every ``[left, right)``; ``k`` must be below the range length."""
+        index_type = self._index_type
+        left = np.asarray(left, dtype=index_type)
+        right = np.asarray(right, dtype=index_type)
+        k = np.array(k, dtype=index_type)
+        value = np.zeros(left.shape, dtype=np.int64)
+        for level in range(self._bits):
+            ones = self._ones[level]
+            left_ones = ones[left]
+            right_ones = ones[right]
+            zeros = (right - left) - (right_ones - left_ones)
+            high = k >= zeros
+            value <<= 1
+            value |= high
+            np.subtract(k, zeros, out=k, where=high)
+            level_zeros = index_type(self._zeros[level])
+            left = np.where(high, left_ones + level_zeros, left - left_ones)
+            right = np.where(high, right_ones + level_zeros, right - right_ones)
+        return value
+
+    def count_less(self, left: np.ndarray, right: np.ndarray, bound: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Number of codes below ``bound`` and equal to it in every ``[left, right)``; ``bound`` must be below ``2 ** bits``.
+
+        The descent follows the bits of ``bound``, so the range left after the
+        last level holds exactly its occurrences.
+        """
+        index_type = self._index_type
+        left = np.asarray(left, dtype=index_type)
+        right = np.asarray(right, dtype=index_type)
+        bound = np.asarray(bound, dtype=np.int64)
+        count = np.zeros(left.shape, dtype=np.int64)
+        for level in range(self._bits):
+            ones = self._ones[level]
+            left_ones = ones[left]
+            right_ones = ones[right]
+            high = ((bound >> (self._bits - 1 - level)) & 1).astype(bool)
+            np.add(count, (right - left) - (right_ones - left_ones), out=count, where=high)
+            level_zeros = index_type(self._zeros[level])
+            left = np.where(high, left_ones + level_zeros, left - left_ones)
+            right = np.where(high, right_ones + level_zeros, right - right_ones)
+        return count, right - left
+
+
+class RollingOrderStatistics:
+    """Rolling quantiles, medians and percentile ranks over long windows.
+
+    Values are quantized to dense codes (optionally to whole ticks) and put
+    into a wavelet matrix per chunk of windows, covering only the values
+    those windows see; every window's k-th smallest value and the count
+    below a value are then O(log sigma) vectorised descents, instead of a
+    sorted-window update per row. NaNs are skipped like in pandas and
+    ``min_periods`` counts valid values. Quantiles interpolate linearly, the
+    rank is ``rolling().rank(pct=True)`` with average ties.
+    """
+    def __init__(self, window: int, min_periods: Optional[int] = None, tick_size: Optional[float] = None) -> None:
+        if window < 1:
+            raise CustomValueError(f'window must be positive, got {window}')
+        self._window = window
+        self._min_periods = window if min_periods is None else min_periods
+        self._tick_size = tick_size
+
+    def compute(self, values: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES, rank: bool = False) -> Dict[Optional[float], np.ndarray]:
+        """Rolling series per quantile, plus the rank under the key ``None`` when ``rank`` is set."""
+        _check_quantiles(quantiles)
+        values = np.asarray(values, dtype=np.float64)
+        right = np.arange(1, values.size + 1)
+        left = np.maximum(right - self._window, 0)
+        valid = np.concatenate(([0], np.cumsum(~np.isnan(values))))
+        counts = valid[right] - valid[left]
+        enough = (counts >= max(self._min_periods, 1))
+        last = np.maximum(counts - 1, 0)
+        results: Dict[Optional[float], np.ndarray] = {quantile: np.full(values.size, np.nan) for quantile in quantiles}
+        if rank:
+            results[None] = np.full(values.size, np.nan)
+        # Each chunk of windows gets its own matrix over the values it can see, so the
+        # alphabet stays near ``chunk + window`` and the per-level arrays stay in cache.
+        chunk = max(_CHUNK_WINDOWS, self._window)
+        for start in range(0, values.size, chunk):
+            part = slice(start, start + chunk)
+            offset = left[start]
+            codes, levels = quantize(values[offset:start + chunk], self._tick_size)
+            matrix = WaveletMatrix(codes, levels.size + 1)
+            # NaN has the largest code, so the first ``counts`` order statistics are the valid values.
+            lookup = np.append(levels, np.nan)
+            chunk_left, chunk_right, chunk_enough = left[part] - offset, right[part] - offset, enough[part]
+            for quantile in quantiles:
+                position = quantile * last[part]
+                lower = np.where(chunk_enough, np.floor(position), 0).astype(np.int64)
+                upper = np.where(chunk_enough, np.ceil(position), 0).astype(np.int64)
+                low = lookup[matrix.kth(chunk_left, chunk_right, lower)]
+                high = lookup[matrix.kth(chunk_left, chunk_right, upper)] if (upper != lower).any() else low
+                results[quantile][part] = np.where(chunk_enough, low + (high - low) * (position - lower), np.nan)
+            if rank:
+                chunk_codes = codes[start - offset:]
+                less, equal = matrix.count_less(chunk_left, chunk_right, chunk_codes)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ranks = (less + (equal + 1) / 2.0) / counts[part]
+                results[None][part] = np.where(chunk_enough & (chunk_codes < levels.size), ranks, np.nan)
+        return results
+
+    def quantile(self, values: np.ndarray, quantile: float) -> np.ndarray:
+        return self.compute(values, (quantile,))[quantile]
+
+    def median(self, values: np.ndarray) -> np.ndarray:
+        return self.quantile(values, 0.5)
+
+    def rank(self, values: np.ndarray) -> np.ndarray:
+        return self.compute(values, (), rank=True)[None]
+
+    def _grouped(self, values: np.ndarray, groups: Optional[np.ndarray], quantiles: Sequence[float], rank: bool) -> Dict[Optional[float], np.ndarray]:
+        if groups is None:
+            return self.compute(values, quantiles, rank)
+        results = {key: np.full(values.size, np.nan) for key in [*quantiles, *([None] if rank else [])]}
+        codes, uniques = pd.factorize(groups, use_na_sentinel=True)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for group in range(len(uniques)):
+            positions = order[bounds[group]:bounds[group + 1]]
+            for key, result in self.compute(values[positions], quantiles, rank).items():
+                results[key][positions] = result
+        return results
+
+    def frame(
+            self,
+            data,
+            columns: Optional[Sequence[str]] = None,
+            quantiles: Sequence[float] = DEFAULT_QUANTILES,
+            rank: bool = False,
+            by: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Rolling statistics of a pandas Series or of ``columns`` of a frame, aligned to its index.
+
+        ``by`` (e.g. the ticker column of a long frame) restarts the window
+        per group, keeping the rows in their original order.
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame(data.name if data.name is not None else 'value')
+        columns = list(columns) if columns is not None else [column for column in data.columns if column != by]
+        groups = data[by].to_numpy() if by is not None else None
+        result = {}
+        for column in columns:
+            series = self._grouped(data[column].to_numpy(dtype=np.float64, na_value=np.nan), groups, quantiles, rank)
+            for key, values in series.items():
+                result[output_name(column, key)] = values
+        return pd.DataFrame(result, index=data.index)
+
+    def polars(
+            self,
+            data,
+            columns: Sequence[str],
+            quantiles: Sequence[float] = DEFAULT_QUANTILES,
+            rank: bool = False,
+            by: Optional[str] = None
+    ):
+        """``data`` with the rolling statistics of ``columns`` appended as new columns."""
+        import polars as pl
+        groups = data.get_column(by).to_numpy() if by is not None else None
+        new_columns = []
+        for column in columns:
+            values = data.get_column(column).cast(pl.Float64).fill_null(np.nan).to_numpy()
+            for key, series in self._grouped(values, groups, quantiles, rank).items():
+                new_columns.append(pl.Series(output_name(column, key), series))
+        return data.with_columns(new_columns)
+
+
+class RollingQuantileStream:
+    """Latest-window quantiles and ranks of a live series, O(log range) per update.
+
+    Values are kept as whole ticks in a Fenwick tree of counts over the tick
+    range seen so far; the row leaving the window is taken from a ring buffer
+    and removed. k-th smallest is a binary-lifting descent of the tree. When
+    a value falls outside the covered range the tree is rebuilt with twice
+    the span, so growth is amortised.
+    """
+    def __init__(self, window: int, tick_size: float, min_periods: Optional[int] = None) -> None:
+        if window < 1:
+            raise CustomValueError(f'window must be positive, got {window}')
+        if tick_size <= 0:
+            raise CustomValueError(f'tick_size must be positive, got {tick_size}')
+        self._window = window
+        self._tick_size = tick_size
+        self._min_periods = window if min_periods is None else min_periods
+        self._buffer: List[Optional[int]] = [None] * window
+        self._pushed = 0
+        self._count = 0
+        self._base = 0
+        self._size = 0
+        self._tree: List[int] = [0]
+
+    @property
+    def count(self) -> int:
+        """Valid values in the current window."""
+        return self._count
+
+    def _add(self, tick: int, delta: int) -> None:
+        position = tick - self._base + 1
+        tree = self._tree
+        while position <= self._size:
+            tree[position] += delta
+            position += position & -position
+
+    def _prefix(self, tick: int) -> int:
+        """Values of at most ``tick`` in the window."""
+        position = min(tick - self._base + 1, self._size)
+        total = 0
+        tree = self._tree
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    def _kth(self, k: int) -> int:
+        """Tick of the ``k``-th smallest value, 1-based."""
+        position = 0
+        step = self._size
+        tree = self._tree
+        while step:
+            following = position + step
+            if following <= self._size and tree[following] < k:
+                position = following
+                k -= tree[following]
+            step >>= 1
+        return self._base + position
+
+    def _rebuild(self, tick: int) -> None:
+        ticks = [value for value in self._buffer if value is not None] + [tick]
+        low, high = min(ticks), max(ticks)
+        size = max(self._size, 64)
+        while size < (high - low + 1) * 2:
+            size *= 2
+        self._base = low - (size - (high - low + 1)) // 2
+        self._size = size
+        self._tree = [0] * (size + 1)
+        for value in ticks[:-1]:
+            self._add(value, 1)
+
+    def push(self, value: float) -> None:
+        slot = self._pushed % self._window
+        leaving = self._buffer[slot] if self._pushed >= self._window else None
+        if leaving is not None:
+            self._add(leaving, -1)
+            self._count -= 1
+        self._buffer[slot] = None
+        tick = None
+        if not np.isnan(value):
+            tick = int(round(value / self._tick_size))
+            if not self._size or not self._base <= tick < self._base + self._size:
+                self._rebuild(tick)
+            self._add(tick, 1)
+            self._count += 1
+        self._buffer[slot] = tick
+        self._pushed += 1
+
+    def extend(self, values: Sequence[float]) -> None:
+        for value in values:
+            self.push(float(value))
+
+    def quantile(self, quantile: float) -> float:
+        _check_quantiles((quantile,))
+        if self._count < max(self._min_periods, 1):
+            return np.nan
+        position = quantile * (self._count - 1)
+        lower = int(np.floor(position))
+        upper = int(np.ceil(position))
+        low = self._kth(lower + 1) * self._tick_size
+        high = self._kth(upper + 1) * self._tick_size if upper != lower else low
+        return low + (high - low) * (position - lower)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def rank(self, value: Optional[float] = None) -> float:
+        """Percentile rank of ``value`` (the latest value by default) within the window."""
+        if value is None:
+            if not self._pushed:
+                return np.nan
+            tick = self._buffer[(self._pushed - 1) % self._window]
+        else:
+            tick = None if np.isnan(value) else int(round(value / self._tick_size))
+        if tick is None or self._count < max(self._min_periods, 1):
+            return np.nan
+        less = self._prefix(tick - 1) if tick > self._base else 0
+        equal = (self._prefix(tick) if tick >= self._base else 0) - less
+        return (less + (equal + 1) / 2.0) / self._count
@@ -0,0 +1,298 @@
+import datetime as dt
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.profiles import ProfileGrouping
+from financial_dashboard.core.entities.profiles import ProfileMode
+from financial_dashboard.core.entities.sessions import TradingSession
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.processing.sessions.calendar import MoexSessionCalendar
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+# (trading day, session ID); the session ID is 0 for whole-day profiles.
+ProfileKey = Tuple[np.datetime64, int]
+# Upper bound of the padded matrices used for value areas (8 bytes per cell).
+_MAX_MATRIX_CELLS = 2 ** 22
+
+
+@dataclass(frozen=True)
+class PriceHistogram:
+    """Volume (or TPO count) per price tick starting at ``first_tick``."""
+    first_tick: int
+    counts: np.ndarray
+    tick_size: float
+
+    @property
+    def prices(self) -> np.ndarray:
+        return (self.first_tick + np.arange(self.counts.size)) * self.tick_size
+
+    @property
+    def total(self) -> float:
+        return float(self.counts.sum())
+
+    def __add__(self, other: 'PriceHistogram') -> 'PriceHistogram':
+        if not other.counts.size:
+            return self
+        if not self.counts.size:
+            return other
+        first = min(self.first_tick, other.first_tick)
+        last = max(self.first_tick + self.counts.size, other.first_tick + other.counts.size)
+        counts = np.zeros(last - first, dtype=np.float64)
+        counts[self.first_tick - first:self.first_tick - first + self.counts.size] += self.counts
+        counts[other.first_tick - first:other.first_tick - first + other.counts.size] += other.counts
+        return PriceHistogram(first_tick=first, counts=counts, tick_size=self.tick_size)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'price': self.prices, 'volume': self.counts})
+
+
+def value_areas(matrix: np.ndarray, share: float = 0.7, widths: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """POC, value-area low and high bin indices for every row of a profile matrix.
+
+    The value area grows from the POC towards the larger neighbouring bin
+    until it holds ``share`` of the row total; all rows expand in lockstep.
+    ``widths`` limits rows that are padded on the right.
+    """
+    n_rows, n_bins = matrix.shape
+    rows = np.arange(n_rows)
+    widths = np.full(n_rows, n_bins, dtype=np.int64) if widths is None else np.asarray(widths, dtype=np.int64)
+    poc = np.argmax(matrix, axis=1) if n_bins else np.zeros(n_rows, dtype=np.int64)
+    low = poc.copy()
+    high = poc.copy()
+    if not n_bins:
+        return poc, low, high
+    accumulated = matrix[rows, poc].astype(np.float64)
+    target = share * matrix.sum(axis=1)
+    active = accumulated < target
+    while active.any():
+        up = np.where(high + 1 < widths, matrix[rows, np.minimum(high + 1, n_bins - 1)], -1.0)
+        down = np.where(low > 0, matrix[rows, np.maximum(low - 1, 0)], -1.0)
+        take_up = active & (up >= down) & (up >= 0)
+        take_down = active & ~take_up & (down >= 0)
+        high += take_up
+        low -= take_down
+        accumulated += np.where(take_up, up, 0.0) + np.where(take_down, down, 0.0)
+        active &= (take_up | take_down) & (accumulated < target)
+    return poc, low, high
+
+
+class VolumeProfileEngine:
+    """Builds volume-at-price and TPO profiles from OHLCV bars.
+
+    Prices are binned to integer ticks and every group's histogram is
+    accumulated with ``bincount`` over a difference array, so a profile costs
+    O(bars + price levels). Finished per-day/per-session histograms are cached
+    per contract; multi-day profiles are sums of cached histograms.
+    """
+    def __init__(
+            self,
+            tick_size: float,
+            mode: ProfileMode = ProfileMode.RANGE,
+            value_area_share: float = 0.7,
+            calendar: Optional[MoexSessionCalendar] = None,
+            parse_settings: Optional[IParseSettings] = None
+    ) -> None:
+        if tick_size <= 0:
+            raise CustomValueError(f'tick_size must be positive, got {tick_size}')
+        if not 0 < value_area_share <= 1:
+            raise CustomValueError(f'value_area_share must be in (0, 1], got {value_area_share}')
+        self._tick_size = tick_size
+        self._mode = mode
+        self._value_area_share = value_area_share
+        self._calendar = calendar or MoexSessionCalendar()
+        self._parse_settings = parse_settings
+        # Cache:
+        self._histogram_cache: Dict[Tuple[str, ProfileGrouping], Dict[ProfileKey, PriceHistogram]] = {}
+
+    def clear_cache(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._histogram_cache = {}
+        else:
+            self._histogram_cache = {cache_key: value for cache_key, value in self._histogram_cache.items() if cache_key[0] != key}
+
+    def _ticks(self, data: pd.DataFrame, column: str) -> np.ndarray:
+        return np.rint(data[column].to_numpy(dtype=np.float64, na_value=np.nan) / self._tick_size).astype(np.int64)
+
+    def group_histograms(self, data: pd.DataFrame, group_ids: np.ndarray, n_groups: int) -> List[PriceHistogram]:
+        """Profiles of ``n_groups`` row groups.
+
+        Every group is binned over its own ``[low, high]`` tick window and the
+        windows are laid out back to back in one flat array, so memory follows
+        the groups' ranges rather than the range of the whole frame.
+        """
+        valid = data[ColumnNames.CLOSE].notna().to_numpy() & data[ColumnNames.VOL].notna().to_numpy()
+        if self._mode is not ProfileMode.CLOSE:
+            valid &= data[ColumnNames.LOW].notna().to_numpy() & data[ColumnNames.HIGH].notna().to_numpy()
+        data = data[valid]
+        group_ids = group_ids[valid]
+        empty = PriceHistogram(first_tick=0, counts=np.zeros(0), tick_size=self._tick_size)
+        if not len(data):
+            return [empty] * n_groups
+
+        volume = data[ColumnNames.VOL].to_numpy(dtype=np.float64)
+        if self._mode is ProfileMode.CLOSE:
+            low = high = self._ticks(data, ColumnNames.CLOSE)
+        else:
+            low = self._ticks(data, ColumnNames.LOW)
+            high = np.maximum(self._ticks(data, ColumnNames.HIGH), low)
+        present = np.bincount(group_ids, minlength=n_groups) > 0
+        firsts = np.full(n_groups, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(firsts, group_ids, low)
+        lasts = np.full(n_groups, np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(lasts, group_ids, high)
+        firsts = np.where(present, firsts, 0)
+        n_bins = np.where(present, lasts - firsts + 1, 0)
+
+        if self._mode is ProfileMode.CLOSE:
+            offsets = np.concatenate(([0], np.cumsum(n_bins)))
+            counts = np.bincount(offsets[group_ids] + (low - firsts[group_ids]), weights=volume, minlength=int(offsets[-1]))
+        else:
+            weights = volume / (high - low + 1) if self._mode is ProfileMode.RANGE else np.ones(low.size)
+            # Difference array: +w at the low tick, -w past the high tick, then a running sum per group.
+            strides = np.where(present, n_bins + 1, 0)
+            starts = np.concatenate(([0], np.cumsum(strides)))
+            size = int(starts[-1])
+            positions = starts[group_ids] - firsts[group_ids]
+            deltas = np.bincount(positions + low, weights=weights, minlength=size)
+            deltas -= np.bincount(positions + high + 1, weights=weights, minlength=size)
+            running = np.cumsum(deltas)
+            # Every group's deltas sum to zero; subtracting the running sum before the group drops the carry-over.
+            carry = np.concatenate(([0.0], running))[starts[:-1]]
+            running -= np.repeat(carry, strides)
+            offsets, counts = starts, running
+        return [
+            PriceHistogram(first_tick=int(firsts[group]), counts=counts[offsets[group]:offsets[group] + n_bins[group]], tick_size=self._tick_size)
+            if present[group] else empty
+            for group in range(n_groups)
+        ]
+
+    def _group(self, data: pd.DataFrame, grouping: ProfileGrouping) -> Tuple[List[ProfileKey], np.ndarray]:
+        """Sorted group keys and the group of every row; -1 for rows outside trading sessions."""
+        masks = self._calendar.classify_frame(data, self._parse_settings)
+        session_ids = masks.session_ids.astype(np.int64) if grouping is ProfileGrouping.SESSION else np.zeros(len(data), dtype=np.int64)
+        trading = masks.trading & ~masks.clearing
+        codes = masks.trading_days.astype(np.int64) * 8 + session_ids
+        unique, trading_group_ids = np.unique(codes[trading], return_inverse=True)
+        group_ids = np.full(len(data), -1, dtype=np.int64)
+        group_ids[trading] = trading_group_ids
+        keys = [(np.datetime64(int(code // 8), 'D'), int(code % 8)) for code in unique]
+        return keys, group_ids
+
+    def session_histograms(self, key: str, data: pd.DataFrame, grouping: ProfileGrouping = ProfileGrouping.TRADING_DAY) -> Dict[ProfileKey, PriceHistogram]:
+        """Histograms per trading day (or session) of a contract's bars.
+
+        Closed groups are served from the cache. The first group of ``data``
+        may start mid-session and the last one may still be forming, so both
+        are always recomputed and never cached.
+        """
+        keys, group_ids = self._group(data, grouping)
+        cache = self._histogram_cache.setdefault((key, grouping), {})
+        result: Dict[ProfileKey, PriceHistogram] = {}
+        missing = []
+        edges = {0, len(keys) - 1}
+        for index, profile_key in enumerate(keys):
+            if profile_key in cache and index not in edges:
+                result[profile_key] = cache[profile_key]
+            else:
+                missing.append(index)
+        if missing:
+            selected = np.isin(group_ids, missing)
+            remap = np.full(len(keys), -1, dtype=np.int64)
+            remap[missing] = np.arange(len(missing))
+            histograms = self.group_histograms(data[selected], remap[group_ids[selected]], len(missing))
+            for computed, index in zip(histograms, missing):
+                nonzero = np.flatnonzero(computed.counts > 1e-12)
+                if nonzero.size:
+                    counts = computed.counts[nonzero[0]:nonzero[-1] + 1].copy()
+                    histogram = PriceHistogram(first_tick=computed.first_tick + int(nonzero[0]), counts=counts, tick_size=self._tick_size)
+                else:
+                    histogram = PriceHistogram(first_tick=0, counts=np.zeros(0), tick_size=self._tick_size)
+                result[keys[index]] = histogram
+                if index not in edges:
+                    cache[keys[index]] = histogram
+        return dict(sorted(result.items()))
+
+    def profile(
+            self,
+            key: str,
+            data: pd.DataFrame,
+            start: Optional[dt.date] = None,
+            end: Optional[dt.date] = None,
+            sessions: Optional[List[TradingSession]] = None
+    ) -> PriceHistogram:
+        """Composite profile over trading days ``[start, end]``, optionally restricted to sessions."""
+        grouping = ProfileGrouping.SESSION if sessions else ProfileGrouping.TRADING_DAY
+        session_values = {session.value for session in sessions} if sessions else None
+        total = PriceHistogram(first_tick=0, counts=np.zeros(0), tick_size=self._tick_size)
+        for (day, session), histogram in self.session_histograms(key, data, grouping).items():
+            if start is not None and day < np.datetime64(start, 'D'):
+                continue
+            if end is not None and day > np.datetime64(end, 'D'):
+                continue
+            if session_values is not None and session not in session_values:
+                continue
+            total = total + histogram
+        return total
+
+    def _stats_frame(self, index: pd.Index, histograms: List[PriceHistogram]) -> pd.DataFrame:
+        """POC and value area of every histogram.
+
+        Histograms are padded to a matrix with each row starting at its own
+        first tick; rows are taken in order of width and in chunks of at most
+        ``_MAX_MATRIX_CELLS`` cells, so one wide group does not widen the rest.
+        """
+        sizes = np.array([histogram.counts.size for histogram in histograms], dtype=np.int64)
+        poc, low, high = (np.full(sizes.size, np.nan) for _ in range(3))
+        volume = np.array([histogram.total for histogram in histograms], dtype=np.float64)
+        order = np.argsort(sizes, kind='stable')
+        order = order[sizes[order] > 0]
+        start = 0
+        while start < order.size:
+            stop = start + 1
+            while stop < order.size and (stop - start + 1) * sizes[order[stop]] <= _MAX_MATRIX_CELLS:
+                stop += 1
+            chunk = order[start:stop]
+            chunk_sizes = sizes[chunk]
+            matrix = np.zeros((chunk.size, int(chunk_sizes[-1])))
+            rows = np.repeat(np.arange(chunk.size), chunk_sizes)
+            columns = np.arange(rows.size) - np.repeat(np.cumsum(chunk_sizes) - chunk_sizes, chunk_sizes)
+            matrix[rows, columns] = np.concatenate([histograms[group].counts for group in chunk])
+            firsts = np.array([histograms[group].first_tick for group in chunk], dtype=np.int64)
+            for target, bins in zip((poc, low, high), value_areas(matrix, self._value_area_share, chunk_sizes)):
+                target[chunk] = (firsts + bins) * self._tick_size
+            start = stop
+        empty = volume <= 0
+        return pd.DataFrame({
+            'poc': np.where(empty, np.nan, poc),
+            'value_area_low': np.where(empty, np.nan, low),
+            'value_area_high': np.where(empty, np.nan, high),
+            'volume': volume
+        }, index=index)
+
+    def stats(self, key: str, data: pd.DataFrame, grouping: ProfileGrouping = ProfileGrouping.TRADING_DAY) -> pd.DataFrame:
+        """POC and value area per trading day or session, from cached histograms."""
+        histograms = self.session_histograms(key, data, grouping)
+        if grouping is ProfileGrouping.SESSION:
+            index = pd.MultiIndex.from_tuples(
+                [(pd.Timestamp(day), TradingSession(session).name) for day, session in histograms],
+                names=['trading_day', 'session']
+            )
+        else:
+            index = pd.DatetimeIndex([pd.Timestamp(day) for day, _ in histograms], name='trading_day')
+        return self._stats_frame(index, list(histograms.values()))
+
+    def window_stats(self, data: pd.DataFrame, window: dt.timedelta) -> pd.DataFrame:
+        """POC and value area for arbitrary fixed-length time windows (not cached)."""
+        timestamps = extract_timestamps(data, self._parse_settings)
+        step = int(pd.Timedelta(window).value)
+        buckets, group_ids = np.unique(timestamps // step, return_inverse=True)
+        histograms = self.group_histograms(data, group_ids, buckets.size)
+        return self._stats_frame(pd.DatetimeIndex((buckets * step).view('datetime64[ns]'), name='window_start'), histograms)
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.backtesting import BacktestCosts
+from financial_dashboard.core.entities.backtesting import FillPrice
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+
+def hold_targets(signals: np.ndarray) -> np.ndarray:
+    """Target positions from signals; NaN keeps the previous target (flat before the first signal)."""
+    signals = np.asarray(signals, dtype=np.float64)
+    known = ~np.isnan(signals)
+    last = np.maximum.accumulate(np.where(known, np.arange(signals.size), -1))
+    return np.where(last >= 0, signals[np.maximum(last, 0)], 0.0)
+
+
+def simulate(
+        open_: np.ndarray,
+        close: np.ndarray,
+        signals: np.ndarray,
+        costs: BacktestCosts,
+        fill_price: FillPrice = FillPrice.NEXT_OPEN
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Positions held at each bar close, per-bar PnL net of costs and per-bar costs.
+
+    ``signals[t]`` is the target decided at the close of bar ``t`` and is
+    filled in bar ``t + 1`` at its open or close. PnL is marked to the close
+    in money terms (price points times ``point_value``).
+    """
+    open_ = np.asarray(open_, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    if not (open_.shape == close.shape == np.shape(signals)):
+        raise CustomValueError(f'open, close and signals must have equal shapes, got {open_.shape}, {close.shape}, {np.shape(signals)}')
+    targets = hold_targets(signals)
+    held = np.empty_like(targets)
+    held[:1] = 0.0
+    held[1:] = targets[:-1]
+    before = np.empty_like(held)
+    before[:1] = 0.0
+    before[1:] = held[:-1]
+    traded = np.abs(held - before)
+
+    previous_close = np.empty_like(close)
+    previous_close[:1] = open_[:1]
+    previous_close[1:] = close[:-1]
+    if fill_price is FillPrice.NEXT_OPEN:
+        fills = open_
+        points = before * (open_ - previous_close) + held * (close - open_)
+    else:
+        fills = close
+        points = before * (close - previous_close)
+    unit_cost = costs.commission + costs.point_value * (
+        costs.commission_rate * np.abs(fills) + costs.slippage_ticks * costs.tick_size
+    )
+    bar_costs = traded * unit_cost
+    pnl = np.nan_to_num(points * costs.point_value) - bar_costs
+    return held, pnl, bar_costs
+
+
+def statistics(pnl: np.ndarray, held: np.ndarray, periods_per_year: Optional[float] = None) -> Dict[str, float]:
+    """Summary statistics of a per-bar PnL series."""
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0.0)) - equity
+    before = np.concatenate(([0.0], held[:-1]))
+    std = float(pnl.std(ddof=1)) if pnl.size > 1 else 0.0
+    sharpe = float(pnl.mean() / std) if std > 0 else np.nan
+    if periods_per_year is not None:
+        sharpe *= np.sqrt(periods_per_year)
+    changes = held != before
+    return {
+        'total_pnl': float(equity[-1]) if equity.size else 0.0,
+        'mean_pnl': float(pnl.mean()) if pnl.size else 0.0,
+        'std_pnl': std,
+        'sharpe': sharpe,
+        'max_drawdown': float(drawdown.max()) if drawdown.size else 0.0,
+        'trades': int(changes.sum()),
+        'turnover': float(np.abs(held - before).sum()),
+        'exposure': float((held != 0).mean()) if held.size else 0.0
+    }
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    frame: pd.DataFrame
+    stats: Dict[str, float]
+
+
+class VectorizedBacktester:
+    """Backtests signal arrays over a bar frame without Python loops."""
+    def __init__(
+            self,
+            costs: Optional[BacktestCosts] = None,
+            fill_price: FillPrice = FillPrice.NEXT_OPEN,
+            periods_per_year: Optional[float] = None
+    ) -> None:
+        if not isinstance(fill_price, FillPrice):
+            raise TypeError(f'fill_price type error: expected {FillPrice.__name__}, got {type(fill_price)}')
+        self._costs = costs or BacktestCosts()
+        self._fill_price = fill_price
+        self._periods_per_year = periods_per_year
+
+    @property
+    def costs(self) -> BacktestCosts:
+        return self._costs
+
+    @property
+    def fill_price(self) -> FillPrice:
+        return self._fill_price
+
+    @property
+    def periods_per_year(self) -> Optional[float]:
+        return self._periods_per_year
+
+    def run_arrays(self, open_: np.ndarray, close: np.ndarray, signals: np.ndarray) -> Dict[str, float]:
+        held, pnl, _ = simulate(open_, close, signals, self._costs, self._fill_price)
+        return statistics(pnl, held, self._periods_per_year)
+
+    def run(self, bars: pd.DataFrame, signals: np.ndarray) -> BacktestResult:
+        held, pnl, bar_costs = simulate(
+            bars[ColumnNames.OPEN].to_numpy(dtype=np.float64),
+            bars[ColumnNames.CLOSE].to_numpy(dtype=np.float64),
+            signals,
+            self._costs,
+            self._fill_price
+        )
+        equity = np.cumsum(pnl)
+        frame = pd.DataFrame({
+            'position': held,
+            'costs': bar_costs,
+            'pnl': pnl,
+            'equity': equity,
+            'drawdown': np.maximum.accumulate(np.maximum(equity, 0.0)) - equity
+        }, index=bars.index)
+        return BacktestResult(frame=frame, stats=statistics(pnl, held, self._periods_per_year))
@@ -0,0 +1,26 @@
+from typing import Mapping
+
+import numpy as np
+
+from financial_dashboard.core.entities.columns import ColumnNames
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` values; NaN until the window fills."""
+    sums = np.cumsum(np.asarray(values, dtype=np.float64))
+    result = np.full(sums.size, np.nan)
+    if window <= sums.size:
+        result[window - 1] = sums[window - 1]
+        result[window:] = sums[window:] - sums[:-window]
+        result /= window
+    return result
+
+
+def moving_average_crossover(bars: Mapping[str, np.ndarray], fast: int, slow: int) -> np.ndarray:
+    """Long when the fast mean of the close is above the slow one, short when below."""
+    close = bars[ColumnNames.CLOSE]
+    fast_mean = rolling_mean(close, fast)
+    slow_mean = rolling_mean(close, slow)
+    signals = np.sign(fast_mean - slow_mean)
+    signals[np.isnan(slow_mean) | np.isnan(fast_mean)] = np.nan
+    return signals
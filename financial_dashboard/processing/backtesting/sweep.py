@@ -0,0 +1,80 @@
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.processing.backtesting.engine import VectorizedBacktester
+
+# strategy(bars, **params) -> signals; must be importable (module level) to reach the workers.
+Strategy = Callable[..., np.ndarray]
+
+_BAR_COLUMNS = (ColumnNames.OPEN, ColumnNames.HIGH, ColumnNames.LOW, ColumnNames.CLOSE, ColumnNames.VOL)
+_worker_bars: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(path: str, columns: Sequence[str]) -> None:
+    matrix = np.load(path, mmap_mode='r')
+    _worker_bars.clear()
+    _worker_bars.update({column: matrix[:, position] for position, column in enumerate(columns)})
+
+
+def _run_batch(strategy: Strategy, backtester: VectorizedBacktester, batch: List[Dict[str, Any]]) -> List[Dict[str, float]]:
+    results = []
+    for params in batch:
+        signals = strategy(_worker_bars, **params)
+        results.append(backtester.run_arrays(_worker_bars[ColumnNames.OPEN], _worker_bars[ColumnNames.CLOSE], signals))
+    return results
+
+
+class ParameterSweep:
+    """Evaluates a strategy over a parameter grid in a process pool.
+
+    The bars are written once to a Fortran-ordered ``.npy`` file and every
+    worker memory-maps it in its initializer, so the pages are shared through
+    the OS cache instead of being pickled to each task. Parameter sets are
+    sent in batches to amortise inter-process calls.
+    """
+    def __init__(
+            self,
+            strategy: Strategy,
+            backtester: Optional[VectorizedBacktester] = None,
+            max_workers: Optional[int] = None,
+            batch_size: int = 8,
+            tmp_dir: Optional[Path] = None
+    ) -> None:
+        self._strategy = strategy
+        self._backtester = backtester or VectorizedBacktester()
+        self._max_workers = max_workers
+        self._batch_size = max(batch_size, 1)
+        self._tmp_dir = tmp_dir
+
+    @staticmethod
+    def grid(parameters: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+        names = list(parameters)
+        return [dict(zip(names, values)) for values in itertools.product(*(parameters[name] for name in names))]
+
+    def run(self, bars: pd.DataFrame, parameters: Mapping[str, Sequence[Any]]) -> pd.DataFrame:
+        """One row of parameters and statistics per grid point."""
+        columns = [column for column in _BAR_COLUMNS if column in bars.columns]
+        if ColumnNames.OPEN not in columns or ColumnNames.CLOSE not in columns:
+            raise CustomValueError(f'bars must have {ColumnNames.OPEN} and {ColumnNames.CLOSE} columns')
+        grid = self.grid(parameters)
+        batches = [grid[start:start + self._batch_size] for start in range(0, len(grid), self._batch_size)]
+        with tempfile.TemporaryDirectory(dir=self._tmp_dir) as tmp:
+            path = str(Path(tmp) / 'bars.npy')
+            matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(len(bars), len(columns)), fortran_order=True)
+            for position, column in enumerate(columns):
+                matrix[:, position] = bars[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            matrix.flush()
+            del matrix
+            with ProcessPoolExecutor(max_workers=self._max_workers, initializer=_init_worker, initargs=(path, columns)) as executor:
+                futures = [executor.submit(_run_batch, self._strategy, self._backtester, batch) for batch in batches]
+                stats = [row for future in futures for row in future.result()]
+        return pd.concat([pd.DataFrame(grid), pd.DataFrame(stats)], axis=1)
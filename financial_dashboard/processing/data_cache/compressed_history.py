@@ -0,0 +1,283 @@
+import datetime as dt
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.errors import UnsortedDataError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.processing.data_cache.compression import DeltaOfDeltaBlock
+from financial_dashboard.processing.data_cache.compression import FrameOfReferenceBlock
+from financial_dashboard.processing.data_cache.compression import encode_codes
+from financial_dashboard.processing.data_cache.compression import encode_floats
+from financial_dashboard.processing.data_cache.compression import unpack_mask
+
+from financial_dashboard.utils.timestamps import check_sorted
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+_FLOAT = 'float'
+_INT = 'int'
+_NULLABLE_INT = 'nullable_int'
+_DATETIME = 'datetime'
+_BOOL = 'bool'
+_CATEGORY = 'category'
+_STRING = 'string'
+
+
+def _column_kind(series: pd.Series) -> str:
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return _CATEGORY
+    if pd.api.types.is_bool_dtype(dtype):
+        return _BOOL
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return _DATETIME
+    if pd.api.types.is_float_dtype(dtype):
+        return _FLOAT
+    if pd.api.types.is_integer_dtype(dtype):
+        return _NULLABLE_INT if isinstance(dtype, pd.api.extensions.ExtensionDtype) else _INT
+    return _STRING
+
+
+@dataclass
+class _Column:
+    kind: str
+    dtype: Any
+    # Dictionary of category and string columns; code 0 is reserved for null.
+    values: List[Any] = field(default_factory=list)
+    codes: Dict[Any, int] = field(default_factory=dict)
+
+    def encode_values(self, series: pd.Series) -> np.ndarray:
+        inverse, uniques = pd.factorize(series, use_na_sentinel=True)
+        mapping = np.empty(len(uniques) + 1, dtype=np.int64)
+        mapping[-1] = 0
+        for position, value in enumerate(uniques):
+            code = self.codes.get(value)
+            if code is None:
+                self.values.append(value)
+                code = self.codes[value] = len(self.values)
+            mapping[position] = code
+        return mapping[inverse]
+
+    def decode_values(self, codes: np.ndarray) -> Any:
+        if self.kind == _CATEGORY:
+            return pd.Categorical.from_codes(codes - 1, categories=pd.Index(self.values), ordered=self.dtype.ordered, validate=False)
+        lookup = np.array([None] + self.values, dtype=object)
+        return pd.array(lookup[codes], dtype=self.dtype)
+
+
+@dataclass
+class _Series:
+    columns: Dict[str, _Column]
+    blocks: List[Dict[str, Any]] = field(default_factory=list)
+    first: List[int] = field(default_factory=list)
+    last: List[int] = field(default_factory=list)
+    ranges: List[Dict[str, Tuple[float, float]]] = field(default_factory=list)
+    tail: List[pd.DataFrame] = field(default_factory=list)
+    tail_rows: int = 0
+    last_timestamp: Optional[int] = None
+
+
+class CompressedHistoryStore:
+    """In-memory columnar history compressed in blocks of ``block_rows`` rows.
+
+    Per block, timestamps are stored as delta-of-deltas, decimal floats
+    (prices) as integer ticks with packed deltas and other floats XOR-encoded,
+    integers frame-of-reference packed and category/string columns (ticker,
+    board) as dictionary codes, run-length encoded where runs are long. Every
+    block keeps its time range and per-column min/max, so ``query`` only
+    decompresses the blocks it touches. Rows appended since the last full
+    block stay uncompressed until the block fills up. All codecs are lossless.
+    """
+    def __init__(self, block_rows: int = 4096, parse_settings: Optional[IParseSettings] = None) -> None:
+        if block_rows < 2:
+            raise CustomValueError(f'block_rows must be at least 2, got {block_rows}')
+        self._block_rows = block_rows
+        self._parse_settings = parse_settings
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def keys(self) -> List[str]:
+        with self._lock:
+            return sorted(self._series)
+
+    def drop(self, key: str) -> None:
+        with self._lock:
+            self._series.pop(key, None)
+
+    def append(self, key: str, data: pd.DataFrame) -> None:
+        """Adds rows in time order; they may not start before the stored history ends."""
+        timestamps = extract_timestamps(data, self._parse_settings)
+        check_sorted(timestamps, name='appended rows')
+        if not len(data):
+            return
+        values = data.drop(columns=[ColumnNames.TIMESTAMP], errors='ignore').reset_index(drop=True)
+        frame = pd.concat([pd.DataFrame({ColumnNames.TIMESTAMP: timestamps}), values], axis=1)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(columns={
+                    name: _Column(kind=_column_kind(values[name]), dtype=values[name].dtype) for name in values.columns
+                })
+            if list(values.columns) != list(series.columns):
+                raise CustomValueError(f'columns of {key} must stay {list(series.columns)}, got {list(values.columns)}')
+            if series.last_timestamp is not None and timestamps[0] < series.last_timestamp:
+                raise UnsortedDataError(f'rows appended to {key} start before its stored history ends')
+            series.last_timestamp = int(timestamps[-1])
+            series.tail.append(frame)
+            series.tail_rows += len(frame)
+            if series.tail_rows >= self._block_rows:
+                self._seal(series)
+
+    def _seal(self, series: _Series) -> None:
+        """Compresses every full block of the tail."""
+        tail = pd.concat(series.tail, ignore_index=True)
+        full = len(tail) // self._block_rows * self._block_rows
+        for start in range(0, full, self._block_rows):
+            self._compress(series, tail.iloc[start:start + self._block_rows])
+        rest = tail.iloc[full:].reset_index(drop=True)
+        series.tail = [rest] if len(rest) else []
+        series.tail_rows = len(rest)
+
+    def _compress(self, series: _Series, rows: pd.DataFrame) -> None:
+        timestamps = rows[ColumnNames.TIMESTAMP].to_numpy(dtype=np.int64)
+        block = {ColumnNames.TIMESTAMP: DeltaOfDeltaBlock.encode(timestamps)}
+        ranges = {}
+        for name, column in series.columns.items():
+            values = rows[name]
+            if column.kind in (_CATEGORY, _STRING):
+                block[name] = encode_codes(column.encode_values(values))
+                continue
+            if column.kind == _FLOAT:
+                array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                block[name] = encode_floats(array)
+            else:
+                mask = values.isna().to_numpy()
+                if column.kind == _DATETIME:
+                    array = values.to_numpy().astype('datetime64[ns]').view(np.int64).copy()
+                else:
+                    array = values.to_numpy(dtype=np.int64, na_value=0).copy()
+                array[mask] = array[~mask].min() if (~mask).any() else 0
+                block[name] = (DeltaOfDeltaBlock if column.kind == _DATETIME else FrameOfReferenceBlock).encode(array, mask)
+                array = np.where(mask, np.nan, array.astype(np.float64))
+            ranges[name] = (float(np.nanmin(array)), float(np.nanmax(array))) if not np.isnan(array).all() else (np.nan, np.nan)
+        series.blocks.append(block)
+        series.first.append(int(timestamps[0]))
+        series.last.append(int(timestamps[-1]))
+        series.ranges.append(ranges)
+
+    def _decompress(self, series: _Series, block: Dict[str, Any]) -> pd.DataFrame:
+        data = {ColumnNames.TIMESTAMP: block[ColumnNames.TIMESTAMP].decode()}
+        for name, column in series.columns.items():
+            encoded = block[name]
+            if column.kind in (_CATEGORY, _STRING):
+                data[name] = column.decode_values(encoded.decode())
+                continue
+            values = encoded.decode()
+            if column.kind == _FLOAT:
+                # Masked dtypes (Float64) take NaN back as NA.
+                data[name] = pd.array(values, dtype=column.dtype) if isinstance(column.dtype, pd.api.extensions.ExtensionDtype) else values.astype(column.dtype, copy=False)
+                continue
+            mask = unpack_mask(encoded.nulls, encoded.count)
+            if column.kind == _DATETIME:
+                values = values.view('datetime64[ns]')
+                if mask is not None:
+                    values[mask] = np.datetime64('NaT')
+                data[name] = values
+            elif column.kind == _NULLABLE_INT:
+                data[name] = pd.arrays.IntegerArray(values, mask if mask is not None else np.zeros(values.size, dtype=bool)).astype(column.dtype)
+            elif column.kind == _BOOL:
+                data[name] = values.astype(bool)
+            else:
+                data[name] = values.astype(column.dtype)
+        return pd.DataFrame(data)
+
+    def _touched(self, series: _Series, start: int, end: int) -> range:
+        first = np.searchsorted(np.asarray(series.last, dtype=np.int64), start, side='left')
+        last = np.searchsorted(np.asarray(series.first, dtype=np.int64), end, side='left')
+        return range(int(first), int(last))
+
+    def query(
+            self,
+            key: str,
+            start: Optional[dt.datetime] = None,
+            end: Optional[dt.datetime] = None,
+            columns: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Rows of ``key`` with timestamps in ``[start, end)`` as an ordinary frame."""
+        first = pd.Timestamp(start).as_unit('ns').value if start is not None else np.iinfo(np.int64).min
+        last = pd.Timestamp(end).as_unit('ns').value if end is not None else np.iinfo(np.int64).max
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                raise KeyError(f'unknown series {key}')
+            frames = [self._decompress(series, series.blocks[number]) for number in self._touched(series, first, last)]
+            frames.extend(series.tail)
+            if not frames:
+                frames = [self._decompress(series, self._empty_block(series))]
+        data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        for name, column in series.columns.items():
+            if column.kind == _CATEGORY:
+                data[name] = data[name].astype(pd.CategoricalDtype(column.values, ordered=column.dtype.ordered))
+        timestamps = data[ColumnNames.TIMESTAMP].to_numpy(dtype=np.int64)
+        data = data[(timestamps >= first) & (timestamps < last)].reset_index(drop=True)
+        data[ColumnNames.TIMESTAMP] = data[ColumnNames.TIMESTAMP].to_numpy(dtype=np.int64).view('datetime64[ns]')
+        if columns is not None:
+            data = data[[ColumnNames.TIMESTAMP, *columns]]
+        return data
+
+    def _empty_block(self, series: _Series) -> Dict[str, Any]:
+        empty = {ColumnNames.TIMESTAMP: DeltaOfDeltaBlock.encode(np.empty(0, dtype=np.int64))}
+        for name, column in series.columns.items():
+            if column.kind in (_CATEGORY, _STRING):
+                empty[name] = encode_codes(np.empty(0, dtype=np.int64))
+            elif column.kind == _FLOAT:
+                empty[name] = encode_floats(np.empty(0, dtype=np.float64))
+            else:
+                empty[name] = FrameOfReferenceBlock.encode(np.empty(0, dtype=np.int64))
+        return empty
+
+    def block_ranges(self, key: str, column: str) -> pd.DataFrame:
+        """``first, last`` time and ``min, max`` of ``column`` for every compressed block."""
+        with self._lock:
+            series = self._series[key]
+            bounds = [ranges.get(column, (np.nan, np.nan)) for ranges in series.ranges]
+            return pd.DataFrame({
+                'first': np.asarray(series.first, dtype=np.int64).view('datetime64[ns]'),
+                'last': np.asarray(series.last, dtype=np.int64).view('datetime64[ns]'),
+                'min': [low for low, _ in bounds],
+                'max': [high for _, high in bounds]
+            })
+
+    def stats(self, key: str) -> pd.DataFrame:
+        """Compressed bytes per column against the bytes of the same rows as plain 8-byte columns."""
+        with self._lock:
+            series = self._series[key]
+            rows = sum(block[ColumnNames.TIMESTAMP].count for block in series.blocks)
+            names = [ColumnNames.TIMESTAMP, *series.columns]
+            compressed = {name: sum(block[name].nbytes for block in series.blocks) for name in names}
+            dictionaries = {name: sum(len(str(value)) + 8 for value in column.values) for name, column in series.columns.items()}
+        data = pd.DataFrame({
+            'compressed': [compressed[name] + dictionaries.get(name, 0) for name in names],
+            'raw': [rows * 8] * len(names)
+        }, index=pd.Index(names, name='column'))
+        data['ratio'] = data['raw'] / data['compressed'].clip(lower=1)
+        return data
+
+    def nbytes(self, key: Optional[str] = None) -> int:
+        """Memory held by compressed blocks and uncompressed tails."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._series)
+            total = 0
+            for name in keys:
+                series = self._series[name]
+                total += sum(encoded.nbytes for block in series.blocks for encoded in block.values())
+                total += sum(int(frame.memory_usage(deep=True).sum()) for frame in series.tail)
+            return total
@@ -0,0 +1,267 @@
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+
+_SHIFTS = (32, 16, 8, 4, 2, 1)
+# Share of values allowed to exceed the packed width; they are stored as exceptions.
+EXCEPTION_SHARE = 0.02
+
+
+def bit_lengths(values: np.ndarray) -> np.ndarray:
+    """Number of significant bits of every uint64 value (0 for zero)."""
+    remaining = np.asarray(values, dtype=np.uint64).copy()
+    lengths = np.zeros(remaining.shape, dtype=np.uint8)
+    for shift in _SHIFTS:
+        wide = remaining >= np.uint64(1 << shift)
+        lengths[wide] += shift
+        remaining[wide] >>= np.uint64(shift)
+    lengths += (remaining > 0).astype(np.uint8)
+    return lengths
+
+
+def zigzag(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def unzigzag(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.uint64)
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64)
+
+
+def pack_mask(mask: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Bit-packed null mask, or None when nothing is null."""
+    if mask is None or not mask.any():
+        return None
+    return np.packbits(mask, bitorder='little')
+
+
+def unpack_mask(packed: Optional[np.ndarray], count: int) -> Optional[np.ndarray]:
+    if packed is None:
+        return None
+    return np.unpackbits(packed, count=count, bitorder='little').astype(bool)
+
+
+def _nbytes(*arrays: Optional[np.ndarray]) -> int:
+    return sum(array.nbytes for array in arrays if array is not None)
+
+
+@dataclass(frozen=True)
+class PackedInts:
+    """Unsigned integers bit-packed at a fixed width with patched exceptions (PFOR).
+
+    The width covers all but about ``EXCEPTION_SHARE`` of the values; wider
+    values keep a zero slot and are stored verbatim with their positions.
+    """
+    count: int
+    width: int
+    data: np.ndarray
+    exception_positions: np.ndarray
+    exception_values: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return _nbytes(self.data, self.exception_positions, self.exception_values) + 16
+
+    @classmethod
+    def pack(cls, values: np.ndarray) -> 'PackedInts':
+        values = np.asarray(values, dtype=np.uint64)
+        count = values.size
+        lengths = bit_lengths(values)
+        width = 0
+        if count:
+            width = int(np.sort(lengths)[min(int(count * (1.0 - EXCEPTION_SHARE)), count - 1)])
+        wide = lengths > width
+        positions = np.flatnonzero(wide).astype(np.uint32)
+        exceptions = values[wide]
+        slots = np.where(wide, np.uint64(0), values)
+        if width:
+            bits = ((slots[:, None] >> np.arange(width, dtype=np.uint64)) & np.uint64(1)).astype(np.uint8)
+            data = np.packbits(bits.ravel(), bitorder='little')
+        else:
+            data = np.empty(0, dtype=np.uint8)
+        return cls(count=count, width=width, data=data, exception_positions=positions, exception_values=exceptions)
+
+    def unpack(self) -> np.ndarray:
+        if self.width:
+            bits = np.unpackbits(self.data, count=self.count * self.width, bitorder='little').reshape(self.count, self.width)
+            values = (bits.astype(np.uint64) << np.arange(self.width, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+        else:
+            values = np.zeros(self.count, dtype=np.uint64)
+        values[self.exception_positions] = self.exception_values
+        return values
+
+
+@dataclass(frozen=True)
+class DeltaOfDeltaBlock:
+    """int64 values (timestamps) as first value, first delta and packed zigzag delta-of-deltas."""
+    count: int
+    first: int
+    first_delta: int
+    packed: PackedInts
+    nulls: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.packed.nbytes + _nbytes(self.nulls) + 24
+
+    @classmethod
+    def encode(cls, values: np.ndarray, mask: Optional[np.ndarray] = None) -> 'DeltaOfDeltaBlock':
+        values = np.asarray(values, dtype=np.int64)
+        deltas = np.diff(values)
+        return cls(
+            count=values.size,
+            first=int(values[0]) if values.size else 0,
+            first_delta=int(deltas[0]) if deltas.size else 0,
+            packed=PackedInts.pack(zigzag(np.diff(deltas))),
+            nulls=pack_mask(mask)
+        )
+
+    def decode(self) -> np.ndarray:
+        if not self.count:
+            return np.empty(0, dtype=np.int64)
+        deltas = np.empty(self.count - 1, dtype=np.int64)
+        if deltas.size:
+            deltas[0] = self.first_delta
+            deltas[1:] = self.first_delta + np.cumsum(unzigzag(self.packed.unpack()))
+        return np.concatenate(([self.first], self.first + np.cumsum(deltas))).astype(np.int64)
+
+
+@dataclass(frozen=True)
+class FrameOfReferenceBlock:
+    """int64 values as offsets from the block minimum, bit-packed."""
+    count: int
+    base: int
+    packed: PackedInts
+    nulls: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.packed.nbytes + _nbytes(self.nulls) + 16
+
+    @classmethod
+    def encode(cls, values: np.ndarray, mask: Optional[np.ndarray] = None) -> 'FrameOfReferenceBlock':
+        values = np.asarray(values, dtype=np.int64)
+        base = int(values.min()) if values.size else 0
+        offsets = values.view(np.uint64) - np.uint64(base & 0xFFFFFFFFFFFFFFFF)
+        return cls(count=values.size, base=base, packed=PackedInts.pack(offsets), nulls=pack_mask(mask))
+
+    def decode(self) -> np.ndarray:
+        return (self.packed.unpack() + np.uint64(self.base & 0xFFFFFFFFFFFFFFFF)).view(np.int64)
+
+
+@dataclass(frozen=True)
+class ScaledDeltaBlock:
+    """Decimal floats as integer ticks (``value * scale``), delta and zigzag encoded, bit-packed."""
+    count: int
+    scale: int
+    first: int
+    packed: PackedInts
+    nulls: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.packed.nbytes + _nbytes(self.nulls) + 24
+
+    def decode(self) -> np.ndarray:
+        if not self.count:
+            return np.empty(0, dtype=np.float64)
+        ticks = self.first + np.concatenate(([0], np.cumsum(unzigzag(self.packed.unpack()))))
+        values = ticks / self.scale
+        mask = unpack_mask(self.nulls, self.count)
+        if mask is not None:
+            values[mask] = np.nan
+        return values
+
+
+@dataclass(frozen=True)
+class XorBlock:
+    """Gorilla-style floats: each value XOR-ed with its predecessor.
+
+    Instead of per-value leading/trailing zero counts the block shares one
+    trailing-zero shift, and the remaining significant bits are bit-packed.
+    Lossless for every float64, NaN included.
+    """
+    count: int
+    shift: int
+    packed: PackedInts
+
+    @property
+    def nbytes(self) -> int:
+        return self.packed.nbytes + 16
+
+    @classmethod
+    def encode(cls, values: np.ndarray) -> 'XorBlock':
+        bits = np.asarray(values, dtype=np.float64).view(np.uint64)
+        previous = np.concatenate((np.zeros(1, dtype=np.uint64), bits[:-1]))
+        xored = bits ^ previous
+        nonzero = xored[xored != 0]
+        shift = 0
+        if nonzero.size:
+            lowest = nonzero & (~nonzero + np.uint64(1))
+            shift = int(bit_lengths(lowest).min()) - 1
+        return cls(count=bits.size, shift=shift, packed=PackedInts.pack(xored >> np.uint64(shift)))
+
+    def decode(self) -> np.ndarray:
+        xored = self.packed.unpack() << np.uint64(self.shift)
+        return np.bitwise_xor.accumulate(xored).view(np.float64) if self.count else np.empty(0, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class RunLengthBlock:
+    """Dictionary codes as runs: code of every run and its length, both bit-packed."""
+    count: int
+    codes: PackedInts
+    lengths: PackedInts
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.lengths.nbytes + 8
+
+    @classmethod
+    def encode(cls, codes: np.ndarray) -> 'RunLengthBlock':
+        codes = np.asarray(codes, dtype=np.int64)
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1]))) if codes.size else np.empty(0, dtype=np.int64)
+        lengths = np.diff(np.append(starts, codes.size))
+        return cls(count=codes.size, codes=PackedInts.pack(codes[starts]), lengths=PackedInts.pack(lengths))
+
+    def decode(self) -> np.ndarray:
+        return np.repeat(self.codes.unpack().astype(np.int64), self.lengths.unpack().astype(np.int64))
+
+
+FloatBlock = Union[ScaledDeltaBlock, XorBlock]
+
+
+def encode_floats(values: np.ndarray, max_decimals: int = 6) -> FloatBlock:
+    """Integer ticks when every non-NaN value has at most ``max_decimals`` decimals, XOR otherwise."""
+    values = np.asarray(values, dtype=np.float64)
+    nulls = np.isnan(values)
+    finite = values[~nulls]
+    if values.size and finite.size and np.isfinite(finite).all():
+        for decimals in range(max_decimals + 1):
+            scale = 10 ** decimals
+            ticks = np.rint(finite * scale)
+            if np.abs(ticks).max() < 2 ** 53 and np.array_equal(ticks / scale, finite):
+                # Nulls repeat the previous tick so they cost a zero delta.
+                known = np.zeros(values.size, dtype=np.int64)
+                known[~nulls] = ticks.astype(np.int64)
+                positions = np.maximum.accumulate(np.where(~nulls, np.arange(values.size), -1))
+                filled = known[np.where(positions < 0, np.argmax(~nulls), positions)]
+                return ScaledDeltaBlock(
+                    count=values.size,
+                    scale=scale,
+                    first=int(filled[0]),
+                    packed=PackedInts.pack(zigzag(np.diff(filled))),
+                    nulls=pack_mask(nulls)
+                )
+    return XorBlock.encode(values)
+
+
+def encode_codes(codes: np.ndarray) -> Union[RunLengthBlock, FrameOfReferenceBlock]:
+    """Run-length encoding when runs are long enough to pay off, packed codes otherwise."""
+    codes = np.asarray(codes, dtype=np.int64)
+    runs = 1 + int(np.count_nonzero(codes[1:] != codes[:-1])) if codes.size else 0
+    if runs * 2 <= codes.size:
+        return RunLengthBlock.encode(codes)
+    return FrameOfReferenceBlock.encode(codes)
@@ -0,0 +1,257 @@
+import datetime as dt
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.sessions import TradingSession
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.processing.sessions.calendar import MoexSessionCalendar
+from financial_dashboard.processing.sessions.calendar import SessionTable
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+_MINUTES_PER_DAY = 24 * 60
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_DAY = _MINUTES_PER_DAY * _NS_PER_MINUTE
+_EPOCH = dt.date(1970, 1, 1)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+_TRADING_SESSIONS = (TradingSession.MORNING, TradingSession.MAIN, TradingSession.EVENING)
+
+
+def _slot_count(timeframe: int) -> int:
+    if timeframe < 1 or _MINUTES_PER_DAY % timeframe:
+        raise CustomValueError(f'timeframe must divide a day into whole bars, got {timeframe} minutes')
+    return _MINUTES_PER_DAY // timeframe
+
+
+def _evening_offsets(table: SessionTable, timeframe: int) -> np.ndarray:
+    """Minute of the first evening minute inside each slot, -1 for slots without one.
+
+    A slot belongs to the evening if any of its minutes does: a 60-minute
+    19:00 slot starts in clearing but holds the start of the evening session.
+    """
+    evening = (table.minute_sessions == TradingSession.EVENING.value).any(axis=0).reshape(-1, timeframe)
+    return np.where(evening.any(axis=1), evening.argmax(axis=1), -1)
+
+
+@dataclass(frozen=True)
+class CoverageBitmap:
+    """Present bars of one contract and timeframe, one bit row per trading day.
+
+    Bit ``s`` of a row is the bar starting at minute ``s * timeframe`` of the
+    day; evening bars use their clock time, which never collides with the
+    morning and main sessions of the same trading day.
+    """
+    timeframe: int
+    days: np.ndarray
+    bits: np.ndarray
+
+    @classmethod
+    def empty(cls, timeframe: int) -> 'CoverageBitmap':
+        return cls(timeframe, np.empty(0, dtype='datetime64[D]'), np.empty((0, -(-_slot_count(timeframe) // 8)), dtype=np.uint8))
+
+    @classmethod
+    def from_timestamps(cls, timestamps: np.ndarray, timeframe: int, calendar: MoexSessionCalendar) -> 'CoverageBitmap':
+        n_slots = _slot_count(timeframe)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        slots = timestamps % _NS_PER_DAY // (timeframe * _NS_PER_MINUTE)
+        if timestamps.size:
+            table = calendar.session_table(
+                _EPOCH + dt.timedelta(days=int(timestamps.min() // _NS_PER_DAY)),
+                _EPOCH + dt.timedelta(days=int(timestamps.max() // _NS_PER_DAY))
+            )
+            # Evening bars are keyed by their evening minute, as in ``CoverageIndex.expected``.
+            timestamps = timestamps + np.maximum(_evening_offsets(table, timeframe)[slots], 0) * _NS_PER_MINUTE
+        days = calendar.classify(timestamps).trading_days
+        unique_days, rows = np.unique(days, return_inverse=True)
+        present = np.zeros((unique_days.size, n_slots), dtype=bool)
+        present[rows, slots] = True
+        return cls(timeframe, unique_days, np.packbits(present, axis=1, bitorder='little'))
+
+    def unpack(self) -> np.ndarray:
+        return np.unpackbits(self.bits, axis=1, count=_slot_count(self.timeframe), bitorder='little').astype(bool)
+
+    def align(self, days: np.ndarray) -> np.ndarray:
+        """Bit rows for ``days``; days without data are all zeros."""
+        aligned = np.zeros((days.size, self.bits.shape[1]), dtype=np.uint8)
+        if self.days.size:
+            position = np.minimum(np.searchsorted(self.days, days), self.days.size - 1)
+            found = self.days[position] == days
+            aligned[found] = self.bits[position[found]]
+        return aligned
+
+    def __or__(self, other: 'CoverageBitmap') -> 'CoverageBitmap':
+        if other.timeframe != self.timeframe:
+            raise CustomValueError(f'timeframes differ: {self.timeframe} and {other.timeframe}')
+        days = np.union1d(self.days, other.days)
+        return CoverageBitmap(self.timeframe, days, self.align(days) | other.align(days))
+
+    def __and__(self, other: 'CoverageBitmap') -> 'CoverageBitmap':
+        if other.timeframe != self.timeframe:
+            raise CustomValueError(f'timeframes differ: {self.timeframe} and {other.timeframe}')
+        days = np.intersect1d(self.days, other.days)
+        return CoverageBitmap(self.timeframe, days, self.align(days) & other.align(days))
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed bitmap."""
+    return _POPCOUNT[bits].sum(axis=-1)
+
+
+class CoverageIndex:
+    """Bar-coverage bitmaps of all contracts, stored next to the catalog.
+
+    Every contract has one ``.npz`` file with a packed bitmap per timeframe.
+    Coverage, gap and overlap queries compare the bitmaps with the expected
+    bars of the session calendar using bitwise operations and popcounts, so
+    the bar data is never read.
+    """
+    def __init__(self, root_path: Path, calendar: Optional[MoexSessionCalendar] = None) -> None:
+        self._root_path = Path(root_path)
+        self._calendar = calendar or MoexSessionCalendar()
+        self._lock = threading.Lock()
+        # Cache:
+        self._bitmaps_cache: Dict[str, Dict[int, CoverageBitmap]] = {}
+
+    def clear_cache(self) -> None:
+        self._bitmaps_cache = {}
+
+    def _path(self, key: str) -> Path:
+        return self._root_path / f'{key}.npz'
+
+    def _load(self, key: str) -> Dict[int, CoverageBitmap]:
+        if key not in self._bitmaps_cache:
+            bitmaps = {}
+            if self._path(key).exists():
+                with np.load(self._path(key)) as stored:
+                    for name in stored.files:
+                        if name.startswith('days_'):
+                            timeframe = int(name[len('days_'):])
+                            bitmaps[timeframe] = CoverageBitmap(
+                                timeframe, stored[name].astype('datetime64[D]'), stored[f'bits_{timeframe}']
+                            )
+            self._bitmaps_cache[key] = bitmaps
+        return self._bitmaps_cache[key]
+
+    def _save(self, key: str, bitmaps: Dict[int, CoverageBitmap]) -> None:
+        self._root_path.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for timeframe, bitmap in bitmaps.items():
+            arrays[f'days_{timeframe}'] = bitmap.days.astype(np.int64)
+            arrays[f'bits_{timeframe}'] = bitmap.bits
+        tmp = self._root_path / f'{key}.{uuid.uuid4().hex}.tmp.npz'
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self._path(key))
+
+    @property
+    def keys(self) -> List[str]:
+        return sorted(path.stem for path in self._root_path.glob('*.npz') if '.tmp' not in path.name)
+
+    def update(self, key: str, timestamps: np.ndarray, timeframe: int, replace: bool = False) -> CoverageBitmap:
+        """Adds bars (int64 ns start times) of ``key``; ``replace`` drops previously indexed bars."""
+        bitmap = CoverageBitmap.from_timestamps(timestamps, timeframe, self._calendar)
+        with self._lock:
+            bitmaps = dict(self._load(key))
+            if not replace and timeframe in bitmaps:
+                bitmap = bitmaps[timeframe] | bitmap
+            bitmaps[timeframe] = bitmap
+            self._save(key, bitmaps)
+            self._bitmaps_cache[key] = bitmaps
+        return bitmap
+
+    def update_frame(self, key: str, data: pd.DataFrame, timeframe: int, parse_settings: Optional[IParseSettings] = None, replace: bool = False) -> CoverageBitmap:
+        return self.update(key, extract_timestamps(data, parse_settings), timeframe, replace=replace)
+
+    def bitmap(self, key: str, timeframe: int) -> CoverageBitmap:
+        return self._load(key).get(timeframe) or CoverageBitmap.empty(timeframe)
+
+    def expected(self, timeframe: int, start: dt.date, end: dt.date, sessions: Sequence[TradingSession] = _TRADING_SESSIONS) -> CoverageBitmap:
+        """Bars the calendar expects for trading days in ``[start, end]``; clearing is never expected."""
+        n_slots = _slot_count(timeframe)
+        # Evening sessions of earlier calendar days belong to trading days in the range.
+        table = self._calendar.session_table(start - dt.timedelta(days=14), end)
+        wanted = np.isin(table.minute_sessions, [session.value for session in sessions if session is not TradingSession.CLEARING])
+        rows, minutes = np.nonzero(wanted)
+        evening = table.minute_sessions[rows, minutes] == TradingSession.EVENING.value
+        days = np.where(evening, table.next_trading_day[rows], table.first_day + rows)
+        first, last = (start - _EPOCH).days, (end - _EPOCH).days
+        inside = (days >= first) & (days <= last)
+        unique_days, day_rows = np.unique(days[inside], return_inverse=True)
+        present = np.zeros((unique_days.size, n_slots), dtype=bool)
+        present[day_rows, minutes[inside] // timeframe] = True
+        return CoverageBitmap(timeframe, unique_days.astype('datetime64[D]'), np.packbits(present, axis=1, bitorder='little'))
+
+    def coverage(self, key: str, timeframe: int, start: dt.date, end: dt.date, sessions: Sequence[TradingSession] = _TRADING_SESSIONS) -> pd.DataFrame:
+        """Present and expected bars per trading day."""
+        expected = self.expected(timeframe, start, end, sessions)
+        present = self.bitmap(key, timeframe).align(expected.days) & expected.bits
+        expected_bars = popcount(expected.bits)
+        present_bars = popcount(present)
+        return pd.DataFrame({
+            'trading_day': expected.days,
+            'present': present_bars,
+            'expected': expected_bars,
+            'ratio': present_bars / np.maximum(expected_bars, 1)
+        })
+
+    def gaps(self, key: str, timeframe: int, start: dt.date, end: dt.date, sessions: Sequence[TradingSession] = _TRADING_SESSIONS) -> pd.DataFrame:
+        """Runs of consecutive missing expected bars with their clock start and end."""
+        expected = self.expected(timeframe, start, end, sessions)
+        missing = np.unpackbits(
+            expected.bits & ~self.bitmap(key, timeframe).align(expected.days),
+            axis=1, count=_slot_count(timeframe), bitorder='little'
+        ).astype(np.int8)
+        padded = np.pad(missing, ((0, 0), (1, 1)))
+        edges = np.diff(padded, axis=1)
+        start_rows, start_slots = np.nonzero(edges == 1)
+        _, end_slots = np.nonzero(edges == -1)
+        run_starts = self._slot_timestamps(expected.days[start_rows], start_slots, timeframe)
+        run_ends = self._slot_timestamps(expected.days[start_rows], end_slots - 1, timeframe) + timeframe * _NS_PER_MINUTE
+        return pd.DataFrame({
+            'trading_day': expected.days[start_rows],
+            'start': run_starts.astype('datetime64[ns]'),
+            'end': run_ends.astype('datetime64[ns]'),
+            'missing_bars': end_slots - start_slots
+        })
+
+    def _slot_timestamps(self, days: np.ndarray, slots: np.ndarray, timeframe: int) -> np.ndarray:
+        """Clock times of slots; evening slots are moved to the previous trading day."""
+        if not days.size:
+            return np.empty(0, dtype=np.int64)
+        day_numbers = days.astype(np.int64)
+        minutes = slots * timeframe
+        start = _EPOCH + dt.timedelta(days=int(day_numbers.min()) - 14)
+        table = self._calendar.session_table(start, _EPOCH + dt.timedelta(days=int(day_numbers.max())))
+        is_trading = (table.minute_sessions != TradingSession.CLOSED.value).any(axis=1)
+        trading_days = table.first_day + np.flatnonzero(is_trading)
+        evening = _evening_offsets(table, timeframe)[slots] >= 0
+        previous = trading_days[np.maximum(np.searchsorted(trading_days, day_numbers) - 1, 0)]
+        calendar_days = np.where(evening, previous, day_numbers)
+        return calendar_days * _NS_PER_DAY + minutes * _NS_PER_MINUTE
+
+    def complete(self, keys: Sequence[str], timeframe: int, start: dt.date, end: dt.date, sessions: Sequence[TradingSession] = _TRADING_SESSIONS) -> List[str]:
+        """Keys with every expected bar present in the range."""
+        expected = self.expected(timeframe, start, end, sessions)
+        return [
+            key for key in keys
+            if not np.any(expected.bits & ~self.bitmap(key, timeframe).align(expected.days))
+        ]
+
+    def overlap(self, first: str, second: str, timeframe: int, start: Optional[dt.date] = None, end: Optional[dt.date] = None) -> pd.DataFrame:
+        """Bars present in both contracts per trading day."""
+        both = self.bitmap(first, timeframe) & self.bitmap(second, timeframe)
+        keep = np.ones(both.days.size, dtype=bool)
+        if start is not None:
+            keep &= both.days >= np.datetime64(start, 'D')
+        if end is not None:
+            keep &= both.days <= np.datetime64(end, 'D')
+        return pd.DataFrame({'trading_day': both.days[keep], 'bars': popcount(both.bits[keep])})
@@ -0,0 +1,244 @@
+import datetime as dt
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pydantic import TypeAdapter
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.contracts import DeliveryMonth
+from financial_dashboard.core.entities.data_cache import SourceDependency
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.infrastructure.readers.pandas.csv_reader import CsvReader
+
+_FILE_NAME = re.compile(rf'^(?P<key>[A-Za-z]+?)(?P<month>[{"".join(month.value for month in DeliveryMonth)}])(?P<year>\d{{2}})$')
+_MANIFEST = 'manifest.json'
+_TABLE = 'daily.parquet'
+_AGGREGATIONS = ('sum', 'count', 'mean', 'min', 'max')
+_DIMENSIONS = (ColumnNames.DATE, ColumnNames.FUTURESKEY, ColumnNames.DELIVERYMONTH, ColumnNames.TICKER, ColumnNames.BOARDID)
+_manifest_adapter = TypeAdapter(Dict[str, SourceDependency])
+
+
+class DailyAnalyticsStore:
+    """Consolidated columnar table of all DAILY files.
+
+    Every CSV is parsed once into a Parquet part; ``refresh`` re-parses only
+    files whose size or mtime changed and rebuilds the consolidated table from
+    the parts. The table is kept sorted by date with integer codes for the
+    dimensions, so cross-sectional group-bys are a date-range slice plus
+    ``bincount``/``reduceat`` kernels over combined integer group codes.
+    """
+    def __init__(self, daily_dir: Path, store_path: Path, parse_settings: IParseSettings) -> None:
+        self._daily_dir = Path(daily_dir)
+        self._store_path = Path(store_path)
+        self._parse_settings = parse_settings
+        # Cache:
+        self._table_cache: Optional[pd.DataFrame] = None
+        self._codes_cache: Optional[Dict[str, np.ndarray]] = None
+        self._days_cache: Optional[np.ndarray] = None
+
+    def clear_cache(self) -> None:
+        self._table_cache = None
+        self._codes_cache = None
+        self._days_cache = None
+
+    @property
+    def _parts_dir(self) -> Path:
+        return self._store_path / 'parts'
+
+    def _load_manifest(self) -> Dict[str, SourceDependency]:
+        try:
+            return _manifest_adapter.validate_json((self._store_path / _MANIFEST).read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, SourceDependency]) -> None:
+        tmp = self._store_path / f'{_MANIFEST}.{uuid.uuid4().hex}.tmp'
+        tmp.write_bytes(_manifest_adapter.dump_json(manifest))
+        os.replace(tmp, self._store_path / _MANIFEST)
+
+    def _part_path(self, relative: str) -> Path:
+        return self._parts_dir / Path(relative).with_suffix('.parquet')
+
+    def _read_source(self, file_path: Path) -> pd.DataFrame:
+        data = CsvReader(file_path=file_path, parse_settings=self._parse_settings).read().data
+        match = _FILE_NAME.match(file_path.stem)
+        data[ColumnNames.FUTURESKEY] = file_path.parent.name
+        data[ColumnNames.DELIVERYMONTH] = match.group('month') if match else ''
+        data[ColumnNames.DATE] = pd.to_datetime(data[ColumnNames.DATE], format=self._parse_settings.datetime_fmt).dt.as_unit('ns')
+        return data
+
+    def refresh(self) -> int:
+        """Brings the table up to date with the DAILY files; returns the number of re-parsed files."""
+        self._parts_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        current = {str(path.relative_to(self._daily_dir)): path for path in sorted(self._daily_dir.glob('*/*.csv'))}
+        changed = [
+            relative for relative, path in current.items()
+            if relative not in manifest or not manifest[relative].is_current()
+        ]
+        removed = [relative for relative in manifest if relative not in current]
+        for relative in changed:
+            dependency = SourceDependency.from_path(current[relative])
+            part = self._part_path(relative)
+            part.parent.mkdir(parents=True, exist_ok=True)
+            tmp = part.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+            self._read_source(current[relative]).to_parquet(tmp, index=False)
+            os.replace(tmp, part)
+            manifest[relative] = dependency
+        for relative in removed:
+            self._part_path(relative).unlink(missing_ok=True)
+            del manifest[relative]
+        if changed or removed or not (self._store_path / _TABLE).exists():
+            self._rebuild(sorted(manifest))
+            self._save_manifest(manifest)
+            self.clear_cache()
+        return len(changed)
+
+    def _rebuild(self, relatives: List[str]) -> None:
+        parts = [pd.read_parquet(self._part_path(relative)) for relative in relatives]
+        if parts:
+            table = pd.concat(parts, ignore_index=True)
+        else:
+            table = pd.DataFrame({column: pd.Series(dtype='string') for column in _DIMENSIONS})
+            table[ColumnNames.DATE] = pd.Series(dtype='datetime64[ns]')
+        for column in _DIMENSIONS[1:]:
+            table[column] = table[column].astype('string').astype('category')
+        table = table.sort_values(ColumnNames.DATE, kind='stable').reset_index(drop=True)
+        tmp = self._store_path / f'{_TABLE}.{uuid.uuid4().hex}.tmp'
+        table.to_parquet(tmp, index=False)
+        os.replace(tmp, self._store_path / _TABLE)
+
+    @property
+    def table(self) -> pd.DataFrame:
+        if self._table_cache is None:
+            self._table_cache = pd.read_parquet(self._store_path / _TABLE)
+        return self._table_cache
+
+    @property
+    def _days(self) -> np.ndarray:
+        if self._days_cache is None:
+            self._days_cache = self.table[ColumnNames.DATE].to_numpy().astype('datetime64[D]').astype(np.int64)
+        return self._days_cache
+
+    def _codes(self, column: str) -> np.ndarray:
+        if self._codes_cache is None:
+            self._codes_cache = {
+                column: self.table[column].cat.codes.to_numpy().astype(np.int64) for column in _DIMENSIONS[1:]
+            }
+        return self._codes_cache[column]
+
+    def _rows(self, start: Optional[dt.date], end: Optional[dt.date]) -> slice:
+        days = self._days
+        first = 0 if start is None else int(np.searchsorted(days, np.datetime64(start, 'D').astype(np.int64), side='left'))
+        last = days.size if end is None else int(np.searchsorted(days, np.datetime64(end, 'D').astype(np.int64), side='right'))
+        return slice(first, last)
+
+    def aggregate(
+            self,
+            value_column: str,
+            by: Sequence[str],
+            agg: str = 'sum',
+            start: Optional[dt.date] = None,
+            end: Optional[dt.date] = None
+    ) -> pd.DataFrame:
+        """Aggregates ``value_column`` over groups of ``by`` dimensions for dates in ``[start, end]``."""
+        if agg not in _AGGREGATIONS:
+            raise CustomValueError(f'unsupported aggregation {agg}, expected one of {_AGGREGATIONS}')
+        unknown = set(by) - set(_DIMENSIONS)
+        if unknown:
+            raise CustomValueError(f'unsupported dimensions {sorted(unknown)}, expected some of {_DIMENSIONS}')
+        rows = self._rows(start, end)
+        values = self.table[value_column].iloc[rows].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Mixed-radix group code over the dimension codes of the selected rows.
+        days = self._days[rows]
+        date_base = int(days[0]) if days.size else 0
+        sizes = []
+        combined = np.zeros(values.size, dtype=np.int64)
+        valid = ~np.isnan(values)
+        for column in by:
+            if column == ColumnNames.DATE:
+                codes = days - date_base
+                size = int(days[-1]) - date_base + 1 if days.size else 1
+            else:
+                codes = self._codes(column)[rows]
+                size = max(len(self.table[column].cat.categories), 1)
+            valid &= codes >= 0
+            combined = combined * size + codes
+            sizes.append(size)
+
+        groups, inverse = np.unique(combined[valid], return_inverse=True)
+        picked = values[valid]
+        if agg in ('sum', 'count', 'mean'):
+            counts = np.bincount(inverse, minlength=groups.size).astype(np.float64)
+            sums = np.bincount(inverse, weights=picked, minlength=groups.size)
+            result = {'sum': sums, 'count': counts, 'mean': sums / np.maximum(counts, 1)}[agg]
+        else:
+            order = np.argsort(inverse, kind='stable')
+            starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0]) if order.size else np.empty(0, dtype=np.int64)
+            ufunc = np.minimum if agg == 'min' else np.maximum
+            result = ufunc.reduceat(picked[order], starts) if order.size else np.empty(0)
+
+        frame = {}
+        remainder = groups
+        for column, size in reversed(list(zip(by, sizes))):
+            codes = remainder % size
+            remainder = remainder // size
+            if column == ColumnNames.DATE:
+                frame[column] = (codes + date_base).astype('datetime64[D]').astype('datetime64[ns]')
+            else:
+                frame[column] = self.table[column].cat.categories.to_numpy()[codes] if codes.size else np.empty(0, dtype=object)
+        frame = {column: frame[column] for column in by}
+        frame[value_column] = result
+        return pd.DataFrame(frame)
+
+    def open_interest_by_key(self, start: Optional[dt.date] = None, end: Optional[dt.date] = None) -> pd.DataFrame:
+        """Total open interest per day (rows) and futures key (columns)."""
+        data = self.aggregate(ColumnNames.OPENPOSITION, by=[ColumnNames.DATE, ColumnNames.FUTURESKEY], start=start, end=end)
+        return data.pivot(index=ColumnNames.DATE, columns=ColumnNames.FUTURESKEY, values=ColumnNames.OPENPOSITION)
+
+    def top_contracts(
+            self,
+            column: str = ColumnNames.VALUE,
+            start: Optional[dt.date] = None,
+            end: Optional[dt.date] = None,
+            n: int = 10
+    ) -> pd.DataFrame:
+        """Contracts with the largest total ``column`` over the date range."""
+        data = self.aggregate(column, by=[ColumnNames.TICKER], start=start, end=end)
+        if len(data) > n:
+            data = data.iloc[np.argpartition(-data[column].to_numpy(), n - 1)[:n]]
+        return data.sort_values(column, ascending=False).reset_index(drop=True)
+
+    def max_date(
+            self,
+            futures_key: Optional[str] = None,
+            ticker: Optional[str] = None,
+            year: Optional[int] = None
+    ) -> Optional[dt.date]:
+        """Latest date in the table, optionally for one futures key or ticker.
+
+        ISS tickers carry only the last digit of the delivery year, so ``year``
+        limits the rows to the decade ending with that year.
+        """
+        mask = np.ones(len(self.table), dtype=bool)
+        if year is not None:
+            first = np.datetime64(dt.date(year - 9, 1, 1), 'D').astype(np.int64)
+            last = np.datetime64(dt.date(year, 12, 31), 'D').astype(np.int64)
+            mask &= (self._days >= first) & (self._days <= last)
+        if futures_key is not None:
+            mask &= (self.table[ColumnNames.FUTURESKEY] == futures_key).to_numpy()
+        if ticker is not None:
+            mask &= (self.table[ColumnNames.TICKER] == ticker).to_numpy()
+        days = self._days[mask]
+        if not days.size:
+            return None
+        return np.datetime64(int(days.max()), 'D').item()
@@ -0,0 +1,163 @@
+import os
+import json
+import uuid
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from financial_dashboard.core.entities.data_cache import DerivedResultManifest
+from financial_dashboard.core.entities.data_cache import SourceDependency
+
+from financial_dashboard.core.interfaces.data_cache import IDerivedResultStore
+
+from financial_dashboard.utils.locks import exclusive_lock
+
+_MANIFEST = 'manifest.json'
+_LOCK = '.lock'
+
+
+class DerivedResultStore(IDerivedResultStore):
+    """Persistent store of derived frames keyed by name and parameters.
+
+    Every entry records the source files it was computed from and a code
+    version; it is treated as missing as soon as either of them changes.
+    Data files are written under unique names and published by atomically
+    replacing the manifest, so concurrent readers and writers never observe
+    a half-written entry.
+    """
+    def __init__(self, root_path: Path) -> None:
+        self._root_path = Path(root_path)
+
+    @staticmethod
+    def _key(name: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps({'name': name, 'params': params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _entry_dir(self, name: str, params: Dict[str, Any]) -> Path:
+        return self._root_path / name / self._key(name, params)
+
+    @staticmethod
+    def _read_manifest(entry_dir: Path) -> Optional[DerivedResultManifest]:
+        try:
+            return DerivedResultManifest.model_validate_json((entry_dir / _MANIFEST).read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _is_valid(manifest: DerivedResultManifest, version: str) -> bool:
+        return manifest.version == version and all(dependency.is_current() for dependency in manifest.dependencies)
+
+    def get(self, name: str, params: Dict[str, Any], version: str) -> Optional[pd.DataFrame]:
+        entry_dir = self._entry_dir(name, params)
+        manifest = self._read_manifest(entry_dir)
+        if manifest is None or not self._is_valid(manifest, version):
+            return None
+        try:
+            return pd.read_parquet(entry_dir / manifest.data_file)
+        except OSError:
+            # Replaced by a concurrent writer between reading the manifest and the data.
+            return None
+
+    def _write(
+            self,
+            name: str,
+            params: Dict[str, Any],
+            version: str,
+            data: pd.DataFrame,
+            dependencies: List[SourceDependency]
+    ) -> None:
+        entry_dir = self._entry_dir(name, params)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        previous = self._read_manifest(entry_dir)
+        data_file = f'data-{uuid.uuid4().hex}.parquet'
+        data.to_parquet(entry_dir / data_file)
+        manifest = DerivedResultManifest(
+            name=name,
+            params=json.loads(json.dumps(params, default=str)),
+            version=version,
+            dependencies=dependencies,
+            data_file=data_file
+        )
+        tmp_manifest = entry_dir / f'{_MANIFEST}.{uuid.uuid4().hex}.tmp'
+        tmp_manifest.write_text(manifest.model_dump_json())
+        os.replace(tmp_manifest, entry_dir / _MANIFEST)
+        if previous is not None and previous.data_file != data_file:
+            (entry_dir / previous.data_file).unlink(missing_ok=True)
+
+    def put(self, name: str, params: Dict[str, Any], version: str, data: pd.DataFrame, dependencies: Iterable[Path]) -> None:
+        fingerprints = [SourceDependency.from_path(path) for path in dependencies]
+        entry_dir = self._entry_dir(name, params)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        with exclusive_lock(entry_dir / _LOCK):
+            self._write(name, params, version, data, fingerprints)
+
+    def get_or_compute(
+            self,
+            name: str,
+            params: Dict[str, Any],
+            version: str,
+            dependencies: Iterable[Path],
+            compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        cached = self.get(name, params, version)
+        if cached is not None:
+            return cached
+        dependencies = list(dependencies)
+        entry_dir = self._entry_dir(name, params)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        # Only one process computes a given entry; the others wait and reuse it.
+        with exclusive_lock(entry_dir / _LOCK):
+            cached = self.get(name, params, version)
+            if cached is not None:
+                return cached
+            # Fingerprints are taken before computing so that sources changed
+            # during the computation invalidate the stored result.
+            fingerprints = [SourceDependency.from_path(path) for path in dependencies]
+            data = compute()
+            self._write(name, params, version, data, fingerprints)
+        return data
+
+    def invalidate(self, name: str, params: Dict[str, Any]) -> None:
+        entry_dir = self._entry_dir(name, params)
+        if entry_dir.exists():
+            with exclusive_lock(entry_dir / _LOCK):
+                (entry_dir / _MANIFEST).unlink(missing_ok=True)
+
+    def _invalidate_matching(self, matches: Callable[[Path], bool]) -> int:
+        dropped = 0
+        for manifest_path in self._root_path.glob(f'*/*/{_MANIFEST}'):
+            entry_dir = manifest_path.parent
+            # Read under the lock too, so an entry rewritten meanwhile is judged by its new dependencies.
+            with exclusive_lock(entry_dir / _LOCK):
+                manifest = self._read_manifest(entry_dir)
+                if manifest is not None and any(matches(Path(dependency.path)) for dependency in manifest.dependencies):
+                    manifest_path.unlink(missing_ok=True)
+                    dropped += 1
+        return dropped
+
+    def invalidate_source(self, path: Path) -> int:
+        """Drops every entry that depends on ``path``; returns the number of dropped entries."""
+        resolved = Path(path).resolve()
+        return self._invalidate_matching(lambda dependency: dependency == resolved)
+
+    def invalidate_under(self, directory: Path) -> int:
+        """Drops every entry that depends on a file under ``directory``; returns the number of dropped entries."""
+        resolved = Path(directory).resolve()
+        return self._invalidate_matching(lambda dependency: dependency.is_relative_to(resolved))
+
+    def prune(self) -> int:
+        """Removes data files of invalidated or superseded entries; returns the number of removed files."""
+        removed = 0
+        for entry_dir in self._root_path.glob('*/*'):
+            if not entry_dir.is_dir():
+                continue
+            with exclusive_lock(entry_dir / _LOCK):
+                manifest = self._read_manifest(entry_dir)
+                keep = manifest.data_file if manifest is not None else None
+                for data_file in entry_dir.glob('data-*.parquet'):
+                    if data_file.name != keep:
+                        data_file.unlink(missing_ok=True)
+                        removed += 1
+        return removed
@@ -0,0 +1,220 @@
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from financial_dashboard.core.entities.source_types import DataSourceType
+from financial_dashboard.core.entities.watching import FileChange
+from financial_dashboard.core.entities.watching import FileChangeKind
+
+from financial_dashboard.core.interfaces.data_cache import IDerivedResultStore
+from financial_dashboard.core.interfaces.watchers import IFileWatcher
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ContractChange:
+    """Changed files of one contract directory (``data/<source>_data/<key>``).
+
+    ``futures_key`` is None for a rescan of the whole source root.
+    """
+    source_type: DataSourceType
+    futures_key: Optional[str]
+    written: Tuple[Path, ...]
+    deleted: Tuple[Path, ...]
+
+    @property
+    def paths(self) -> Tuple[Path, ...]:
+        return self.written + self.deleted
+
+
+ChangeCallback = Callable[[ContractChange], None]
+
+
+@dataclass(frozen=True)
+class _Hook:
+    callback: ChangeCallback
+    source_type: Optional[DataSourceType]
+    futures_key: Optional[str]
+    path: Optional[Path]
+
+    def matches(self, change: ContractChange) -> bool:
+        if self.source_type is not None and self.source_type is not change.source_type:
+            return False
+        if change.futures_key is None:
+            return True
+        if self.futures_key is not None and self.futures_key != change.futures_key:
+            return False
+        return self.path is None or self.path in change.paths
+
+
+class InvalidationHub:
+    """Maps file changes under the data roots to contracts and dependents.
+
+    Events are coalesced until the roots have been quiet for ``settle``
+    seconds, then handled per contract in two phases: derived results that
+    depend on the changed files are dropped from the store and registered
+    cache hooks run (``register``, e.g. ``clear_cache`` of a reader or
+    ``DailyAnalyticsStore.refresh``); after that subscribers are notified
+    (``subscribe``, e.g. dashboards reloading the affected contract). Hooks
+    are filtered by source type, futures key and file, so work is limited to
+    what changed. A rescan drops every derived result under its source root.
+    Callbacks run on the watcher thread; a failing callback is logged and
+    does not stop the others.
+    """
+    def __init__(
+            self,
+            roots: Mapping[DataSourceType, Path],
+            watcher: IFileWatcher,
+            store: Optional[IDerivedResultStore] = None,
+            settle: float = 0.5
+    ) -> None:
+        if not isinstance(watcher, IFileWatcher):
+            raise TypeError(f'watcher type error: expected {IFileWatcher.__name__}, got {type(watcher)}')
+        self._roots = {source_type: Path(root).resolve() for source_type, root in roots.items()}
+        self._watcher = watcher
+        self._store = store
+        self._settle = settle
+        self._ids = itertools.count()
+        self._hooks: Dict[int, _Hook] = {}
+        self._subscribers: Dict[int, _Hook] = {}
+        self._pending: Dict[Path, FileChangeKind] = {}
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _hook(callback, source_type, futures_key, path) -> _Hook:
+        return _Hook(callback, source_type, futures_key, Path(path).resolve() if path is not None else None)
+
+    def register(
+            self,
+            callback: ChangeCallback,
+            source_type: Optional[DataSourceType] = None,
+            futures_key: Optional[str] = None,
+            path: Optional[Path] = None
+    ) -> int:
+        """Adds an invalidation hook; returns its handle for ``unregister``."""
+        handle = next(self._ids)
+        with self._lock:
+            self._hooks[handle] = self._hook(callback, source_type, futures_key, path)
+        return handle
+
+    def register_cache(self, owner, source_type: Optional[DataSourceType] = None, futures_key: Optional[str] = None, path: Optional[Path] = None) -> int:
+        """Calls ``owner.clear_cache()`` when a matching file changes."""
+        return self.register(lambda change: owner.clear_cache(), source_type, futures_key, path)
+
+    def subscribe(self, callback: ChangeCallback, source_type: Optional[DataSourceType] = None, futures_key: Optional[str] = None) -> int:
+        handle = next(self._ids)
+        with self._lock:
+            self._subscribers[handle] = self._hook(callback, source_type, futures_key, None)
+        return handle
+
+    def unregister(self, handle: int) -> None:
+        with self._lock:
+            self._hooks.pop(handle, None)
+            self._subscribers.pop(handle, None)
+
+    def _locate(self, path: Path) -> Optional[Tuple[DataSourceType, Optional[str]]]:
+        for source_type, root in self._roots.items():
+            try:
+                relative = path.relative_to(root)
+            except ValueError:
+                continue
+            return source_type, relative.parts[0] if len(relative.parts) > 1 else None
+        return None
+
+    def _group(self, pending: Dict[Path, FileChangeKind]) -> List[ContractChange]:
+        groups: Dict[Tuple[DataSourceType, Optional[str]], Tuple[List[Path], List[Path]]] = {}
+        rescans = set()
+        for path, kind in pending.items():
+            location = self._locate(path)
+            if location is None:
+                continue
+            if kind is FileChangeKind.RESCAN:
+                rescans.add(location[0])
+                continue
+            written, deleted = groups.setdefault(location, ([], []))
+            (deleted if kind is FileChangeKind.DELETED else written).append(path)
+        changes = [
+            ContractChange(source_type, None, (), ()) for source_type in sorted(rescans, key=lambda item: item.value)
+        ]
+        changes.extend(
+            ContractChange(source_type, key, tuple(sorted(written)), tuple(sorted(deleted)))
+            for (source_type, key), (written, deleted) in sorted(groups.items(), key=lambda item: (item[0][0].value, item[0][1] or ''))
+            if source_type not in rescans
+        )
+        return changes
+
+    def add_changes(self, changes: List[FileChange]) -> None:
+        with self._lock:
+            for change in changes:
+                self._pending[Path(change.path).resolve()] = change.kind
+            if changes:
+                self._last_event = time.monotonic()
+
+    def flush(self) -> List[ContractChange]:
+        """Handles all pending changes now; returns them grouped per contract."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            hooks = list(self._hooks.values())
+            subscribers = list(self._subscribers.values())
+        changes = self._group(pending)
+        for change in changes:
+            if self._store is not None:
+                self._call(self._invalidate_store, change)
+            for hook in hooks:
+                if hook.matches(change):
+                    self._call(hook.callback, change)
+        for change in changes:
+            for subscriber in subscribers:
+                if subscriber.matches(change):
+                    self._call(subscriber.callback, change)
+        return changes
+
+    def _invalidate_store(self, change: ContractChange) -> None:
+        if change.futures_key is None:
+            self._store.invalidate_under(self._roots[change.source_type])
+        for path in change.paths:
+            self._store.invalidate_source(path)
+
+    @staticmethod
+    def _call(callback: ChangeCallback, change: ContractChange) -> None:
+        try:
+            callback(change)
+        except Exception:
+            _logger.exception('invalidation callback %r failed for %s', callback, change)
+
+    def poll_once(self, timeout: float) -> List[ContractChange]:
+        """Collects events for up to ``timeout`` seconds and flushes them once the roots are quiet."""
+        self.add_changes(self._watcher.poll(timeout))
+        with self._lock:
+            ready = bool(self._pending) and time.monotonic() - self._last_event >= self._settle
+        return self.flush() if ready else []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.poll_once(min(self._settle, 0.25) if self._settle > 0 else 0.25)
+            except Exception:
+                _logger.exception('invalidation poll failed')
+                self._stop.wait(0.25)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='invalidation-hub', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._watcher.close()
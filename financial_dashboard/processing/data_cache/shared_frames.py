@@ -0,0 +1,361 @@
+import base64
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.utils.locks import exclusive_lock
+
+_ALIGNMENT = 64
+_INDEX_COLUMN = '__index__'
+_LOCK = '.lock'
+_SEGMENT_PREFIX = 'fd_'
+
+
+def _untrack(segment: SharedMemory) -> None:
+    # The resource tracker would unlink the segment when this process exits;
+    # the lifetime is governed by the registry leases instead. Windows has no
+    # tracker: a segment lives as long as some process holds a handle to it.
+    if os.name != 'nt':
+        resource_tracker.unregister(segment._name, 'shared_memory')
+
+
+def _compact(array: pa.Array) -> pa.Array:
+    """``array`` at offset 0 with buffers trimmed to its rows; slices are copied."""
+    if pa.types.is_dictionary(array.type):
+        return pa.DictionaryArray.from_arrays(_compact(array.indices), _compact(array.dictionary), ordered=array.type.ordered)
+    if array.offset or array.get_total_buffer_size() > array.nbytes:
+        return pa.concat_arrays([array])
+    return array
+
+
+if os.name == 'nt':
+    import ctypes
+    from ctypes import wintypes
+
+    _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    _ERROR_ACCESS_DENIED = 5
+    _STILL_ACTIVE = 259
+    _kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    _kernel32.GetExitCodeProcess.restype = wintypes.BOOL
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    _kernel32.CloseHandle.restype = wintypes.BOOL
+
+    def _pid_alive(pid: int) -> bool:
+        # os.kill would terminate the process on Windows.
+        handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+        try:
+            code = wintypes.DWORD()
+            if not _kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+                return True
+            return code.value == _STILL_ACTIVE
+        finally:
+            _kernel32.CloseHandle(handle)
+else:
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+
+def _aligned(size: int) -> int:
+    return -(-size // _ALIGNMENT) * _ALIGNMENT
+
+
+def _buffer_layout(array: pa.Array, offset: int) -> Tuple[List[Optional[List[int]]], int]:
+    if array.offset:
+        # Readers rebuild arrays from the buffers at offset 0.
+        raise CustomValueError(f'array offset must be 0 to be shared, got {array.offset}')
+    layout = []
+    for buffer in array.buffers():
+        if buffer is None:
+            layout.append(None)
+            continue
+        layout.append([offset, buffer.size])
+        offset += _aligned(buffer.size)
+    return layout, offset
+
+
+@dataclass(frozen=True)
+class SharedFrameInfo:
+    key: str
+    segment: str
+    version: int
+    rows: int
+    nbytes: int
+
+
+class SharedFramePublisher:
+    """Publishes frames into ``multiprocessing.shared_memory`` segments.
+
+    Every column is converted to Arrow and its buffers (validity, offsets,
+    data; indices and dictionary for categoricals) are copied into one
+    segment at 64-byte aligned offsets. The registry directory holds a JSON
+    entry per key with the Arrow schema and buffer layout. Republishing a key
+    retires the previous segment; ``collect`` unlinks retired segments once
+    no live process holds a lease on them.
+    """
+    def __init__(self, registry_path: Path) -> None:
+        self._registry = Path(registry_path)
+        for directory in ('frames', 'retired', 'leases'):
+            (self._registry / directory).mkdir(parents=True, exist_ok=True)
+        # On Windows the publisher keeps its handles open until ``collect``,
+        # otherwise a segment would vanish before any worker attaches.
+        self._handles: Dict[str, SharedMemory] = {}
+
+    def _entry_path(self, key: str) -> Path:
+        return self._registry / 'frames' / f'{key}.json'
+
+    @staticmethod
+    def _to_arrow(data: pd.DataFrame) -> pa.Table:
+        if not data.columns.is_unique:
+            raise CustomValueError('shared frames must have unique column names')
+        index = data.index
+        default_index = isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1 and index.name is None
+        frame = data if default_index else data.reset_index(names=_INDEX_COLUMN)
+        table = pa.Table.from_pandas(frame, preserve_index=False).combine_chunks()
+        # Buffers are shared as they are, without offsets, so sliced columns are compacted first.
+        return pa.Table.from_arrays(
+            [_compact(column.chunk(0)) if column.num_chunks else pa.array([], type=column.type) for column in table.columns],
+            schema=table.schema
+        )
+
+    def publish(self, key: str, data: pd.DataFrame) -> SharedFrameInfo:
+        table = self._to_arrow(data)
+        columns = []
+        offset = 0
+        for name, column in zip(table.column_names, table.columns):
+            array = column.chunk(0) if column.num_chunks else pa.array([], type=column.type)
+            spec: Dict[str, Any] = {'name': name, 'null_count': array.null_count}
+            if pa.types.is_dictionary(array.type):
+                spec['buffers'], offset = _buffer_layout(array.indices, offset)
+                spec['dictionary_length'] = len(array.dictionary)
+                spec['dictionary_buffers'], offset = _buffer_layout(array.dictionary, offset)
+            elif array.type.num_fields:
+                raise CustomValueError(f'nested column {name} of type {array.type} can not be shared')
+            else:
+                spec['buffers'], offset = _buffer_layout(array, offset)
+            columns.append((spec, array))
+
+        segment = SharedMemory(name=f'{_SEGMENT_PREFIX}{uuid.uuid4().hex[:24]}', create=True, size=max(offset, 1))
+        _untrack(segment)
+        try:
+            for spec, array in columns:
+                parts = [(spec['buffers'], array.indices if pa.types.is_dictionary(array.type) else array)]
+                if 'dictionary_buffers' in spec:
+                    parts.append((spec['dictionary_buffers'], array.dictionary))
+                for layout, source in parts:
+                    for position, buffer in zip(layout, source.buffers()):
+                        if position is not None:
+                            segment.buf[position[0]:position[0] + position[1]] = memoryview(buffer).cast('B')
+        finally:
+            if os.name == 'nt':
+                self._handles[segment.name] = segment
+            else:
+                segment.close()
+
+        with exclusive_lock(self._registry / _LOCK):
+            previous = self._read_entry(key)
+            entry = {
+                'key': key,
+                'segment': segment.name,
+                'version': previous['version'] + 1 if previous else 1,
+                'rows': table.num_rows,
+                'nbytes': offset,
+                'schema': base64.b64encode(table.schema.serialize().to_pybytes()).decode(),
+                'columns': [spec for spec, _ in columns],
+                'index': _INDEX_COLUMN in table.column_names,
+                'index_names': list(data.index.names) if _INDEX_COLUMN in table.column_names else None
+            }
+            tmp = self._entry_path(key).with_suffix(f'.{uuid.uuid4().hex}.tmp')
+            tmp.write_text(json.dumps(entry))
+            os.replace(tmp, self._entry_path(key))
+            if previous:
+                (self._registry / 'retired' / previous['segment']).touch()
+        self.collect()
+        return SharedFrameInfo(key=key, segment=segment.name, version=entry['version'], rows=table.num_rows, nbytes=offset)
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._entry_path(key).read_text())
+        except FileNotFoundError:
+            return None
+
+    def unpublish(self, key: str) -> None:
+        with exclusive_lock(self._registry / _LOCK):
+            entry = self._read_entry(key)
+            if entry is None:
+                return
+            self._entry_path(key).unlink()
+            (self._registry / 'retired' / entry['segment']).touch()
+        self.collect()
+
+    def collect(self) -> List[str]:
+        """Unlinks retired segments without live leases; returns their names."""
+        unlinked = []
+        with exclusive_lock(self._registry / _LOCK):
+            for marker in (self._registry / 'retired').iterdir():
+                lease_dir = self._registry / 'leases' / marker.name
+                live = False
+                for lease in lease_dir.glob('*') if lease_dir.exists() else []:
+                    if _pid_alive(int(lease.name.split('-')[0])):
+                        live = True
+                    else:
+                        lease.unlink(missing_ok=True)
+                if live:
+                    continue
+                handle = self._handles.pop(marker.name, None)
+                if handle is not None:
+                    handle.close()
+                try:
+                    segment = SharedMemory(name=marker.name)
+                    segment.close()
+                    segment.unlink()
+                except FileNotFoundError:
+                    pass
+                if lease_dir.exists():
+                    lease_dir.rmdir()
+                marker.unlink()
+                unlinked.append(marker.name)
+        return unlinked
+
+    def close(self) -> None:
+        """Retires every published frame and unlinks what is no longer leased."""
+        for path in list((self._registry / 'frames').glob('*.json')):
+            self.unpublish(path.stem)
+
+
+class SharedFrameLease:
+    """A worker's read-only attachment to a published frame.
+
+    Arrays returned by ``to_pandas`` and ``to_polars`` are views of the shared
+    segment. The lease file keeps the segment alive after it is retired until
+    ``release`` is called or the process dies.
+    """
+    def __init__(self, registry_path: Path, entry: Dict[str, Any]) -> None:
+        self._registry = Path(registry_path)
+        self._entry = entry
+        lease_dir = self._registry / 'leases' / entry['segment']
+        lease_dir.mkdir(parents=True, exist_ok=True)
+        self._lease_path = lease_dir / f'{os.getpid()}-{uuid.uuid4().hex}'
+        self._lease_path.touch()
+        try:
+            self._segment = SharedMemory(name=entry['segment'])
+        except FileNotFoundError:
+            self._lease_path.unlink(missing_ok=True)
+            raise KeyError(f'shared frame {entry["key"]} is no longer available')
+        _untrack(self._segment)
+        # Buffers reference the segment object instead of exporting its memoryview:
+        # the mapping is closed when the last view is garbage collected, and
+        # ``SharedMemory.close`` never meets exported buffers.
+        address = pa.py_buffer(self._segment.buf).address
+        self._base = pa.foreign_buffer(address, self._segment.size, base=self._segment)
+        self._table_cache: Optional[pa.Table] = None
+
+    @property
+    def key(self) -> str:
+        return self._entry['key']
+
+    @property
+    def version(self) -> int:
+        return self._entry['version']
+
+    def _buffers(self, layout: List[Optional[List[int]]]) -> List[Optional[pa.Buffer]]:
+        return [None if position is None else self._base.slice(position[0], position[1]) for position in layout]
+
+    @property
+    def table(self) -> pa.Table:
+        if self._table_cache is None:
+            schema = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(self._entry['schema'])))
+            rows = self._entry['rows']
+            arrays = []
+            for field, spec in zip(schema, self._entry['columns']):
+                if pa.types.is_dictionary(field.type):
+                    indices = pa.Array.from_buffers(field.type.index_type, rows, self._buffers(spec['buffers']), spec['null_count'])
+                    dictionary = pa.Array.from_buffers(field.type.value_type, spec['dictionary_length'], self._buffers(spec['dictionary_buffers']))
+                    arrays.append(pa.DictionaryArray.from_arrays(indices, dictionary, ordered=field.type.ordered))
+                else:
+                    arrays.append(pa.Array.from_buffers(field.type, rows, self._buffers(spec['buffers']), spec['null_count']))
+            self._table_cache = pa.Table.from_arrays(arrays, schema=schema.remove_metadata())
+        return self._table_cache
+
+    @staticmethod
+    def _to_series(array: pa.Array) -> Any:
+        if pa.types.is_dictionary(array.type) and array.null_count == 0:
+            codes = array.indices.to_numpy(zero_copy_only=True)
+            return pd.Categorical.from_codes(codes, categories=array.dictionary.to_pandas(), ordered=array.type.ordered, validate=False)
+        if array.null_count == 0 and (pa.types.is_integer(array.type) or pa.types.is_floating(array.type) or pa.types.is_timestamp(array.type) or pa.types.is_duration(array.type)):
+            return array.to_numpy(zero_copy_only=True)
+        return pd.array(array, dtype=pd.ArrowDtype(array.type))
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Read-only view: numeric and timestamp columns are NumPy views, strings Arrow-backed views; categorical codes are copied."""
+        table = self.table
+        columns = {name: self._to_series(column.chunk(0)) for name, column in zip(table.column_names, table.columns)}
+        index = None
+        if self._entry['index']:
+            index = pd.Index(columns.pop(_INDEX_COLUMN), name=self._entry['index_names'][0], copy=False)
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def to_polars(self):
+        import polars as pl
+        data = pl.from_arrow(self.table, rechunk=False)
+        if self._entry['index']:
+            data = data.rename({_INDEX_COLUMN: self._entry['index_names'][0] or 'index'})
+        return data
+
+    def release(self) -> None:
+        """Drops the lease; views created from it stay valid until they are garbage collected."""
+        self._table_cache = None
+        self._base = None
+        # Closed here unless views still reference it.
+        self._segment = None
+        self._lease_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'SharedFrameLease':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class SharedFrameClient:
+    """Worker side of the registry: lists published frames and leases them."""
+    def __init__(self, registry_path: Path) -> None:
+        self._registry = Path(registry_path)
+
+    @property
+    def keys(self) -> List[str]:
+        return sorted(path.stem for path in (self._registry / 'frames').glob('*.json'))
+
+    def info(self, key: str) -> SharedFrameInfo:
+        entry = self._entry(key)
+        return SharedFrameInfo(key=key, segment=entry['segment'], version=entry['version'], rows=entry['rows'], nbytes=entry['nbytes'])
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        try:
+            return json.loads((self._registry / 'frames' / f'{key}.json').read_text())
+        except FileNotFoundError:
+            raise KeyError(f'unknown shared frame {key}')
+
+    def attach(self, key: str) -> SharedFrameLease:
+        with exclusive_lock(self._registry / _LOCK):
+            return SharedFrameLease(self._registry, self._entry(key))
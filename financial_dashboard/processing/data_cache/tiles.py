@@ -0,0 +1,221 @@
+import datetime as dt
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.data_cache import IDerivedResultStore
+
+from financial_dashboard.processing.sessions.calendar import MoexSessionCalendar
+
+from financial_dashboard.utils.timestamps import check_sorted
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+OHLCV_TILE_RESULT = 'ohlcv_tile'
+OHLCV_PYRAMID_RESULT = 'ohlcv_pyramid'
+TILE_VERSION = '1'
+DAILY_LEVEL = 24 * 60
+DEFAULT_LEVELS = (1, 5, 30, 240, DAILY_LEVEL)
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_DAY = DAILY_LEVEL * _NS_PER_MINUTE
+# Evening sessions before long holidays belong to a trading day up to this far ahead.
+_LOOKBACK_NS = 14 * _NS_PER_DAY
+_VALUES = (ColumnNames.OPEN, ColumnNames.HIGH, ColumnNames.LOW, ColumnNames.CLOSE, ColumnNames.VOL)
+_INDEX_COLUMNS = ['level', 'tile', 'rows', 'first', 'last']
+
+
+class OhlcvTilePyramid:
+    """Pre-aggregated OHLCV pyramid of a contract, split into time tiles.
+
+    The first level holds the base bars; every further level is aggregated
+    from the previous one into buckets of ``level`` minutes that never cross
+    a trading day (the daily level is one bucket per trading day). A bucket
+    is labelled with the time of its first bar. Each level is cut into tiles spanning
+    ``tile_bars`` buckets of clock time, stored in the derived result store;
+    a small index entry records rows and time range per tile.
+
+    ``update`` recomputes only from the start of the trading day of the first
+    new bar, so appending bars rewrites the tail tile of every level.
+    """
+    def __init__(
+            self,
+            store: IDerivedResultStore,
+            levels: Sequence[int] = DEFAULT_LEVELS,
+            tile_bars: int = 2048,
+            calendar: Optional[MoexSessionCalendar] = None,
+            parse_settings: Optional[IParseSettings] = None
+    ) -> None:
+        levels = list(levels)
+        if levels != sorted(set(levels)):
+            raise CustomValueError(f'levels must be strictly increasing, got {levels}')
+        for previous, level in zip([1] + levels, levels):
+            if level < 1 or DAILY_LEVEL % level or level % previous:
+                raise CustomValueError(f'level must divide a day and be a multiple of the previous level, got {level} minutes')
+        self._store = store
+        self._levels = levels
+        self._tile_bars = tile_bars
+        self._calendar = calendar or MoexSessionCalendar()
+        self._parse_settings = parse_settings
+
+    @property
+    def levels(self) -> List[int]:
+        return list(self._levels)
+
+    def _tile_span(self, level: int) -> int:
+        return level * self._tile_bars * _NS_PER_MINUTE
+
+    @staticmethod
+    def _params(key: str, level: int, tile: int) -> Dict:
+        return {'key': key, 'level': level, 'tile': tile}
+
+    def tile_index(self, key: str) -> pd.DataFrame:
+        """``level, tile, rows, first, last`` of every stored tile."""
+        index = self._store.get(OHLCV_PYRAMID_RESULT, {'key': key}, TILE_VERSION)
+        if index is None:
+            return pd.DataFrame({column: pd.Series(dtype=np.int64) for column in _INDEX_COLUMNS})
+        return index
+
+    def _read_tile(self, key: str, level: int, tile: int) -> Optional[pd.DataFrame]:
+        return self._store.get(OHLCV_TILE_RESULT, self._params(key, level, tile), TILE_VERSION)
+
+    def _read_level(self, index: pd.DataFrame, key: str, level: int, start: int, end: int) -> pd.DataFrame:
+        """Rows of a level with labels in ``[start, end)``."""
+        tiles = index[(index['level'] == level) & (index['last'] >= start) & (index['first'] < end)]['tile']
+        frames = [self._read_tile(key, level, int(tile)) for tile in sorted(tiles)]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return self._empty()
+        data = pd.concat(frames, ignore_index=True)
+        labels = data[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)
+        return data[(labels >= start) & (labels < end)].reset_index(drop=True)
+
+    @staticmethod
+    def _empty() -> pd.DataFrame:
+        data = {ColumnNames.TIMESTAMP: pd.Series(dtype='datetime64[ns]')}
+        data.update({column: pd.Series(dtype=np.float64) for column in _VALUES})
+        return pd.DataFrame(data)
+
+    def _base(self, bars: pd.DataFrame) -> pd.DataFrame:
+        timestamps = extract_timestamps(bars, self._parse_settings)
+        check_sorted(timestamps, name='bars')
+        data = {ColumnNames.TIMESTAMP: timestamps.view('datetime64[ns]')}
+        data.update({column: bars[column].to_numpy(dtype=np.float64, na_value=np.nan) for column in _VALUES})
+        return pd.DataFrame(data)
+
+    def _aggregate(self, data: pd.DataFrame, level: int) -> pd.DataFrame:
+        if not len(data):
+            return self._empty()
+        labels = data[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)
+        days = self._calendar.classify(labels).trading_days.astype(np.int64)
+        slots = np.zeros_like(labels) if level == DAILY_LEVEL else labels // (level * _NS_PER_MINUTE)
+        boundary = np.ones(labels.size, dtype=bool)
+        boundary[1:] = (days[1:] != days[:-1]) | (slots[1:] != slots[:-1])
+        starts = np.flatnonzero(boundary)
+        ends = np.append(starts[1:], labels.size) - 1
+        return pd.DataFrame({
+            ColumnNames.TIMESTAMP: labels[starts].view('datetime64[ns]'),
+            ColumnNames.OPEN: data[ColumnNames.OPEN].to_numpy()[starts],
+            ColumnNames.HIGH: np.fmax.reduceat(data[ColumnNames.HIGH].to_numpy(), starts),
+            ColumnNames.LOW: np.fmin.reduceat(data[ColumnNames.LOW].to_numpy(), starts),
+            ColumnNames.CLOSE: data[ColumnNames.CLOSE].to_numpy()[ends],
+            ColumnNames.VOL: np.add.reduceat(np.nan_to_num(data[ColumnNames.VOL].to_numpy()), starts)
+        })
+
+    def _write_level(self, index: pd.DataFrame, key: str, level: int, rows: pd.DataFrame, start: int) -> pd.DataFrame:
+        """Replaces labels ``>= start`` of a level by ``rows``; returns the updated tile index."""
+        span = self._tile_span(level)
+        first_tile = start // span
+        at_level = index['level'] == level
+        stale = index[at_level & (index['tile'] >= first_tile)]
+        labels = rows[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)
+        tiles = labels // span
+        entries = []
+        for tile in sorted(set(stale['tile'].tolist()) | set(np.unique(tiles).tolist())):
+            part = rows[tiles == tile]
+            if tile == first_tile:
+                existing = self._read_tile(key, level, tile)
+                if existing is not None:
+                    kept = existing[existing[ColumnNames.TIMESTAMP].to_numpy().view(np.int64) < start]
+                    part = pd.concat([kept, part], ignore_index=True) if len(kept) else part
+            params = self._params(key, level, int(tile))
+            if not len(part):
+                self._store.invalidate(OHLCV_TILE_RESULT, params)
+                continue
+            self._store.put(OHLCV_TILE_RESULT, params, TILE_VERSION, part.reset_index(drop=True), dependencies=[])
+            part_labels = part[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)
+            entries.append((level, int(tile), len(part), int(part_labels[0]), int(part_labels[-1])))
+        kept_index = index[~(at_level & (index['tile'] >= first_tile))]
+        return pd.concat([kept_index, pd.DataFrame(entries, columns=_INDEX_COLUMNS)], ignore_index=True)
+
+    def update(self, key: str, bars: pd.DataFrame) -> None:
+        """Adds base bars; stored bars at or after the first new bar are replaced."""
+        new = self._base(bars)
+        if not len(new):
+            return
+        index = self.tile_index(key)
+        first_new = int(new[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)[0])
+        # Recompute whole trading days: take the stored bars of the first new bar's day.
+        previous = self._read_level(index, key, self._levels[0], first_new - _LOOKBACK_NS, first_new)
+        first_day = self._calendar.classify(np.array([first_new])).trading_days[0]
+        if len(previous):
+            previous_days = self._calendar.classify(previous[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)).trading_days
+            # Cut by position: every later row is rewritten too, even if its trading day is
+            # earlier (bars after the evening session belong to the calendar day).
+            later = np.flatnonzero(previous_days >= first_day)
+            previous = previous.iloc[later[0]:] if later.size else previous.iloc[:0]
+        base = pd.concat([previous, new], ignore_index=True) if len(previous) else new
+        start = int(base[ColumnNames.TIMESTAMP].to_numpy().view(np.int64)[0])
+
+        rows = base
+        for number, level in enumerate(self._levels):
+            rows = rows if number == 0 else self._aggregate(rows, level)
+            index = self._write_level(index, key, level, rows, start)
+        index = index.sort_values(['level', 'tile'], ignore_index=True)
+        self._store.put(OHLCV_PYRAMID_RESULT, {'key': key}, TILE_VERSION, index, dependencies=[])
+
+    def build(self, key: str, bars: pd.DataFrame) -> None:
+        """Rebuilds the pyramid of ``key`` from the full base history."""
+        self.drop(key)
+        self.update(key, bars)
+
+    def drop(self, key: str) -> None:
+        index = self.tile_index(key)
+        for level, tile in zip(index['level'], index['tile']):
+            self._store.invalidate(OHLCV_TILE_RESULT, self._params(key, int(level), int(tile)))
+        self._store.invalidate(OHLCV_PYRAMID_RESULT, {'key': key})
+
+    def read(
+            self,
+            key: str,
+            start: Optional[dt.datetime] = None,
+            end: Optional[dt.datetime] = None,
+            max_points: int = 2000
+    ) -> Tuple[int, pd.DataFrame]:
+        """Finest level with at most ``max_points`` bars in ``[start, end)`` and its bars.
+
+        Returns the level in minutes and the bars; only the tiles overlapping
+        the range are read.
+        """
+        index = self.tile_index(key)
+        first = pd.Timestamp(start).value if start is not None else np.iinfo(np.int64).min
+        last = pd.Timestamp(end).value if end is not None else np.iinfo(np.int64).max
+        for number, level in enumerate(self._levels):
+            tiles = index[(index['level'] == level) & (index['last'] >= first) & (index['first'] < last)]
+            estimate = self._estimate_rows(tiles, first, last)
+            if estimate <= max_points or number == len(self._levels) - 1:
+                return level, self._read_level(index, key, level, first, last)
+        return self._levels[-1], self._empty()
+
+    @staticmethod
+    def _estimate_rows(tiles: pd.DataFrame, first: int, last: int) -> float:
+        """Rows in range assuming uniform density inside partially covered tiles."""
+        if not len(tiles):
+            return 0.0
+        span = np.maximum(tiles['last'].to_numpy() - tiles['first'].to_numpy(), 1).astype(np.float64)
+        covered = np.minimum(tiles['last'].to_numpy(), last) - np.maximum(tiles['first'].to_numpy(), first)
+        share = np.clip(covered / span, 0.0, 1.0)
+        return float((tiles['rows'].to_numpy() * np.where(span > 1, share, 1.0)).sum())
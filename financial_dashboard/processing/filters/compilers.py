@@ -0,0 +1,342 @@
+import datetime as dt
+import operator
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.processing.filters.expressions import And
+from financial_dashboard.processing.filters.expressions import Between
+from financial_dashboard.processing.filters.expressions import Comparison
+from financial_dashboard.processing.filters.expressions import DateBetween
+from financial_dashboard.processing.filters.expressions import Expr
+from financial_dashboard.processing.filters.expressions import FilterContext
+from financial_dashboard.processing.filters.expressions import InSession
+from financial_dashboard.processing.filters.expressions import IsIn
+from financial_dashboard.processing.filters.expressions import Not
+from financial_dashboard.processing.filters.expressions import Or
+from financial_dashboard.processing.filters.expressions import TimeBetween
+
+from financial_dashboard.processing.sessions.calendar import MoexSessionCalendar
+
+_OPERATORS: Dict[str, Callable] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+_NS_PER_DAY = 24 * 60 * 60 * 10 ** 9
+_EPOCH = dt.date(1970, 1, 1)
+
+
+def referenced_columns(expr: Expr, context: Optional[FilterContext] = None) -> Set[str]:
+    """Columns an expression needs to be evaluated."""
+    context = context or FilterContext()
+    if isinstance(expr, (Comparison, Between, IsIn)):
+        return {expr.column}
+    if isinstance(expr, (DateBetween, TimeBetween, InSession)):
+        if context.timestamp_column is not None:
+            return {context.timestamp_column}
+        columns = {context.date_column}
+        if context.time_column is not None and not isinstance(expr, DateBetween):
+            columns.add(context.time_column)
+        return columns
+    if isinstance(expr, (And, Or)):
+        return set().union(*(referenced_columns(item, context) for item in expr.items))
+    if isinstance(expr, Not):
+        return referenced_columns(expr.item, context)
+    raise TypeError(f'expr type error: expected {Expr.__name__}, got {type(expr)}')
+
+
+def _seconds_of_day(value: dt.time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+class _PandasCompiler:
+    def __init__(self, data: pd.DataFrame, context: FilterContext, calendar: MoexSessionCalendar) -> None:
+        self._data = data
+        self._context = context
+        self._calendar = calendar
+        self._timestamps_cache: Optional[np.ndarray] = None
+
+    @property
+    def _timestamps(self) -> np.ndarray:
+        if self._timestamps_cache is None:
+            context = self._context
+            if context.timestamp_column is not None:
+                parsed = pd.to_datetime(self._data[context.timestamp_column])
+            elif context.time_column is not None:
+                joined = self._data[context.date_column].astype('string').str.cat(
+                    self._data[context.time_column].astype('string'), sep=' '
+                )
+                parsed = pd.to_datetime(joined, format=f'{context.date_fmt} {context.time_fmt}')
+            else:
+                parsed = pd.to_datetime(self._data[context.date_column], format=context.date_fmt)
+            self._timestamps_cache = parsed.dt.as_unit('ns').to_numpy().view(np.int64)
+        return self._timestamps_cache
+
+    def _values(self, column: str) -> pd.Series:
+        return self._data[column]
+
+    def _known(self, column: str, mask) -> Tuple[np.ndarray, np.ndarray]:
+        valid = np.asarray(self._values(column).notna(), dtype=bool)
+        return np.asarray(mask, dtype=bool) & valid, valid
+
+    @property
+    def _timestamps_valid(self) -> np.ndarray:
+        return self._timestamps != np.iinfo(np.int64).min
+
+    def compile(self, expr: Expr) -> np.ndarray:
+        value, _ = self._compile(expr)
+        return value
+
+    def _compile(self, expr: Expr) -> Tuple[np.ndarray, np.ndarray]:
+        """``(value, valid)`` masks in three-valued logic, like Polars and Arrow.
+
+        Predicates over nulls are unknown (``valid`` is False, ``value`` too);
+        ``Not`` keeps them unknown and the filter drops them.
+        """
+        if isinstance(expr, Comparison):
+            return self._known(expr.column, _OPERATORS[expr.op](self._values(expr.column), expr.value).fillna(False))
+        if isinstance(expr, Between):
+            mask = np.ones(len(self._data), dtype=bool)
+            values = self._values(expr.column)
+            if expr.low is None and expr.high is None:
+                return mask, mask.copy()
+            if expr.low is not None:
+                mask &= np.asarray((values >= expr.low).fillna(False), dtype=bool)
+            if expr.high is not None:
+                mask &= np.asarray((values <= expr.high).fillna(False), dtype=bool)
+            return self._known(expr.column, mask)
+        if isinstance(expr, IsIn):
+            return self._known(expr.column, self._values(expr.column).isin(expr.values))
+        if isinstance(expr, DateBetween):
+            return self._date_between(expr)
+        if isinstance(expr, TimeBetween):
+            return self._time_between(expr)
+        if isinstance(expr, InSession):
+            valid = self._timestamps_valid
+            value = np.zeros(valid.size, dtype=bool)
+            value[valid] = self._calendar.classify(self._timestamps[valid]).in_sessions(*expr.sessions)
+            return value, valid
+        if isinstance(expr, And):
+            compiled = [self._compile(item) for item in expr.items]
+            value = np.logical_and.reduce([value for value, _ in compiled])
+            false = np.logical_or.reduce([valid & ~value for value, valid in compiled])
+            return value, value | false
+        if isinstance(expr, Or):
+            compiled = [self._compile(item) for item in expr.items]
+            value = np.logical_or.reduce([value for value, _ in compiled])
+            return value, value | np.logical_and.reduce([valid for _, valid in compiled])
+        if isinstance(expr, Not):
+            value, valid = self._compile(expr.item)
+            return valid & ~value, valid
+        raise TypeError(f'expr type error: expected {Expr.__name__}, got {type(expr)}')
+
+    def _date_between(self, expr: DateBetween) -> Tuple[np.ndarray, np.ndarray]:
+        context = self._context
+        if context.timestamp_column is None and context.sortable_date:
+            return self._compile(Between(
+                context.date_column,
+                expr.start.strftime(context.date_fmt) if expr.start is not None else None,
+                expr.end.strftime(context.date_fmt) if expr.end is not None else None
+            ))
+        days = self._timestamps // _NS_PER_DAY
+        valid = self._timestamps_valid
+        mask = valid.copy()
+        if expr.start is not None:
+            mask &= days >= (expr.start - _EPOCH).days
+        if expr.end is not None:
+            mask &= days <= (expr.end - _EPOCH).days
+        return mask, valid
+
+    def _time_between(self, expr: TimeBetween) -> Tuple[np.ndarray, np.ndarray]:
+        context = self._context
+        if context.timestamp_column is None and context.sortable_time:
+            values = self._values(context.time_column)
+            mask = np.ones(len(self._data), dtype=bool)
+            if expr.start is None and expr.end is None:
+                return mask, mask.copy()
+            if expr.start is not None:
+                mask &= np.asarray((values >= expr.start.strftime(context.time_fmt)).fillna(False), dtype=bool)
+            if expr.end is not None:
+                mask &= np.asarray((values < expr.end.strftime(context.time_fmt)).fillna(False), dtype=bool)
+            return self._known(context.time_column, mask)
+        seconds = self._timestamps % _NS_PER_DAY // 10 ** 9
+        valid = self._timestamps_valid
+        mask = valid.copy()
+        if expr.start is not None:
+            mask &= seconds >= _seconds_of_day(expr.start)
+        if expr.end is not None:
+            mask &= seconds < _seconds_of_day(expr.end)
+        return mask, valid
+
+
+def to_pandas_mask(
+        expr: Expr,
+        data: pd.DataFrame,
+        context: Optional[FilterContext] = None,
+        calendar: Optional[MoexSessionCalendar] = None
+) -> np.ndarray:
+    """Evaluates the expression over a pandas frame into a boolean NumPy mask."""
+    return _PandasCompiler(data, context or FilterContext(), calendar or MoexSessionCalendar()).compile(expr)
+
+
+def to_polars(expr: Expr, context: Optional[FilterContext] = None, calendar: Optional[MoexSessionCalendar] = None):
+    """Compiles the expression into a native Polars expression.
+
+    Everything except session predicates stays inside the Polars engine, so
+    ``LazyFrame.filter`` can push it down to the scan.
+    """
+    import polars as pl
+
+    context = context or FilterContext()
+    calendar = calendar or MoexSessionCalendar()
+
+    def timestamps() -> 'pl.Expr':
+        if context.timestamp_column is not None:
+            return pl.col(context.timestamp_column).cast(pl.Datetime('ns'))
+        if context.time_column is not None:
+            return pl.concat_str([pl.col(context.date_column), pl.col(context.time_column)], separator=' ').str.strptime(
+                pl.Datetime('ns'), f'{context.date_fmt} {context.time_fmt}'
+            )
+        return pl.col(context.date_column).str.strptime(pl.Datetime('ns'), context.date_fmt)
+
+    def bounded(value: 'pl.Expr', low, high, closed_high: bool = True) -> 'pl.Expr':
+        result = pl.lit(True)
+        if low is not None:
+            result = result & (value >= low)
+        if high is not None:
+            result = result & ((value <= high) if closed_high else (value < high))
+        return result
+
+    def compile(item: Expr) -> 'pl.Expr':
+        if isinstance(item, Comparison):
+            return _OPERATORS[item.op](pl.col(item.column), item.value)
+        if isinstance(item, Between):
+            return bounded(pl.col(item.column), item.low, item.high)
+        if isinstance(item, IsIn):
+            return pl.col(item.column).is_in(list(item.values))
+        if isinstance(item, DateBetween):
+            if context.timestamp_column is None and context.sortable_date:
+                return bounded(
+                    pl.col(context.date_column),
+                    item.start.strftime(context.date_fmt) if item.start is not None else None,
+                    item.end.strftime(context.date_fmt) if item.end is not None else None
+                )
+            return bounded(timestamps().dt.date(), item.start, item.end)
+        if isinstance(item, TimeBetween):
+            if context.timestamp_column is None and context.sortable_time:
+                return bounded(
+                    pl.col(context.time_column),
+                    item.start.strftime(context.time_fmt) if item.start is not None else None,
+                    item.end.strftime(context.time_fmt) if item.end is not None else None,
+                    closed_high=False
+                )
+            return bounded(timestamps().dt.time(), item.start, item.end, closed_high=False)
+        if isinstance(item, InSession):
+            sessions = item.sessions
+
+            def in_sessions(series: 'pl.Series') -> 'pl.Series':
+                # Only non-null timestamps are classified; nulls stay unknown.
+                valid = series.is_not_null().to_numpy()
+                value = np.zeros(valid.size, dtype=bool)
+                value[valid] = calendar.classify(series.drop_nulls().to_numpy()).in_sessions(*sessions)
+                return pl.Series(value)
+
+            stamps = timestamps().cast(pl.Int64)
+            return pl.when(stamps.is_null()).then(None).otherwise(stamps.map_batches(in_sessions, return_dtype=pl.Boolean))
+        if isinstance(item, And):
+            return pl.all_horizontal([compile(child) for child in item.items])
+        if isinstance(item, Or):
+            return pl.any_horizontal([compile(child) for child in item.items])
+        if isinstance(item, Not):
+            return ~compile(item.item)
+        raise TypeError(f'expr type error: expected {Expr.__name__}, got {type(item)}')
+
+    return compile(expr)
+
+
+def to_arrow(expr: Expr, context: Optional[FilterContext] = None) -> Tuple[Optional['pyarrow.compute.Expression'], bool]:
+    """Compiles the expression into an Arrow dataset predicate for Parquet pushdown.
+
+    Returns ``(predicate, exact)``. Parts that Arrow cannot evaluate (session
+    predicates, parsed date/time strings) are dropped from conjunctions, so
+    the predicate selects a superset of the rows; ``exact`` is False then and
+    the caller has to apply the full expression after loading.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    context = context or FilterContext()
+
+    def bounded(field, low, high, closed_high: bool = True):
+        result = None
+        if low is not None:
+            result = field >= low
+        if high is not None:
+            upper = (field <= high) if closed_high else (field < high)
+            result = upper if result is None else result & upper
+        return result if result is not None else pc.scalar(True)
+
+    def compile(item: Expr):
+        if isinstance(item, Comparison):
+            return _OPERATORS[item.op](pc.field(item.column), item.value), True
+        if isinstance(item, Between):
+            return bounded(pc.field(item.column), item.low, item.high), True
+        if isinstance(item, IsIn):
+            # ``is_in`` is False for nulls; they have to stay unknown under ``Not``.
+            field = pc.field(item.column)
+            return pc.if_else(field.is_null(), pa.scalar(None, pa.bool_()), field.isin(list(item.values))), True
+        if isinstance(item, DateBetween):
+            if context.timestamp_column is not None:
+                field = pc.field(context.timestamp_column)
+                start = pa.scalar(dt.datetime.combine(item.start, dt.time()), pa.timestamp('ns')) if item.start is not None else None
+                end = pa.scalar(dt.datetime.combine(item.end + dt.timedelta(days=1), dt.time()), pa.timestamp('ns')) if item.end is not None else None
+                return bounded(field, start, end, closed_high=False), True
+            if context.sortable_date:
+                return bounded(
+                    pc.field(context.date_column),
+                    item.start.strftime(context.date_fmt) if item.start is not None else None,
+                    item.end.strftime(context.date_fmt) if item.end is not None else None
+                ), True
+            return None, False
+        if isinstance(item, TimeBetween):
+            if context.timestamp_column is None and context.sortable_time:
+                return bounded(
+                    pc.field(context.time_column),
+                    item.start.strftime(context.time_fmt) if item.start is not None else None,
+                    item.end.strftime(context.time_fmt) if item.end is not None else None,
+                    closed_high=False
+                ), True
+            return None, False
+        if isinstance(item, InSession):
+            return None, False
+        if isinstance(item, And):
+            compiled = [compile(child) for child in item.items]
+            pushable = [predicate for predicate, _ in compiled if predicate is not None]
+            if not pushable:
+                return None, False
+            predicate = pushable[0]
+            for other in pushable[1:]:
+                predicate = predicate & other
+            return predicate, all(exact for _, exact in compiled)
+        if isinstance(item, Or):
+            compiled = [compile(child) for child in item.items]
+            if any(predicate is None for predicate, _ in compiled):
+                return None, False
+            predicate = compiled[0][0]
+            for other, _ in compiled[1:]:
+                predicate = predicate | other
+            return predicate, all(exact for _, exact in compiled)
+        if isinstance(item, Not):
+            predicate, exact = compile(item.item)
+            # The complement of a superset is not a superset of the complement.
+            if predicate is None or not exact:
+                return None, False
+            return ~predicate, True
+        raise TypeError(f'expr type error: expected {Expr.__name__}, got {type(item)}')
+
+    return compile(expr)
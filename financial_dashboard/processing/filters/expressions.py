@@ -0,0 +1,165 @@
+import datetime as dt
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.sessions import TradingSession
+from financial_dashboard.core.entities.source_types import DateTimePatterns
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+
+class Expr:
+    """Base of the engine-independent filter expression tree.
+
+    Expressions are combined with ``&``, ``|`` and ``~`` and compiled by
+    ``processing.filters.compilers`` into Polars expressions, pandas masks
+    or Arrow/Parquet pushdown predicates.
+    """
+    def __and__(self, other: 'Expr') -> 'Expr':
+        return And((self, other))
+
+    def __or__(self, other: 'Expr') -> 'Expr':
+        return Or((self, other))
+
+    def __invert__(self) -> 'Expr':
+        return Not(self)
+
+
+@dataclass(frozen=True)
+class Comparison(Expr):
+    column: str
+    op: str
+    value: Any
+
+    OPS = ('==', '!=', '<', '<=', '>', '>=')
+
+    def __post_init__(self) -> None:
+        if self.op not in self.OPS:
+            raise ValueError(f'unsupported comparison {self.op}, expected one of {self.OPS}')
+
+
+@dataclass(frozen=True)
+class Between(Expr):
+    """``low <= column <= high``; either bound may be omitted."""
+    column: str
+    low: Any = None
+    high: Any = None
+
+
+@dataclass(frozen=True)
+class IsIn(Expr):
+    column: str
+    values: Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class DateBetween(Expr):
+    """Rows whose date lies in ``[start, end]``."""
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None
+
+
+@dataclass(frozen=True)
+class TimeBetween(Expr):
+    """Rows whose time of day lies in ``[start, end)``."""
+    start: Optional[dt.time] = None
+    end: Optional[dt.time] = None
+
+
+@dataclass(frozen=True)
+class InSession(Expr):
+    sessions: Tuple[TradingSession, ...]
+
+
+@dataclass(frozen=True)
+class And(Expr):
+    items: Tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class Or(Expr):
+    items: Tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class Not(Expr):
+    item: Expr
+
+
+class Col:
+    """Column reference building comparison expressions: ``col('Close') > 100``."""
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __eq__(self, value: Any) -> Expr:  # type: ignore[override]
+        return Comparison(self._name, '==', value)
+
+    def __ne__(self, value: Any) -> Expr:  # type: ignore[override]
+        return Comparison(self._name, '!=', value)
+
+    def __lt__(self, value: Any) -> Expr:
+        return Comparison(self._name, '<', value)
+
+    def __le__(self, value: Any) -> Expr:
+        return Comparison(self._name, '<=', value)
+
+    def __gt__(self, value: Any) -> Expr:
+        return Comparison(self._name, '>', value)
+
+    def __ge__(self, value: Any) -> Expr:
+        return Comparison(self._name, '>=', value)
+
+    def between(self, low: Any = None, high: Any = None) -> Expr:
+        return Between(self._name, low, high)
+
+    def isin(self, values) -> Expr:
+        return IsIn(self._name, tuple(values))
+
+    __hash__ = None
+
+
+def col(name: str) -> Col:
+    return Col(name)
+
+
+def in_session(*sessions: TradingSession) -> Expr:
+    return InSession(tuple(sessions))
+
+
+@dataclass(frozen=True)
+class FilterContext:
+    """Where date/time predicates find their values.
+
+    A ``timestamp_column`` of datetime type wins; otherwise the date and time
+    string columns are parsed with their formats.
+    """
+    timestamp_column: Optional[str] = None
+    date_column: str = ColumnNames.DATE
+    date_fmt: str = '%Y%m%d'
+    time_column: Optional[str] = ColumnNames.TIME
+    time_fmt: Optional[str] = '%H%M%S'
+
+    @classmethod
+    def from_parse_settings(cls, parse_settings: Optional[IParseSettings] = None, timestamp_column: Optional[str] = None) -> 'FilterContext':
+        if parse_settings is None:
+            date_fmt, time_fmt = DateTimePatterns.QUIK.split(' ')
+            return cls(timestamp_column=timestamp_column, date_fmt=date_fmt, time_fmt=time_fmt)
+        columns = parse_settings.datetime_cols
+        formats = parse_settings.datetime_fmt.split(' ')
+        return cls(
+            timestamp_column=timestamp_column,
+            date_column=columns[0],
+            date_fmt=formats[0],
+            time_column=columns[1] if len(columns) > 1 else None,
+            time_fmt=formats[1] if len(formats) > 1 else None
+        )
+
+    @property
+    def sortable_date(self) -> bool:
+        """Fixed-width year-first strings compare like dates, so they can be pushed down as strings."""
+        return self.date_fmt == '%Y%m%d'
+
+    @property
+    def sortable_time(self) -> bool:
+        return self.time_fmt == '%H%M%S'
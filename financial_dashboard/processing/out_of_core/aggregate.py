@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.processing.out_of_core.spill import DEFAULT_MEMORY_BUDGET
+from financial_dashboard.processing.out_of_core.spill import SpillDirectory
+from financial_dashboard.processing.out_of_core.spill import frame_nbytes
+
+# How partial results of every aggregation are combined.
+_COMBINE = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+_AGGREGATIONS = (*_COMBINE, 'mean')
+
+
+class _SpillingReducer(ABC):
+    """Chunk-wise reduction with hash-partitioned spilling of partial results.
+
+    Partials of every chunk are kept in memory and compacted when they reach
+    half the budget; if the compacted partials still exceed it, they are
+    split by a hash of the keys into ``partitions`` spill files. At the end
+    every partition is combined separately, so only one partition at a time
+    has to fit in memory.
+    """
+    def __init__(self, keys: Sequence[str], memory_budget: int, partitions: int, tmp_dir: Optional[Path]) -> None:
+        self._keys = list(keys)
+        self._memory_budget = memory_budget
+        self._partitions = max(partitions, 1)
+        self._tmp_dir = tmp_dir
+
+    @abstractmethod
+    def _partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Partial result of one chunk."""
+        ...
+
+    @abstractmethod
+    def _combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        """Merges partial results into one partial result."""
+        ...
+
+    def _finalize(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data
+
+    def _spill(self, spill: SpillDirectory, data: pd.DataFrame, files: Dict[int, List[Path]]) -> None:
+        hashes = pd.util.hash_pandas_object(data[self._keys], index=False).to_numpy()
+        partition_ids = hashes % np.uint64(self._partitions)
+        for partition in np.unique(partition_ids):
+            part = data[partition_ids == partition]
+            files.setdefault(int(partition), []).append(spill.write(part, prefix=f'partition_{int(partition):04d}'))
+
+    def iter_results(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Final results, one frame per spill partition (a single frame when nothing was spilled)."""
+        with SpillDirectory(self._tmp_dir) as spill:
+            files: Dict[int, List[Path]] = {}
+            partials: List[pd.DataFrame] = []
+            size = 0
+            for chunk in chunks:
+                if not len(chunk):
+                    continue
+                partial = self._partial(chunk)
+                partials.append(partial)
+                size += frame_nbytes(partial)
+                if size >= self._memory_budget // 2:
+                    compacted = self._combine(partials)
+                    size = frame_nbytes(compacted)
+                    partials = [compacted]
+                    if size >= self._memory_budget // 2:
+                        self._spill(spill, compacted, files)
+                        partials, size = [], 0
+            if not files:
+                if partials:
+                    yield self._finalize(self._combine(partials))
+                return
+            if partials:
+                self._spill(spill, self._combine(partials), files)
+                partials = []
+            for partition in sorted(files):
+                yield self._finalize(self._combine([spill.read(path) for path in files[partition]]))
+
+    def compute(self, chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """All results in one frame sorted by the keys."""
+        results = list(self.iter_results(chunks))
+        if not results:
+            return pd.DataFrame(columns=self._keys)
+        return pd.concat(results, ignore_index=True).sort_values(self._keys, ignore_index=True)
+
+
+class ExternalGroupBy(_SpillingReducer):
+    """Group-by aggregation over chunks larger than memory in total.
+
+    ``aggregations`` maps output columns to ``(column, function)`` pairs like
+    pandas named aggregation; functions are sum, count, min, max and mean
+    (kept as partial sum and count).
+    """
+    def __init__(
+            self,
+            by: Sequence[str],
+            aggregations: Mapping[str, Tuple[str, str]],
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            partitions: int = 16,
+            tmp_dir: Optional[Path] = None
+    ) -> None:
+        super().__init__(by, memory_budget, partitions, tmp_dir)
+        self._aggregations = dict(aggregations)
+        self._partial_specs: Dict[str, Tuple[str, str]] = {}
+        for output, (column, function) in self._aggregations.items():
+            if function not in _AGGREGATIONS:
+                raise CustomValueError(f'unsupported aggregation {function}, expected one of {_AGGREGATIONS}')
+            if function == 'mean':
+                self._partial_specs[f'__sum_{output}'] = (column, 'sum')
+                self._partial_specs[f'__count_{output}'] = (column, 'count')
+            else:
+                self._partial_specs[output] = (column, function)
+
+    def _partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        return chunk.groupby(self._keys, as_index=False, sort=False, observed=True, dropna=False).agg(**self._partial_specs)
+
+    def _combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        data = pd.concat(partials, ignore_index=True) if len(partials) > 1 else partials[0]
+        return data.groupby(self._keys, as_index=False, sort=False, observed=True, dropna=False).agg(**{
+            name: (name, _COMBINE[function]) for name, (_, function) in self._partial_specs.items()
+        })
+
+    def _finalize(self, data: pd.DataFrame) -> pd.DataFrame:
+        result = data[self._keys].copy()
+        for output, (_, function) in self._aggregations.items():
+            if function == 'mean':
+                result[output] = data[f'__sum_{output}'] / data[f'__count_{output}'].where(data[f'__count_{output}'] > 0)
+            else:
+                result[output] = data[output]
+        return result
+
+
+class ExternalDistinct(_SpillingReducer):
+    """Distinct rows of ``columns`` over chunks larger than memory in total."""
+    def __init__(
+            self,
+            columns: Sequence[str],
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            partitions: int = 16,
+            tmp_dir: Optional[Path] = None
+    ) -> None:
+        super().__init__(columns, memory_budget, partitions, tmp_dir)
+
+    def _partial(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        return chunk[self._keys].drop_duplicates(ignore_index=True)
+
+    def _combine(self, partials: List[pd.DataFrame]) -> pd.DataFrame:
+        data = pd.concat(partials, ignore_index=True) if len(partials) > 1 else partials[0]
+        return data.drop_duplicates(ignore_index=True)
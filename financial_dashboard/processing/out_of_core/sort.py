@@ -0,0 +1,112 @@
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+from financial_dashboard.processing.out_of_core.spill import DEFAULT_MEMORY_BUDGET
+from financial_dashboard.processing.out_of_core.spill import SpillDirectory
+from financial_dashboard.processing.out_of_core.spill import frame_nbytes
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+_MIN_BATCH_ROWS = 1024
+
+
+def with_timestamps(chunks: Iterable[pd.DataFrame], parse_settings: IParseSettings) -> Iterator[pd.DataFrame]:
+    """Adds a ``Timestamp`` column parsed from the date/time columns of every chunk."""
+    for chunk in chunks:
+        yield chunk.assign(**{ColumnNames.TIMESTAMP: extract_timestamps(chunk, parse_settings).view('datetime64[ns]')})
+
+
+class ExternalSorter:
+    """Sorts a stream of chunks by one key column within a memory budget.
+
+    Chunks are buffered up to the budget, sorted and spilled as runs; the runs
+    are then merged batch by batch: every round emits the rows of all run
+    buffers up to the smallest buffered maximum. Rows with equal keys keep
+    their input order. Input that fits the budget is sorted in memory.
+    """
+    def __init__(
+            self,
+            key: str = ColumnNames.TIMESTAMP,
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            tmp_dir: Optional[Path] = None
+    ) -> None:
+        self._key = key
+        self._memory_budget = memory_budget
+        self._tmp_dir = tmp_dir
+
+    def _sorted(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+        if data[self._key].isna().any():
+            raise CustomValueError(f'sort key {self._key} must not contain nulls')
+        return data.sort_values(self._key, kind='stable', ignore_index=True)
+
+    def sort(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        with SpillDirectory(self._tmp_dir) as spill:
+            runs: List[Path] = []
+            buffer: List[pd.DataFrame] = []
+            size = 0
+            row_bytes = 1
+            for chunk in chunks:
+                if not len(chunk):
+                    continue
+                buffer.append(chunk)
+                nbytes = frame_nbytes(chunk)
+                row_bytes = max(row_bytes, nbytes // len(chunk))
+                size += nbytes
+                if size >= self._memory_budget:
+                    runs.append(spill.write(self._sorted(buffer)))
+                    buffer, size = [], 0
+            if not runs:
+                if buffer:
+                    yield self._sorted(buffer)
+                return
+            if buffer:
+                runs.append(spill.write(self._sorted(buffer)))
+                buffer = []
+            batch_rows = max(self._memory_budget // (row_bytes * (len(runs) + 1)), _MIN_BATCH_ROWS)
+            yield from self._merge(runs, spill, batch_rows)
+
+    @staticmethod
+    def _next(reader: Iterator[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        for batch in reader:
+            if len(batch):
+                return batch
+        return None
+
+    def _merge(self, runs: List[Path], spill: SpillDirectory, batch_rows: int) -> Iterator[pd.DataFrame]:
+        readers = [spill.iter_batches(run, batch_rows) for run in runs]
+        buffers: List[Optional[pd.DataFrame]] = [self._next(reader) for reader in readers]
+        while True:
+            active = [number for number, buffer in enumerate(buffers) if buffer is not None]
+            if not active:
+                return
+            keys = {number: buffers[number][self._key].to_numpy() for number in active}
+            bound = min(keys[number][-1] for number in active)
+            # Rows equal to the bound wait for the next batch of their run unless nothing else is left.
+            cuts = {number: int(np.searchsorted(keys[number], bound, side='left')) for number in active}
+            if not any(cuts.values()):
+                # Then rows equal to the bound go out run by run, up to the first run
+                # whose buffer ends with the bound: its next batch may hold more of them.
+                cuts = {}
+                for number in active:
+                    cuts[number] = int(np.searchsorted(keys[number], bound, side='right'))
+                    if cuts[number] == len(keys[number]):
+                        break
+            parts = []
+            for number in cuts:
+                cut = cuts[number]
+                if cut:
+                    parts.append(buffers[number].iloc[:cut])
+                if cut == len(keys[number]):
+                    buffers[number] = self._next(readers[number])
+                elif cut:
+                    buffers[number] = buffers[number].iloc[cut:]
+            yield pd.concat(parts, ignore_index=True).sort_values(self._key, kind='stable', ignore_index=True)
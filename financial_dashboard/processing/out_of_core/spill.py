@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_MEMORY_BUDGET = 256 * 2 ** 20
+
+
+def frame_nbytes(data: pd.DataFrame) -> int:
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+class SpillDirectory:
+    """Temporary directory of columnar (Parquet) spill files, removed on exit."""
+    def __init__(self, tmp_dir: Optional[Path] = None, compression: str = 'lz4') -> None:
+        self._tmp_dir = tmp_dir
+        self._compression = compression
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._count = 0
+
+    def __enter__(self) -> 'SpillDirectory':
+        self._directory = tempfile.TemporaryDirectory(dir=self._tmp_dir, prefix='fd_spill_')
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._directory.cleanup()
+        self._directory = None
+
+    def write(self, data: pd.DataFrame, prefix: str = 'run') -> Path:
+        path = Path(self._directory.name) / f'{prefix}_{self._count:06d}.parquet'
+        self._count += 1
+        pq.write_table(pa.Table.from_pandas(data, preserve_index=False), path, compression=self._compression)
+        return path
+
+    @staticmethod
+    def read(path: Path) -> pd.DataFrame:
+        return pq.read_table(path).to_pandas()
+
+    @staticmethod
+    def iter_batches(path: Path, batch_rows: int) -> Iterator[pd.DataFrame]:
+        parquet_file = pq.ParquetFile(path)
+        try:
+            for batch in parquet_file.iter_batches(batch_size=batch_rows):
+                yield batch.to_pandas()
+        finally:
+            parquet_file.close()
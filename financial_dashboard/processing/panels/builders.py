@@ -0,0 +1,126 @@
+import datetime as dt
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.panels import PanelGrid
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.panels import IPanelBuilder
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+from financial_dashboard.utils.timestamps import check_sorted
+
+
+class PanelBuilder(IPanelBuilder):
+    """Aligns several time-sorted contract frames on one timestamp grid.
+
+    Every input is merged onto the grid with as-of semantics: a grid point takes
+    the last row at or before it, unless that row is older than ``tolerance``.
+    The result has ``(label, column)`` MultiIndex columns and a DatetimeIndex.
+    """
+    def __init__(
+            self,
+            columns: Optional[List[str]] = None,
+            grid: PanelGrid = PanelGrid.UNION,
+            freq: Optional[dt.timedelta] = None,
+            tolerance: Optional[dt.timedelta] = None,
+            parse_settings: Optional[IParseSettings] = None
+    ) -> None:
+        if not isinstance(grid, PanelGrid):
+            raise TypeError(f'grid type error: expected {PanelGrid.__name__}, got {type(grid)}')
+        if grid is PanelGrid.REGULAR and freq is None:
+            raise CustomValueError('freq is required for a regular grid')
+        if freq is not None and freq <= dt.timedelta(0):
+            raise CustomValueError(f'freq must be positive, got {freq}')
+        if tolerance is not None and tolerance < dt.timedelta(0):
+            raise CustomValueError(f'tolerance must be non-negative, got {tolerance}')
+        self._columns = columns if columns is not None else [ColumnNames.CLOSE]
+        self._grid = grid
+        self._freq = freq
+        self._tolerance = tolerance
+        self._parse_settings = parse_settings
+
+    @staticmethod
+    def _to_ns(value: dt.timedelta) -> int:
+        return int(pd.Timedelta(value).value)
+
+    def _timestamps(self, frames: Mapping[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+        timestamps = {}
+        for label, data in frames.items():
+            ts = extract_timestamps(data, self._parse_settings)
+            check_sorted(ts, name=label)
+            timestamps[label] = ts
+        return timestamps
+
+    @staticmethod
+    def _union_grid(timestamps: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Merges pre-sorted runs and maps every input row to its grid slot.
+
+        The stable sort detects the already sorted runs and merges them, so the
+        cost stays linear in the total number of rows for a fixed set of inputs.
+        """
+        merged = np.concatenate(timestamps)
+        order = np.argsort(merged, kind='stable')
+        merged = merged[order]
+        is_new = np.empty(merged.size, dtype=bool)
+        is_new[:1] = True
+        np.not_equal(merged[1:], merged[:-1], out=is_new[1:])
+        positions = np.empty(merged.size, dtype=np.int64)
+        positions[order] = np.cumsum(is_new) - 1
+        bounds = np.cumsum([0] + [ts.size for ts in timestamps])
+        return merged[is_new], [positions[bounds[i]:bounds[i + 1]] for i in range(len(timestamps))]
+
+    def _regular_grid(self, timestamps: List[np.ndarray]) -> Tuple[np.ndarray, List[np.ndarray]]:
+        step = self._to_ns(self._freq)
+        non_empty = [ts for ts in timestamps if ts.size]
+        start = min(ts[0] for ts in non_empty) // step * step
+        end = max(ts[-1] for ts in non_empty)
+        grid = np.arange(start, end + step, step, dtype=np.int64)
+        # A row becomes visible on the first grid point at or after its timestamp.
+        return grid, [-((start - ts) // step) for ts in timestamps]
+
+    def _as_of_rows(self, grid: np.ndarray, ts: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """Row index of the last observation visible at every grid point, -1 if none."""
+        rows = np.full(grid.size, -1, dtype=np.int64)
+        if not ts.size:
+            return rows
+        last_in_slot = np.empty(positions.size, dtype=bool)
+        last_in_slot[-1] = True
+        np.not_equal(positions[1:], positions[:-1], out=last_in_slot[:-1])
+        rows[positions[last_in_slot]] = np.flatnonzero(last_in_slot)
+        np.maximum.accumulate(rows, out=rows)
+        if self._tolerance is not None:
+            rows[grid - ts[np.maximum(rows, 0)] > self._to_ns(self._tolerance)] = -1
+        return rows
+
+    def build(self, frames: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+        if not frames:
+            raise CustomValueError('frames must not be empty')
+        timestamps = self._timestamps(frames)
+        labels = list(frames)
+        series = [timestamps[label] for label in labels]
+        if not any(ts.size for ts in series):
+            grid, positions = np.empty(0, dtype=np.int64), [ts for ts in series]
+        elif self._grid is PanelGrid.UNION:
+            grid, positions = self._union_grid(series)
+        else:
+            grid, positions = self._regular_grid(series)
+
+        columns = {}
+        for label, ts, pos in zip(labels, series, positions):
+            rows = self._as_of_rows(grid, ts, pos)
+            missing = rows < 0
+            data = frames[label]
+            for column in self._columns:
+                values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                aligned = values[np.maximum(rows, 0)] if values.size else np.full(grid.size, np.nan)
+                aligned[missing] = np.nan
+                columns[(label, column)] = aligned
+
+        panel = pd.DataFrame(columns, index=pd.DatetimeIndex(grid.view('datetime64[ns]')))
+        panel.columns = pd.MultiIndex.from_tuples(panel.columns)
+        return panel
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.errors import MergeConflictError
+from financial_dashboard.core.entities.merge import ConflictPolicy
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.data_cache import IDerivedResultStore
+
+from financial_dashboard.infrastructure.readers.pandas.csv_reader import CsvReader
+
+from financial_dashboard.processing.data_cache.coverage import CoverageIndex
+from financial_dashboard.processing.sessions.calendar import MoexSessionCalendar
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+from financial_dashboard.utils.timestamps import check_sorted
+
+MERGED_QUIK_RESULT = 'quik_merged'
+MERGE_VERSION = '1'
+_NS_PER_MINUTE = 60 * 10 ** 9
+
+
+@dataclass(frozen=True)
+class MergeReport:
+    rows_in: int
+    rows_out: int
+    duplicates: int
+    conflicts: int
+    gaps: pd.DataFrame
+
+
+class QuikExportMerger:
+    """Merges overlapping time-sorted QUIK exports of one contract.
+
+    Sources are merged with a stable sort over their concatenation, which
+    merges the pre-sorted runs in O(n log k); bars with equal timestamps form
+    contiguous runs that are resolved by the conflict policy in one
+    vectorized pass. Earlier sources come first inside a run.
+    """
+    def __init__(
+            self,
+            parse_settings: IParseSettings,
+            conflict_policy: ConflictPolicy = ConflictPolicy.LAST,
+            value_columns: Optional[List[str]] = None,
+            calendar: Optional[MoexSessionCalendar] = None,
+            store: Optional[IDerivedResultStore] = None,
+            coverage_index: Optional[CoverageIndex] = None
+    ) -> None:
+        if not isinstance(conflict_policy, ConflictPolicy):
+            raise TypeError(f'conflict_policy type error: expected {ConflictPolicy.__name__}, got {type(conflict_policy)}')
+        self._parse_settings = parse_settings
+        self._conflict_policy = conflict_policy
+        self._value_columns = value_columns or [
+            ColumnNames.OPEN, ColumnNames.HIGH, ColumnNames.LOW, ColumnNames.CLOSE, ColumnNames.VOL
+        ]
+        self._calendar = calendar or MoexSessionCalendar()
+        self._store = store
+        self._coverage_index = coverage_index
+
+    def _pick(self, values: np.ndarray, run_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        if self._conflict_policy is ConflictPolicy.FIRST:
+            return starts
+        if self._conflict_policy is ConflictPolicy.MAX_VOLUME:
+            volume = values[:, self._value_columns.index(ColumnNames.VOL)]
+            volume = np.where(np.isnan(volume), -np.inf, volume)
+            is_max = volume == np.maximum.reduceat(volume, starts)[run_ids]
+            # Ties go to the latest source.
+            return np.maximum.reduceat(np.where(is_max, np.arange(volume.size), -1), starts)
+        return ends - 1
+
+    def _gaps(self, timestamps: np.ndarray, bar_minutes: int) -> pd.DataFrame:
+        if timestamps.size < 2:
+            return pd.DataFrame({'after': pd.DatetimeIndex([]), 'before': pd.DatetimeIndex([]), 'missing_bars': np.empty(0, dtype=np.int64)})
+        period = bar_minutes * _NS_PER_MINUTE
+        missing = self._calendar.trading_minutes_between(timestamps[:-1] + period, timestamps[1:]) // bar_minutes
+        gap = missing > 0
+        return pd.DataFrame({
+            'after': pd.DatetimeIndex(timestamps[:-1][gap].view('datetime64[ns]')),
+            'before': pd.DatetimeIndex(timestamps[1:][gap].view('datetime64[ns]')),
+            'missing_bars': missing[gap]
+        })
+
+    @staticmethod
+    def _bar_minutes(data: pd.DataFrame, bar_minutes: Optional[int]) -> int:
+        if bar_minutes is not None:
+            return bar_minutes
+        return int(data[ColumnNames.PER].iloc[0]) if ColumnNames.PER in data.columns and len(data) else 1
+
+    def merge(self, frames: Sequence[pd.DataFrame], bar_minutes: Optional[int] = None) -> Tuple[pd.DataFrame, MergeReport]:
+        if not frames:
+            raise CustomValueError('frames must not be empty')
+        timestamps = []
+        for number, data in enumerate(frames):
+            ts = extract_timestamps(data, self._parse_settings)
+            check_sorted(ts, name=f'source {number}')
+            timestamps.append(ts)
+        combined = pd.concat(frames, ignore_index=True)
+        merged_ts = np.concatenate(timestamps)
+        order = np.argsort(merged_ts, kind='stable')
+        merged_ts = merged_ts[order]
+
+        is_start = np.empty(merged_ts.size, dtype=bool)
+        is_start[:1] = True
+        np.not_equal(merged_ts[1:], merged_ts[:-1], out=is_start[1:])
+        starts = np.flatnonzero(is_start)
+        ends = np.append(starts[1:], merged_ts.size)
+        run_ids = np.cumsum(is_start) - 1
+
+        values = np.column_stack([
+            combined[column].to_numpy(dtype=np.float64, na_value=np.nan)[order] for column in self._value_columns
+        ]) if merged_ts.size else np.empty((0, len(self._value_columns)))
+        reference = values[starts[run_ids]]
+        differs = np.any((values != reference) & ~(np.isnan(values) & np.isnan(reference)), axis=1)
+        conflicting = np.logical_or.reduceat(differs, starts) if starts.size else np.empty(0, dtype=bool)
+        if self._conflict_policy is ConflictPolicy.RAISE and conflicting.any():
+            first = merged_ts[starts[np.argmax(conflicting)]].view('datetime64[ns]')
+            raise MergeConflictError(f'{int(conflicting.sum())} conflicting bars, first at {first}')
+
+        picked = order[self._pick(values, run_ids, starts, ends)] if starts.size else np.empty(0, dtype=np.int64)
+        result = combined.iloc[picked].reset_index(drop=True)
+        dtypes = {column: dtype for column, dtype in self._parse_settings.dtypes.items() if column in result.columns}
+        result = result.astype(dtypes)
+        indexes = [data.index for data in frames if isinstance(data.index, pd.DatetimeIndex)]
+        if indexes:
+            # The concatenation drops the DatetimeIndex; it is rebuilt from the merged timestamps.
+            index = pd.DatetimeIndex(merged_ts[starts].view('datetime64[ns]'), name=indexes[0].name)
+            result.index = index.tz_localize('UTC').tz_convert(indexes[0].tz) if indexes[0].tz is not None else index
+
+        bar_minutes = self._bar_minutes(result, bar_minutes)
+        report = MergeReport(
+            rows_in=int(merged_ts.size),
+            rows_out=len(result),
+            duplicates=int(merged_ts.size - starts.size),
+            conflicts=int(conflicting.sum()),
+            gaps=self._gaps(merged_ts[starts], max(bar_minutes, 1))
+        )
+        return result, report
+
+    def merge_files(self, file_paths: Sequence[Path], cache_key: Optional[str] = None, bar_minutes: Optional[int] = None) -> Tuple[pd.DataFrame, MergeReport]:
+        """Reads and merges export files.
+
+        With a ``cache_key`` the canonical series is written to the store and
+        its bars replace the coverage index entry of that key.
+        """
+        frames = [CsvReader(file_path=path, parse_settings=self._parse_settings).read().data for path in file_paths]
+        result, report = self.merge(frames, bar_minutes=bar_minutes)
+        if self._store is not None and cache_key is not None:
+            self._store.put(
+                name=MERGED_QUIK_RESULT,
+                params={'key': cache_key, 'policy': self._conflict_policy.value},
+                version=MERGE_VERSION,
+                data=result,
+                dependencies=file_paths
+            )
+        if self._coverage_index is not None and cache_key is not None:
+            self._coverage_index.update_frame(
+                cache_key, result, self._bar_minutes(result, bar_minutes), self._parse_settings, replace=True
+            )
+        return result, report
+
+    def cached(self, cache_key: str) -> Optional[pd.DataFrame]:
+        if self._store is None:
+            return None
+        return self._store.get(
+            name=MERGED_QUIK_RESULT,
+            params={'key': cache_key, 'policy': self._conflict_policy.value},
+            version=MERGE_VERSION
+        )
@@ -0,0 +1,177 @@
+import datetime as dt
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.sessions import MoexSchedule
+from financial_dashboard.core.entities.sessions import SessionInterval
+from financial_dashboard.core.entities.sessions import TradingSession
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.sessions import ISessionCalendar
+
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+_MINUTES_PER_DAY = 24 * 60
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_DAY = _MINUTES_PER_DAY * _NS_PER_MINUTE
+_EPOCH = dt.date(1970, 1, 1)
+_NAT = np.iinfo(np.int64).min
+# Long holidays (New Year) need look-ahead past the end of the range.
+_LOOKAHEAD_DAYS = 21
+
+
+@dataclass(frozen=True)
+class SessionTable:
+    """Per-minute session IDs and trading-day keys for a range of calendar days."""
+    first_day: int
+    minute_sessions: np.ndarray
+    next_trading_day: np.ndarray
+
+    @property
+    def last_day(self) -> int:
+        return self.first_day + self.minute_sessions.shape[0] - 1
+
+    @cached_property
+    def cumulative_trading_minutes(self) -> np.ndarray:
+        """Trading minutes (clearing excluded) before every minute of the table, plus the total."""
+        sessions = self.minute_sessions.ravel()
+        trading = (sessions != TradingSession.CLOSED.value) & (sessions != TradingSession.CLEARING.value)
+        return np.concatenate(([0], np.cumsum(trading, dtype=np.int64)))
+
+
+@dataclass(frozen=True)
+class SessionMasks:
+    session_ids: np.ndarray
+    trading_days: np.ndarray
+    clearing: np.ndarray
+
+    def in_sessions(self, *sessions: TradingSession) -> np.ndarray:
+        return np.isin(self.session_ids, [session.value for session in sessions])
+
+    @property
+    def trading(self) -> np.ndarray:
+        return self.session_ids != TradingSession.CLOSED.value
+
+
+class MoexSessionCalendar(ISessionCalendar):
+    """MOEX derivatives market calendar.
+
+    Session tables are built for whole months and cached, so classifying a
+    frame is two array lookups per row.
+    """
+    def __init__(
+            self,
+            schedule: Optional[List[SessionInterval]] = None,
+            holidays: Iterable[dt.date] = (),
+            short_days: Optional[Mapping[dt.date, dt.time]] = None,
+            working_weekends: Iterable[dt.date] = ()
+    ) -> None:
+        self._schedule = schedule if schedule is not None else MoexSchedule.FORTS
+        self._holidays = frozenset(holidays)
+        self._short_days = dict(short_days or {})
+        self._working_weekends = frozenset(working_weekends)
+        # Cache:
+        self._session_table_cache: Dict[Tuple[dt.date, dt.date], SessionTable] = {}
+
+    def clear_cache(self) -> None:
+        self._session_table_cache = {}
+
+    @staticmethod
+    def _minute_of(value: dt.time) -> int:
+        return value.hour * 60 + value.minute
+
+    def _day_profile(self) -> np.ndarray:
+        profile = np.zeros(_MINUTES_PER_DAY, dtype=np.int8)
+        for interval in self._schedule:
+            end = self._minute_of(interval.end) or _MINUTES_PER_DAY
+            profile[self._minute_of(interval.start):end] = interval.session.value
+        return profile
+
+    def _is_trading_day(self, day: dt.date) -> bool:
+        if day in self._holidays:
+            return False
+        return day.weekday() < 5 or day in self._working_weekends
+
+    def _load_table(self, start: dt.date, end: dt.date) -> SessionTable:
+        days = pd.date_range(start, end + dt.timedelta(days=_LOOKAHEAD_DAYS), freq='D').date
+        trading = np.fromiter((self._is_trading_day(day) for day in days), dtype=bool, count=len(days))
+        n_days = (end - start).days + 1
+
+        candidates = np.where(trading, np.arange(len(days)), len(days))
+        next_index = np.minimum.accumulate(candidates[::-1])[::-1]
+        following = np.append(next_index[1:], len(days))[:n_days]
+        first_day = (start - _EPOCH).days
+        next_trading_day = np.where(
+            following < len(days), first_day + following, first_day + np.arange(n_days) + 1
+        ).astype(np.int64)
+
+        profile = self._day_profile()
+        minute_sessions = np.where(trading[:n_days, None], profile[None, :], TradingSession.CLOSED.value).astype(np.int8)
+        for day, close in self._short_days.items():
+            if start <= day <= end:
+                row = minute_sessions[(day - start).days]
+                tail = row[self._minute_of(close):]
+                tail[tail != TradingSession.MORNING.value] = TradingSession.CLOSED.value
+        return SessionTable(first_day=first_day, minute_sessions=minute_sessions, next_trading_day=next_trading_day)
+
+    def session_table(self, start: dt.date, end: dt.date) -> SessionTable:
+        """Returns the cached table covering whole months from ``start`` to ``end``."""
+        month_start = start.replace(day=1)
+        month_end = (end.replace(day=1) + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+        key = (month_start, month_end)
+        if key not in self._session_table_cache:
+            self._session_table_cache[key] = self._load_table(month_start, month_end)
+        return self._session_table_cache[key]
+
+    def classify(self, timestamps: np.ndarray) -> SessionMasks:
+        """Session IDs, trading-day keys and clearing masks for int64 ns timestamps.
+
+        Rows of the evening session belong to the next trading day. NaT rows
+        are CLOSED with a NaT trading day.
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        valid = timestamps != _NAT
+        session_ids = np.full(timestamps.size, TradingSession.CLOSED.value, dtype=np.int8)
+        trading_days = np.full(timestamps.size, _NAT, dtype=np.int64)
+        if valid.any():
+            # NaT would stretch the session table back to 1677.
+            stamps = timestamps if valid.all() else timestamps[valid]
+            days = stamps // _NS_PER_DAY
+            minutes = stamps % _NS_PER_DAY // _NS_PER_MINUTE
+            table = self.session_table(
+                _EPOCH + dt.timedelta(days=int(days.min())), _EPOCH + dt.timedelta(days=int(days.max()))
+            )
+            day_index = days - table.first_day
+            sessions = table.minute_sessions[day_index, minutes]
+            evening = sessions == TradingSession.EVENING.value
+            session_ids[valid] = sessions
+            trading_days[valid] = np.where(evening, table.next_trading_day[day_index], days)
+        return SessionMasks(
+            session_ids=session_ids,
+            trading_days=trading_days.astype('datetime64[D]'),
+            clearing=session_ids == TradingSession.CLEARING.value
+        )
+
+    def trading_minutes_between(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Number of trading minutes in ``[start, end)`` for int64 ns timestamp arrays."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.maximum(np.asarray(ends, dtype=np.int64), starts)
+        if not starts.size:
+            return np.empty(0, dtype=np.int64)
+        table = self.session_table(
+            _EPOCH + dt.timedelta(days=int(starts.min() // _NS_PER_DAY)),
+            _EPOCH + dt.timedelta(days=int(ends.max() // _NS_PER_DAY))
+        )
+        offset = table.first_day * _MINUTES_PER_DAY
+        # Partial minutes round up, so a bar starting inside a minute does not count it.
+        first = -(-starts // _NS_PER_MINUTE) - offset
+        last = -(-ends // _NS_PER_MINUTE) - offset
+        cumulative = table.cumulative_trading_minutes
+        return cumulative[last] - cumulative[first]
+
+    def classify_frame(self, data: pd.DataFrame, parse_settings: Optional[IParseSettings] = None) -> SessionMasks:
+        return self.classify(extract_timestamps(data, parse_settings))
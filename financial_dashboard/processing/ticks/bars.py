@@ -0,0 +1,123 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.columns import ColumnNames
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.ticks import BarType
+
+from financial_dashboard.core.interfaces.data_cache import IDerivedResultStore
+
+from financial_dashboard.infrastructure.readers.arrow.tick_store import TickReader
+from financial_dashboard.infrastructure.readers.arrow.tick_store import price_decimals
+
+TICK_BARS_RESULT = 'tick_bars'
+TICK_BARS_VERSION = '1'
+_NS_PER_SECOND = 10 ** 9
+
+
+def bar_starts(timestamps: np.ndarray, volumes: np.ndarray, values: np.ndarray, bar_type: BarType, size: float) -> np.ndarray:
+    """Positions of the first tick of every bar.
+
+    Time bars split on ``size``-second clock buckets. Volume and value bars
+    start a new bar once the running total before a tick reaches the next
+    multiple of ``size``; a tick is never split between bars.
+    """
+    if not timestamps.size:
+        return np.empty(0, dtype=np.int64)
+    if bar_type is BarType.TIME:
+        keys = timestamps // int(size * _NS_PER_SECOND)
+    else:
+        amounts = volumes if bar_type is BarType.VOLUME else values
+        before = np.cumsum(amounts) - amounts
+        keys = np.floor_divide(before, size)
+    boundary = np.ones(keys.size, dtype=bool)
+    boundary[1:] = keys[1:] != keys[:-1]
+    return np.flatnonzero(boundary)
+
+
+def build_bars(
+        timestamps: np.ndarray,
+        price_ticks: np.ndarray,
+        volumes: np.ndarray,
+        tick_size: float,
+        bar_type: BarType,
+        size: float
+) -> pd.DataFrame:
+    """OHLCV bars from time-ordered ticks with integer prices.
+
+    High and low are reduced on the integer ticks, so they are exact. Time
+    bars are labelled with the start of their bucket, volume and value bars
+    with the time of their first tick.
+    """
+    if not isinstance(bar_type, BarType):
+        raise TypeError(f'bar_type type error: expected {BarType.__name__}, got {type(bar_type)}')
+    if size <= 0:
+        raise CustomValueError(f'bar size must be positive, got {size}')
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    price_ticks = np.asarray(price_ticks, dtype=np.int64)
+    volumes = np.asarray(volumes, dtype=np.int64)
+    values = price_ticks * tick_size * volumes
+    starts = bar_starts(timestamps, volumes, values, bar_type, size)
+    ends = np.append(starts[1:], timestamps.size)[:starts.size] - 1
+    decimals = price_decimals(tick_size)
+    if bar_type is BarType.TIME:
+        bucket = int(size * _NS_PER_SECOND)
+        labels = timestamps[starts] // bucket * bucket
+    else:
+        labels = timestamps[starts]
+    if starts.size:
+        highs = np.maximum.reduceat(price_ticks, starts)
+        lows = np.minimum.reduceat(price_ticks, starts)
+        bar_volumes = np.add.reduceat(volumes, starts)
+        bar_values = np.add.reduceat(values, starts)
+    else:
+        highs = lows = bar_volumes = np.empty(0, dtype=np.int64)
+        bar_values = np.empty(0, dtype=np.float64)
+    return pd.DataFrame({
+        ColumnNames.TIMESTAMP: labels.view('datetime64[ns]'),
+        ColumnNames.OPEN: np.round(price_ticks[starts] * tick_size, decimals),
+        ColumnNames.HIGH: np.round(highs * tick_size, decimals),
+        ColumnNames.LOW: np.round(lows * tick_size, decimals),
+        ColumnNames.CLOSE: np.round(price_ticks[ends] * tick_size, decimals),
+        ColumnNames.VOL: bar_volumes,
+        ColumnNames.VALUE: bar_values,
+        ColumnNames.NUMTRADES: ends - starts + 1
+    })
+
+
+class TickBarBuilder:
+    """Builds bars from compact tick files on demand.
+
+    Results are cached in the derived result store with the tick file as
+    dependency, so rewriting the file invalidates every bar series built
+    from it.
+    """
+    def __init__(self, store: Optional[IDerivedResultStore] = None) -> None:
+        self._store = store
+
+    @staticmethod
+    def _compute(path: Path, bar_type: BarType, size: float) -> pd.DataFrame:
+        reader = TickReader(path)
+        table = reader.read_table(usecols=[ColumnNames.TIMESTAMP, ColumnNames.PRICE, ColumnNames.VOL])
+        return build_bars(
+            table.column(ColumnNames.TIMESTAMP).to_numpy().view(np.int64),
+            table.column(ColumnNames.PRICE).to_numpy(),
+            table.column(ColumnNames.VOL).to_numpy(),
+            reader.tick_size,
+            bar_type,
+            size
+        )
+
+    def bars(self, path: Path, bar_type: BarType, size: float) -> pd.DataFrame:
+        if self._store is None:
+            return self._compute(path, bar_type, size)
+        return self._store.get_or_compute(
+            TICK_BARS_RESULT,
+            {'path': str(Path(path).resolve()), 'bar_type': bar_type.value, 'size': size},
+            TICK_BARS_VERSION,
+            [Path(path)],
+            lambda: self._compute(path, bar_type, size)
+        )
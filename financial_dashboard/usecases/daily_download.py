@@ -0,0 +1,226 @@
+import csv
+import datetime as dt
+import http.client
+import io
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from financial_dashboard.core.entities.contracts import DeliveryMonth
+from financial_dashboard.core.entities.contracts import FuturesKey
+from financial_dashboard.core.entities.errors import CustomValueError
+from financial_dashboard.core.entities.errors import DownloadError
+from financial_dashboard.core.entities.source_types import DateTimePatterns
+
+from financial_dashboard.infrastructure.http.iss import ISS_FUTURES_HISTORY_PATH
+from financial_dashboard.infrastructure.http.iss import ISS_HISTORY_COLUMNS
+from financial_dashboard.infrastructure.http.iss import parse_iss_csv
+from financial_dashboard.infrastructure.http.pool import HttpConnectionPool
+from financial_dashboard.infrastructure.http.pool import HttpResponse
+
+from financial_dashboard.processing.data_cache.daily_store import DailyAnalyticsStore
+
+from financial_dashboard.utils.rate_limit import TokenBucket
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_TAIL_BYTES = 4096
+_PREAMBLE = 'history\n\n'
+
+
+@dataclass(frozen=True)
+class DownloadTask:
+    """One contract to fetch; ``start``/``end`` bound the requested days."""
+    futures_key: FuturesKey
+    delivery_month: DeliveryMonth
+    year: int
+    start: Optional[dt.date] = None
+    end: Optional[dt.date] = None
+
+    @property
+    def secid(self) -> str:
+        return f'{self.futures_key.value}{self.delivery_month.value}{self.year % 10}'
+
+    @property
+    def file_name(self) -> Path:
+        return Path(f'{self.futures_key.value}{self.delivery_month.value}{self.year % 100:02d}.csv')
+
+
+@dataclass(frozen=True)
+class DownloadResult:
+    task: DownloadTask
+    file_path: Path
+    start: Optional[dt.date]
+    rows: int
+    requests: int
+    error: Optional[str] = None
+
+
+class DailyDownloader:
+    """Fetches DAILY files from the MOEX ISS futures history concurrently.
+
+    Contracts are downloaded in a thread pool over the shared keep-alive
+    connection pool, with every request passing the token bucket. Failed
+    requests are retried with exponential backoff. Fetches are incremental:
+    only days after the latest known date of a contract (the later of
+    ``catalog`` and the tail of its file) are requested, and new rows are appended to
+    ``data/daily_data/<key>/<file>`` atomically, so an interrupted run
+    resumes where it stopped.
+    """
+    def __init__(
+            self,
+            daily_dir: Path,
+            pool: HttpConnectionPool,
+            rate_limiter: Optional[TokenBucket] = None,
+            max_workers: int = 4,
+            retries: int = 3,
+            backoff: float = 0.5,
+            catalog: Optional[DailyAnalyticsStore] = None
+    ) -> None:
+        if not isinstance(pool, HttpConnectionPool):
+            raise TypeError(f'pool type error: expected {HttpConnectionPool.__name__}, got {type(pool)}')
+        self._daily_dir = Path(daily_dir)
+        self._pool = pool
+        self._rate_limiter = rate_limiter
+        self._max_workers = max_workers
+        self._retries = retries
+        self._backoff = backoff
+        self._catalog = catalog
+
+    def file_path(self, task: DownloadTask) -> Path:
+        return self._daily_dir / task.futures_key.value / task.file_name
+
+    @staticmethod
+    def _file_max_date(file_path: Path) -> Optional[dt.date]:
+        if not file_path.exists():
+            return None
+        with open(file_path, 'rb') as file:
+            file.seek(0, os.SEEK_END)
+            file.seek(max(file.tell() - _TAIL_BYTES, 0))
+            lines = [line for line in file.read().decode().splitlines() if line.strip()]
+        for line in reversed(lines):
+            fields = line.split(',')
+            try:
+                return dt.datetime.strptime(fields[ISS_HISTORY_COLUMNS.index('TRADEDATE')], DateTimePatterns.DAILY).date()
+            except (IndexError, ValueError):
+                continue
+        return None
+
+    def _resume_date(self, task: DownloadTask, file_path: Path) -> Optional[dt.date]:
+        # The catalog lags behind the file until the next refresh, so the later date of both wins.
+        known = [self._file_max_date(file_path)]
+        if self._catalog is not None and file_path.exists():
+            known.append(self._catalog.max_date(futures_key=task.futures_key.value, ticker=task.secid, year=task.year))
+        known = [date for date in known if date is not None]
+        if not known:
+            return task.start
+        last = max(known)
+        resume = last + dt.timedelta(days=1)
+        return resume if task.start is None else max(task.start, resume)
+
+    def _get(self, path: str, params: Dict[str, str]) -> HttpResponse:
+        for attempt in range(self._retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            delay = self._backoff * 2 ** attempt * (1 + random.random())
+            try:
+                response = self._pool.get(path, params)
+            except (OSError, http.client.HTTPException) as error:
+                reason = f'{type(error).__name__}: {error}'
+            else:
+                if response.status == 200:
+                    return response
+                if response.status not in _RETRY_STATUSES:
+                    raise DownloadError(f'{path}: HTTP {response.status}')
+                reason = f'HTTP {response.status}'
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = float(retry_after)
+            if attempt < self._retries:
+                time.sleep(delay)
+        raise DownloadError(f'{path}: {reason} after {self._retries + 1} attempts')
+
+    def _fetch(self, task: DownloadTask, start: Optional[dt.date], end: dt.date) -> Tuple[List[List[str]], int]:
+        path = ISS_FUTURES_HISTORY_PATH.format(secid=task.secid)
+        params = {'iss.only': 'history,history.cursor', 'history.columns': ','.join(ISS_HISTORY_COLUMNS), 'till': end.isoformat()}
+        if start is not None:
+            params['from'] = start.isoformat()
+        rows: List[List[str]] = []
+        requests = 0
+        while True:
+            blocks = parse_iss_csv(self._get(path, {**params, 'start': str(len(rows))}).body)
+            requests += 1
+            header, page = blocks.get('history', ([], []))
+            if header and list(header) != list(ISS_HISTORY_COLUMNS):
+                positions = [header.index(column) for column in ISS_HISTORY_COLUMNS]
+                page = [[row[position] for position in positions] for row in page]
+            rows.extend(page)
+            cursor = blocks.get('history.cursor', ([], []))[1]
+            total = int(cursor[0][1]) if cursor else len(rows)
+            if not page or len(rows) >= total:
+                return rows, requests
+
+    @staticmethod
+    def _to_daily(rows: List[List[str]], start: Optional[dt.date]) -> List[List[str]]:
+        column = ISS_HISTORY_COLUMNS.index('TRADEDATE')
+        converted = []
+        for row in rows:
+            date = dt.date.fromisoformat(row[column])
+            if start is not None and date < start:
+                continue
+            converted.append(row[:column] + [date.strftime(DateTimePatterns.DAILY)] + row[column + 1:])
+        return converted
+
+    @staticmethod
+    def _append(file_path: Path, rows: List[List[str]]) -> None:
+        buffer = io.StringIO()
+        if file_path.exists():
+            existing = file_path.read_text()
+            buffer.write(existing if not existing or existing.endswith('\n') else f'{existing}\n')
+        else:
+            buffer.write(_PREAMBLE)
+            buffer.write(','.join(ISS_HISTORY_COLUMNS) + '\n')
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file_path.with_suffix(f'.{uuid.uuid4().hex}.tmp')
+        tmp.write_text(buffer.getvalue())
+        os.replace(tmp, file_path)
+
+    def _download(self, task: DownloadTask, today: dt.date) -> DownloadResult:
+        file_path = self.file_path(task)
+        start = self._resume_date(task, file_path)
+        end = task.end or today
+        if start is not None and start > end:
+            return DownloadResult(task=task, file_path=file_path, start=start, rows=0, requests=0)
+        try:
+            rows, requests = self._fetch(task, start, end)
+        except DownloadError as error:
+            return DownloadResult(task=task, file_path=file_path, start=start, rows=0, requests=0, error=str(error))
+        rows = self._to_daily(rows, start)
+        if rows:
+            self._append(file_path, rows)
+        return DownloadResult(task=task, file_path=file_path, start=start, rows=len(rows), requests=requests)
+
+    def _safe_download(self, task: DownloadTask, today: dt.date) -> DownloadResult:
+        try:
+            return self._download(task, today)
+        except Exception as error:
+            return DownloadResult(
+                task=task, file_path=self.file_path(task), start=None, rows=0, requests=0, error=f'{type(error).__name__}: {error}'
+            )
+
+    def download(self, tasks: Sequence[DownloadTask], today: Optional[dt.date] = None) -> List[DownloadResult]:
+        """Downloads ``tasks`` concurrently; failures are reported per task in ``DownloadResult.error``."""
+        paths = [self.file_path(task) for task in tasks]
+        if len(set(paths)) != len(paths):
+            raise CustomValueError('tasks must target distinct files')
+        today = today or dt.date.today()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            results = list(executor.map(lambda task: self._safe_download(task, today), tasks))
+        if self._catalog is not None and any(result.rows for result in results):
+            self._catalog.refresh()
+        return results
@@ -0,0 +1,298 @@
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import CustomValueError
+
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+from financial_dashboard.core.interfaces.replay import IReplaySink
+
+from financial_dashboard.infrastructure.readers.pandas.csv_reader import CsvReader
+
+from financial_dashboard.processing.data_cache.invalidation import ContractChange
+from financial_dashboard.processing.data_cache.invalidation import InvalidationHub
+
+from financial_dashboard.utils.timestamps import check_sorted
+from financial_dashboard.utils.timestamps import extract_timestamps
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+_NS_PER_SECOND = 10 ** 9
+_NS_PER_MS = 10 ** 6
+
+
+@dataclass(frozen=True)
+class ReplaySource:
+    """A stored export to replay; ``target_path`` is the growing file it is appended to."""
+    key: str
+    file_path: Path
+    target_path: Optional[Path] = None
+
+
+@dataclass
+class _Stream:
+    source: ReplaySource
+    header: List[str]
+    lines: List[str]
+    rows: pd.DataFrame
+    timestamps: np.ndarray
+
+
+class ExportAppendSink(IReplaySink):
+    """Appends replayed lines to growing export files, as QUIK does during a session.
+
+    Every target starts with the header of its source file. Each emit opens,
+    appends and closes the file, so tail readers see whole lines only and
+    file watchers get a close-after-write event per batch.
+    """
+    def __init__(self, targets: Mapping[str, Path], headers: Mapping[str, List[str]]) -> None:
+        self._targets = {key: Path(path) for key, path in targets.items()}
+        for key, path in self._targets.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8', newline='') as handle:
+                handle.write(''.join(f'{line}\n' for line in headers[key]))
+
+    def emit(self, key: str, rows: pd.DataFrame, lines: List[str]) -> None:
+        with open(self._targets[key], 'a', encoding='utf-8', newline='') as handle:
+            handle.write(''.join(f'{line}\n' for line in lines))
+
+    def close(self) -> None:
+        pass
+
+
+class CallbackSink(IReplaySink):
+    """Feeds replayed rows straight into an ingestion callback ``(key, rows)``."""
+    def __init__(self, callback: Callable[[str, pd.DataFrame], None]) -> None:
+        self._callback = callback
+
+    def emit(self, key: str, rows: pd.DataFrame, lines: List[str]) -> None:
+        self._callback(key, rows)
+
+    def close(self) -> None:
+        pass
+
+
+class LatencyRecorder:
+    """Per-bar end-to-end latencies, measured from emission to each pipeline stage.
+
+    The harness calls ``emitted``; pipeline stages (ingestion, invalidation,
+    indicators, chart push) call ``complete`` for the bars they have handled,
+    or ``complete_pending`` when they process everything emitted so far.
+    Thread-safe.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._emitted: Dict[str, Dict[int, int]] = {}
+        self._order: Dict[str, List[int]] = {}
+        self._done: Dict[str, Dict[str, Dict[int, int]]] = {}
+        self._cursors: Dict[Tuple[str, str], int] = {}
+
+    def emitted(self, key: str, bar_times: Iterable[int], at: Optional[int] = None) -> None:
+        at = time.perf_counter_ns() if at is None else at
+        with self._lock:
+            emitted = self._emitted.setdefault(key, {})
+            order = self._order.setdefault(key, [])
+            for bar_time in bar_times:
+                if int(bar_time) not in emitted:
+                    emitted[int(bar_time)] = at
+                    order.append(int(bar_time))
+
+    def complete(self, key: str, bar_times: Iterable[int], stage: str) -> None:
+        now = time.perf_counter_ns()
+        with self._lock:
+            done = self._done.setdefault(stage, {}).setdefault(key, {})
+            for bar_time in bar_times:
+                done.setdefault(int(bar_time), now)
+
+    def complete_pending(self, key: str, stage: str) -> int:
+        """Completes every bar of ``key`` emitted so far; returns how many were new."""
+        now = time.perf_counter_ns()
+        with self._lock:
+            done = self._done.setdefault(stage, {}).setdefault(key, {})
+            order = self._order.get(key, [])
+            before = len(done)
+            for bar_time in order[self._cursors.get((stage, key), 0):]:
+                done.setdefault(bar_time, now)
+            self._cursors[(stage, key)] = len(order)
+            return len(done) - before
+
+    def latencies(self, stage: str) -> np.ndarray:
+        """Latencies of a stage in milliseconds."""
+        with self._lock:
+            values = [
+                at - self._emitted[key][bar_time]
+                for key, done in self._done.get(stage, {}).items()
+                for bar_time, at in done.items()
+                if bar_time in self._emitted.get(key, {})
+            ]
+        return np.asarray(values, dtype=np.float64) / _NS_PER_MS
+
+    def summary(self, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> pd.DataFrame:
+        """``count, pending`` and latency percentiles in milliseconds per stage."""
+        with self._lock:
+            stages = list(self._done)
+            emitted = sum(len(bars) for bars in self._emitted.values())
+        rows = {}
+        for stage in stages:
+            values = self.latencies(stage)
+            row = {'count': values.size, 'pending': emitted - values.size}
+            quantiles = np.percentile(values, percentiles) if values.size else np.full(len(percentiles), np.nan)
+            row.update({f'p{q:g}': float(value) for q, value in zip(percentiles, quantiles)})
+            row['max'] = float(values.max()) if values.size else np.nan
+            rows[stage] = row
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+
+@dataclass(frozen=True)
+class ReplayReport:
+    bars: int
+    batches: int
+    wall_seconds: float
+    schedule_lag: Dict[str, float]
+    latency: pd.DataFrame
+
+
+class ReplayHarness:
+    """Replays stored QUIK exports of several contracts as one live session.
+
+    The files are k-way merged by bar time and bars with equal times are
+    emitted together to the sink, paced at ``speed`` times market time
+    (``max_idle`` caps the market seconds waited across overnight and weekend
+    gaps). Emission times go to the ``LatencyRecorder``; the schedule lag
+    (how late batches left the harness) tells whether the load target was
+    actually met.
+    """
+    def __init__(
+            self,
+            sources: Sequence[ReplaySource],
+            parse_settings: IParseSettings,
+            speed: float = 1.0,
+            max_idle: Optional[float] = None,
+            recorder: Optional[LatencyRecorder] = None
+    ) -> None:
+        if speed <= 0:
+            raise CustomValueError(f'speed must be positive, got {speed}')
+        if len({source.key for source in sources}) != len(sources):
+            raise CustomValueError('replay source keys must be unique')
+        self._sources = list(sources)
+        self._parse_settings = parse_settings
+        self._speed = speed
+        self._max_idle = max_idle
+        self._recorder = recorder or LatencyRecorder()
+        self._streams_cache: Optional[List[_Stream]] = None
+
+    @property
+    def recorder(self) -> LatencyRecorder:
+        return self._recorder
+
+    def clear_cache(self) -> None:
+        self._streams_cache = None
+
+    def _load(self, source: ReplaySource) -> _Stream:
+        text = Path(source.file_path).read_text(encoding='utf-8').splitlines()
+        header_lines = (self._parse_settings.skip_rows or 0) + (self._parse_settings.header + 1 if self._parse_settings.header is not None else 0)
+        lines = [line for line in text[header_lines:] if line.strip()]
+        rows = CsvReader(file_path=source.file_path, parse_settings=self._parse_settings).read().data
+        if len(rows) != len(lines):
+            raise CustomValueError(f'{source.file_path}: {len(rows)} parsed rows for {len(lines)} data lines')
+        timestamps = extract_timestamps(rows, self._parse_settings)
+        check_sorted(timestamps, name=str(source.file_path))
+        return _Stream(source=source, header=text[:header_lines], lines=lines, rows=rows, timestamps=timestamps)
+
+    @property
+    def _streams(self) -> List[_Stream]:
+        if self._streams_cache is None:
+            self._streams_cache = [self._load(source) for source in self._sources]
+        return self._streams_cache
+
+    def headers(self) -> Dict[str, List[str]]:
+        return {stream.source.key: stream.header for stream in self._streams}
+
+    def append_sink(self) -> ExportAppendSink:
+        """Sink appending every source to its ``target_path``."""
+        missing = [source.key for source in self._sources if source.target_path is None]
+        if missing:
+            raise CustomValueError(f'replay sources without target_path: {missing}')
+        return ExportAppendSink({source.key: source.target_path for source in self._sources}, self.headers())
+
+    def track_invalidation(self, hub: InvalidationHub, stage: str = 'invalidation') -> int:
+        """Completes pending bars of a source when the hub reports its target file; returns the handle."""
+        targets = {Path(source.target_path).resolve(): source.key for source in self._sources if source.target_path is not None}
+
+        def on_change(change: ContractChange) -> None:
+            for path in change.written:
+                key = targets.get(Path(path).resolve())
+                if key is not None:
+                    self._recorder.complete_pending(key, stage)
+        return hub.subscribe(on_change)
+
+    def merged(self) -> Iterator[Tuple[int, int, int]]:
+        """``(bar time, stream, row)`` over all streams in time order."""
+        iterators = [
+            zip(stream.timestamps.tolist(), [number] * stream.timestamps.size, range(stream.timestamps.size))
+            for number, stream in enumerate(self._streams)
+        ]
+        return heapq.merge(*iterators)
+
+    def _batches(self) -> Iterator[Tuple[int, Dict[int, List[int]]]]:
+        """Rows of every stream per distinct bar time."""
+        current = None
+        batch: Dict[int, List[int]] = {}
+        for bar_time, stream, row in self.merged():
+            if bar_time != current and batch:
+                yield current, batch
+                batch = {}
+            current = bar_time
+            batch.setdefault(stream, []).append(row)
+        if batch:
+            yield current, batch
+
+    def run(self, sink: IReplaySink, limit: Optional[int] = None, stop: Optional[threading.Event] = None) -> ReplayReport:
+        """Replays up to ``limit`` bars into ``sink``; the sink is closed afterwards."""
+        streams = self._streams
+        lags = []
+        bars = 0
+        batches = 0
+        started = time.perf_counter_ns()
+        market_start = None
+        previous = None
+        skipped = 0
+        try:
+            for bar_time, batch in self._batches():
+                if stop is not None and stop.is_set():
+                    break
+                if limit is not None and bars >= limit:
+                    break
+                if market_start is None:
+                    market_start = bar_time
+                elif self._max_idle is not None and bar_time - previous > self._max_idle * _NS_PER_SECOND:
+                    skipped += bar_time - previous - int(self._max_idle * _NS_PER_SECOND)
+                previous = bar_time
+                due = started + (bar_time - market_start - skipped) / self._speed
+                delay = due - time.perf_counter_ns()
+                if delay > 0:
+                    time.sleep(delay / _NS_PER_SECOND)
+                emitted_at = time.perf_counter_ns()
+                lags.append(emitted_at - due)
+                for number, rows in batch.items():
+                    stream = streams[number]
+                    self._recorder.emitted(stream.source.key, [bar_time], at=emitted_at)
+                    sink.emit(stream.source.key, stream.rows.iloc[rows], [stream.lines[row] for row in rows])
+                    bars += len(rows)
+                batches += 1
+        finally:
+            sink.close()
+        lag = np.asarray(lags, dtype=np.float64) / _NS_PER_MS
+        schedule_lag = {f'p{q:g}': float(np.percentile(lag, q)) for q in DEFAULT_PERCENTILES} if lag.size else {}
+        return ReplayReport(
+            bars=bars,
+            batches=batches,
+            wall_seconds=(time.perf_counter_ns() - started) / _NS_PER_SECOND,
+            schedule_lag=schedule_lag,
+            latency=self._recorder.summary()
+        )
@@ -0,0 +1,30 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from financial_dashboard.core.entities.errors import UnsortedDataError
+from financial_dashboard.core.interfaces.config.models import IParseSettings
+
+
+def extract_timestamps(data: pd.DataFrame, parse_settings: Optional[IParseSettings] = None) -> np.ndarray:
+    """Returns row timestamps of ``data`` as int64 nanoseconds.
+
+    A DatetimeIndex is used as is, otherwise ``datetime_cols`` of the parse
+    settings are joined and parsed with ``datetime_fmt``.
+    """
+    if isinstance(data.index, pd.DatetimeIndex):
+        return data.index.as_unit('ns').asi8
+    if parse_settings is None:
+        raise TypeError(f'parse_settings type error: expected IParseSettings for frames without DatetimeIndex, got {type(parse_settings)}')
+    columns = parse_settings.datetime_cols
+    joined = data[columns[0]].astype('string')
+    for column in columns[1:]:
+        joined = joined.str.cat(data[column].astype('string'), sep=' ')
+    parsed = pd.to_datetime(joined, format=parse_settings.datetime_fmt)
+    return parsed.dt.as_unit('ns').to_numpy().view(np.int64)
+
+
+def check_sorted(timestamps: np.ndarray, name: str = 'data') -> None:
+    if timestamps.size > 1 and bool(np.any(timestamps[1:] < timestamps[:-1])):
+        raise UnsortedDataError(f'{name} is not sorted by time')